@@ -0,0 +1,125 @@
+"""按帧时长播放动图的调度器
+
+- 使用 GIF 中每一帧自带的 duration，而不是固定间隔
+- 窗口最小化、被完全遮挡或控件隐藏时暂停，恢复显示后继续，暂停期间没有任何定时回调
+- 任意时刻最多只有一个待执行的 after 回调；主线程卡顿后按时间跳过过期的帧，而不是补播
+"""
+import time
+
+# 与浏览器一致：过短的帧时长按 100 ms 处理
+MIN_FRAME_MS = 20
+DEFAULT_FRAME_MS = 100
+
+
+class FrameAnimator:
+    def __init__(self, widget, frames, clock=time.monotonic):
+        """frames 需提供 frame_count、durations、complete 和 photo(index)，如 asset_cache.GifFrames"""
+        self.widget = widget
+        self.frames = frames
+        self.clock = clock
+        self.index = 0
+        self.running = False
+        self.skipped = 0  # 因主线程卡顿跳过的帧数
+        self.wakeups = 0  # 定时回调次数，用于统计空闲唤醒
+        self._due = 0.0  # 当前帧应当结束的时间
+        self._after_id = None
+        self._hidden = set()  # 导致暂停的原因：最小化、遮挡、控件隐藏
+
+        toplevel = widget.winfo_toplevel()
+        self._toplevel = toplevel
+        toplevel.bind("<Unmap>", self._on_unmap, add="+")
+        toplevel.bind("<Map>", self._on_map, add="+")
+        widget.bind("<Visibility>", self._on_visibility, add="+")
+
+    def duration(self, index):
+        """第 index 帧的显示时长（秒）"""
+        durations = self.frames.durations
+        ms = durations[index] if index < len(durations) else DEFAULT_FRAME_MS
+        if ms < MIN_FRAME_MS:
+            ms = DEFAULT_FRAME_MS
+        return ms / 1000
+
+    def start(self):
+        self.running = True
+        self._resume()
+
+    def stop(self):
+        self.running = False
+        self._cancel()
+
+    def _cancel(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self, delay):
+        self._cancel()
+        self._after_id = self.widget.after(max(1, int(delay * 1000)), self._tick)
+
+    def _resume(self):
+        if not self.running or self._hidden:
+            return
+        self._show(self.index)
+        self._due = self.clock() + self.duration(self.index)
+        self._schedule(self.duration(self.index))
+
+    def _show(self, index):
+        photo = self.frames.photo(index)
+        if photo is not None:
+            self.widget.configure(image=photo)
+            self.widget.image = photo  # 保持引用，避免 PhotoImage 被回收
+
+    def _tick(self):
+        self._after_id = None
+        self.wakeups += 1
+        count = self.frames.frame_count
+        if count == 0:
+            # 第一帧还没解码出来
+            self._schedule(DEFAULT_FRAME_MS / 1000)
+            return
+        if count == 1 and self.frames.complete:
+            # 静态图片，显示一次即可，不再唤醒
+            self._show(0)
+            return
+
+        now = self.clock()
+        behind = now - self._due
+        if behind > 0 and behind > sum(self.duration(index) for index in range(count)):
+            # 落后超过一整轮（例如系统休眠），直接从当前帧重新计时
+            self._due = now
+        advanced = 0
+        while now >= self._due:
+            self.index = (self.index + 1) % count
+            self._due += self.duration(self.index)
+            advanced += 1
+        self.skipped += max(0, advanced - 1)
+        self._show(self.index)
+        self._schedule(self._due - now)
+
+    def _pause(self, reason):
+        self._hidden.add(reason)
+        self._cancel()
+
+    def _unpause(self, reason):
+        if reason in self._hidden:
+            self._hidden.discard(reason)
+            self._resume()
+
+    def _on_unmap(self, event):
+        # 顶层窗口的绑定也会收到子控件的事件，只处理窗口本身和动图控件
+        if event.widget is self._toplevel:
+            self._pause("iconified")
+        elif event.widget is self.widget:
+            self._pause("unmapped")
+
+    def _on_map(self, event):
+        if event.widget is self._toplevel:
+            self._unpause("iconified")
+        elif event.widget is self.widget:
+            self._unpause("unmapped")
+
+    def _on_visibility(self, event):
+        if event.state == "VisibilityFullyObscured":
+            self._pause("obscured")
+        else:
+            self._unpause("obscured")
@@ -0,0 +1,88 @@
+"""解析接口健康检查：并发探测所有接口的连接耗时、首字节耗时和状态码"""
+import http.client
+import ssl
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+class ProbeResult:
+    """单个接口的探测结果，耗时单位为毫秒"""
+
+    def __init__(self, name, url, status=None, connect_ms=None, ttfb_ms=None, error=None):
+        self.name = name
+        self.url = url
+        self.status = status
+        self.connect_ms = connect_ms
+        self.ttfb_ms = ttfb_ms
+        self.error = error
+
+    @property
+    def ok(self):
+        """能连上且返回非错误状态码（重定向也算可用）"""
+        return self.error is None and self.status is not None and self.status < 400
+
+    def __repr__(self):
+        if self.ok:
+            return f"<ProbeResult {self.name} {self.status} connect={self.connect_ms:.0f}ms ttfb={self.ttfb_ms:.0f}ms>"
+        return f"<ProbeResult {self.name} failed status={self.status} error={self.error}>"
+
+
+def open_connection(url, timeout):
+    """按地址创建（尚未连接的）HTTP/HTTPS 连接，返回 (连接, 请求路径)"""
+    parts = urlsplit(url)
+    if parts.scheme == "https":
+        conn = http.client.HTTPSConnection(
+            parts.hostname, parts.port, timeout=timeout, context=ssl.create_default_context()
+        )
+    else:
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return conn, path
+
+
+def probe(name, url, timeout=3.0, on_connection=None):
+    """对一个接口发起 GET 请求，只等待响应头，不读取正文
+
+    on_connection(conn) 在连接建立前被调用，调用方可以保存连接，以便从其他线程关闭它来取消请求。
+    """
+    conn, path = open_connection(url, timeout)
+    if on_connection is not None:
+        on_connection(conn)
+
+    start = time.perf_counter()
+    try:
+        conn.connect()
+        connected = time.perf_counter()
+        conn.request("GET", path, headers={"User-Agent": "Mozilla/5.0", "Accept": "text/html"})
+        response = conn.getresponse()
+        first_byte = time.perf_counter()
+        return ProbeResult(
+            name, url,
+            status=response.status,
+            connect_ms=(connected - start) * 1000,
+            ttfb_ms=(first_byte - start) * 1000,
+        )
+    except (OSError, http.client.HTTPException) as e:
+        return ProbeResult(name, url, error=str(e) or type(e).__name__)
+    finally:
+        conn.close()
+
+
+def probe_all(apis, timeout=3.0, max_workers=None):
+    """并发探测 {名称: 地址} 中的所有接口，按原顺序返回 {名称: ProbeResult}"""
+    if not apis:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(apis)) as pool:
+        futures = {name: pool.submit(probe, name, url, timeout) for name, url in apis.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def fastest_healthy(results):
+    """返回首字节耗时最短的可用接口名，全部不可用时返回 None"""
+    healthy = [result for result in results.values() if result.ok]
+    if not healthy:
+        return None
+    return min(healthy, key=lambda result: result.ttfb_ms).name
@@ -0,0 +1,122 @@
+"""对冲解析：错开时间向前 N 个解析接口发送请求，采用最先给出可用响应的那个
+
+第一个接口立即发出；每隔 hedge_delay 秒再追加一个，某个接口失败时立即追加下一个。
+一旦有接口返回可用响应，其余进行中的请求被取消。每次尝试的耗时都会写入日志（vip.race，INFO 级别，
+图形界面运行时输出到标准错误），打开追踪时每次尝试也是一个 span。
+"""
+import logging
+import queue
+import socket
+import threading
+import time
+
+from api_prober import probe
+from tracing import tracer
+
+logger = logging.getLogger("vip.race")
+
+
+class Attempt:
+    """一次请求尝试"""
+
+    def __init__(self, name, url, started):
+        self.name = name
+        self.url = url
+        self.started = started  # 相对比赛开始的秒数
+        self.result = None  # ProbeResult，完成后才有
+        self.cancelled = False
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def run(self, timeout, done):
+        with tracer.span(f"接口 {self.name}", "race"):
+            self.result = probe(self.name, self.url, timeout, on_connection=self._set_connection)
+        done.put(self)
+
+    def _set_connection(self, conn):
+        with self._lock:
+            self._conn = conn
+
+    def cancel(self):
+        """中断尚未完成的请求：关闭套接字读写，阻塞在 recv 上的线程会立即返回"""
+        self.cancelled = True
+        with self._lock:
+            sock = self._conn.sock if self._conn is not None else None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class RaceResult:
+    def __init__(self, winner, attempts, elapsed):
+        self.winner = winner  # 获胜的 Attempt，全部失败时为 None
+        self.attempts = attempts
+        self.elapsed = elapsed  # 秒
+
+    @property
+    def ok(self):
+        return self.winner is not None
+
+
+def race(candidates, hedge_delay=0.5, timeout=5.0, is_usable=None):
+    """candidates 为按优先级排列的 [(接口名, 完整解析链接)]，返回 RaceResult"""
+    is_usable = is_usable or (lambda result: result.ok)
+    done = queue.Queue()
+    attempts = []
+    start = time.perf_counter()
+    remaining = list(candidates)
+    pending = 0
+    winner = None
+
+    def launch():
+        name, url = remaining.pop(0)
+        attempt = Attempt(name, url, time.perf_counter() - start)
+        attempts.append(attempt)
+        threading.Thread(target=attempt.run, args=(timeout, done), daemon=True).start()
+
+    if remaining:
+        launch()
+        pending = 1
+    next_launch = start + hedge_delay
+    while pending:
+        wait = None
+        if remaining:
+            wait = max(0.0, next_launch - time.perf_counter())
+        try:
+            attempt = done.get(timeout=wait)
+        except queue.Empty:
+            # 对冲延迟已到，还没有结果，追加下一个接口
+            launch()
+            pending += 1
+            next_launch = time.perf_counter() + hedge_delay
+            continue
+        pending -= 1
+        if is_usable(attempt.result):
+            winner = attempt
+            break
+        if remaining:
+            # 失败了就不必再等对冲延迟
+            launch()
+            pending += 1
+            next_launch = time.perf_counter() + hedge_delay
+
+    for attempt in attempts:
+        if attempt.result is None:
+            attempt.cancel()
+    elapsed = time.perf_counter() - start
+
+    for attempt in attempts:
+        result = attempt.result
+        if attempt is winner:
+            outcome = f"获胜 status={result.status} ttfb={result.ttfb_ms:.0f}ms"
+        elif attempt.cancelled:
+            outcome = "已取消"
+        elif result.ok:
+            outcome = f"不可用 status={result.status}"
+        else:
+            outcome = f"失败 status={result.status} error={result.error}"
+        logger.info("race %s: 开始于 +%.0fms, %s", attempt.name, attempt.started * 1000, outcome)
+    logger.info("race 结束: %s, 用时 %.0fms", winner.name if winner else "全部失败", elapsed * 1000)
+    return RaceResult(winner, attempts, elapsed)
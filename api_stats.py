@@ -0,0 +1,142 @@
+"""按平台统计各解析接口的实际表现，给出推荐接口
+
+同一个解析接口对不同平台的效果差别很大，所以按 (平台, 接口) 分别记录：
+- 成功率和起播耗时都用指数加权平均（EWMA），越近的结果权重越大，旧结果自然衰减
+- 每次更新只改一个条目，常数时间；条目数超过上限时淘汰最久没有更新的
+- 数据保存在用户数据目录下的一个小 JSON 文件里
+"""
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from paths import data_dir
+
+logger = logging.getLogger("vip.api_stats")
+
+ALPHA = 0.25  # 新结果的权重
+PRIOR_SUCCESS = 0.5  # 没有记录时假定的成功率
+PRIOR_MS = 3000.0  # 没有记录时假定的起播耗时
+MAX_ENTRIES = 512
+
+
+def default_stats_path():
+    return os.path.join(data_dir(), "api_stats.json")
+
+
+class ApiStat:
+    __slots__ = ("success", "latency_ms", "samples", "ts")
+
+    def __init__(self, success=PRIOR_SUCCESS, latency_ms=PRIOR_MS, samples=0, ts=0.0):
+        self.success = success
+        self.latency_ms = latency_ms
+        self.samples = samples
+        self.ts = ts
+
+    @property
+    def score(self):
+        """成功率按耗时折算：同样可靠时越快越好，经常失败的接口再快也排在后面"""
+        return self.success / (1.0 + self.latency_ms / 1000.0)
+
+    def __repr__(self):
+        return f"<ApiStat success={self.success:.2f} latency={self.latency_ms:.0f}ms samples={self.samples}>"
+
+
+PRIOR_SCORE = ApiStat().score
+
+
+class ApiStats:
+    def __init__(self, path=None, alpha=ALPHA, max_entries=MAX_ENTRIES, clock=time.time):
+        self.path = path
+        self.alpha = alpha
+        self.max_entries = max_entries
+        self.clock = clock
+        # (平台, 接口) -> ApiStat，按最近更新的顺序排列，最久未更新的在最前面
+        self._stats = OrderedDict()
+        self._dirty = False
+        if path:
+            self.load()
+
+    def __len__(self):
+        return len(self._stats)
+
+    def get(self, platform, api):
+        return self._stats.get((platform, api))
+
+    def record(self, platform, api, ok, latency_ms=None):
+        """记录一次解析结果；latency_ms 为起播耗时，只在成功时计入"""
+        if not platform or not api:
+            return
+        key = (platform, api)
+        stat = self._stats.get(key)
+        if stat is None:
+            stat = self._stats[key] = ApiStat()
+            if len(self._stats) > self.max_entries:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(key)
+
+        stat.success += self.alpha * ((1.0 if ok else 0.0) - stat.success)
+        if ok and latency_ms is not None:
+            if stat.samples == 0:
+                stat.latency_ms = float(latency_ms)
+            else:
+                stat.latency_ms += self.alpha * (latency_ms - stat.latency_ms)
+        stat.samples += 1
+        stat.ts = self.clock()
+        self._dirty = True
+
+    def rank(self, platform, apis):
+        """按该平台上的得分从高到低排列接口，没有记录的接口按先验得分参与排序，同分保持原顺序"""
+        def score(api):
+            stat = self._stats.get((platform, api))
+            return stat.score if stat is not None else PRIOR_SCORE
+        return sorted(apis, key=score, reverse=True)
+
+    def best(self, platform, apis):
+        """该平台上得分最高的接口；这些接口在该平台都还没有记录时返回 None"""
+        if not platform or not any((platform, api) in self._stats for api in apis):
+            return None
+        return self.rank(platform, apis)[0]
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(rows, list):
+            logger.warning("接口统计文件 %s 格式不对，忽略", self.path)
+            return
+        for row in rows[-self.max_entries:]:
+            # 逐行校验，手工改坏或旧版本写出的行直接跳过
+            try:
+                platform, api, success, latency_ms, samples, ts = row
+                stat = ApiStat(float(success), float(latency_ms), int(samples), float(ts))
+                self._stats[(platform, api)] = stat
+            except (TypeError, ValueError, KeyError):
+                logger.warning("接口统计文件 %s 中有无效的记录，已跳过: %r", self.path, row)
+
+    def save(self):
+        """有改动时写回文件（先写临时文件再替换）"""
+        if not self.path or not self._dirty:
+            return
+        rows = [
+            [platform, api, round(stat.success, 4), round(stat.latency_ms, 1), stat.samples, round(stat.ts, 1)]
+            for (platform, api), stat in self._stats.items()
+        ]
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(rows, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            # 在退出时调用，写不了文件（目录只读、磁盘已满）时只丢掉这次的统计
+            logger.warning("保存接口统计 %s 失败: %s", self.path, e)
+        finally:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
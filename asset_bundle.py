@@ -0,0 +1,280 @@
+"""资源包：把图标、图片等资源打成一个文件，运行时用 mmap 打开，按名称取出零拷贝的视图
+
+打包（PyInstaller onefile）时只需解压这一个文件，启动时也只打开一次；
+各资源以 memoryview 切片或基于它的只读文件对象交给 PIL，不额外复制整个文件。
+没有资源包时（源码运行且未构建）退回读取散放的文件。
+
+资源包格式：魔数 + 版本(uint16) + 保留(uint16) + 索引长度(uint32) + JSON 索引 + 数据
+索引为 {名称: [偏移, 长度, sha1]}，每项数据按 8 字节对齐。
+
+构建: python asset_bundle.py [输出路径]
+"""
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+
+from paths import cache_dir, resource_path
+
+BUNDLE_NAME = "assets.bundle"
+BUNDLE_MAGIC = b"VIPA"
+BUNDLE_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+ALIGN = 8
+
+# 打进资源包的文件
+ASSETS = ("icon.ico", "icon.png", "hezhao.jpg", "dp.jpg", "qinqin.gif")
+
+
+def build(out_path, names=ASSETS, base_dir=None):
+    """把 names 中的文件打成资源包，返回索引"""
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+    blobs = []
+    for name in names:
+        with open(os.path.join(base_dir, name), "rb") as f:
+            blobs.append((name, f.read()))
+
+    # 索引长度影响数据的起始偏移，先按占位偏移估算长度，再按对齐后的实际偏移生成
+    def layout(start):
+        index, offset = {}, start
+        for name, data in blobs:
+            index[name] = [offset, len(data), hashlib.sha1(data).hexdigest()]
+            offset += -(-len(data) // ALIGN) * ALIGN
+        return index
+
+    index = layout(0)
+    while True:
+        encoded = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        start = -(-(HEADER.size + len(encoded)) // ALIGN) * ALIGN
+        new_index = layout(start)
+        if new_index == index:
+            break
+        index = new_index
+
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, 0, len(encoded)))
+        f.write(encoded)
+        for name, data in blobs:
+            f.seek(index[name][0])
+            f.write(data)
+        f.truncate(max(offset + size for offset, size, _ in index.values()))
+    os.replace(tmp, out_path)
+    return index
+
+
+class ViewReader(io.RawIOBase):
+    """基于 memoryview 的只读、可定位文件对象，read() 只复制调用方要的那部分"""
+
+    def __init__(self, view):
+        super().__init__()
+        self._view = view
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._view[self._pos:self._pos + len(buffer)]
+        size = len(data)
+        memoryview(buffer).cast("B")[:size] = data
+        self._pos += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("负的偏移")
+        self._pos = offset
+        return offset
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        # 只释放自己的切片，不影响资源包的映射
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class AssetBundle:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, index_len = HEADER.unpack_from(self._mmap, 0)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                raise ValueError("资源包格式不符")
+            self.index = json.loads(self._mmap[HEADER.size:HEADER.size + index_len])
+            for offset, size, _ in self.index.values():
+                if offset + size > len(self._mmap):
+                    raise ValueError("资源包不完整")
+        except (struct.error, ValueError):
+            self._mmap.close()
+            raise
+        self._view = memoryview(self._mmap)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def view(self, name):
+        """资源内容的 memoryview（不复制）"""
+        offset, size, _ = self.index[name]
+        return self._view[offset:offset + size]
+
+    def open(self, name):
+        return ViewReader(self.view(name))
+
+    def digest(self, name):
+        return self.index[name][2]
+
+    def close(self):
+        self._view.release()
+        self._mmap.close()
+
+
+def _is_frozen():
+    return getattr(sys, "frozen", False) or hasattr(sys, "_MEIPASS")
+
+
+class Resources:
+    """资源加载：优先从资源包读取，没有资源包（或源码运行时资源包比散放的文件旧）时读取散放的文件
+
+    image() 解码后的图片按名称缓存，同一资源只解码一次；path() 给只接受文件路径的接口（如 iconbitmap）使用。
+    """
+
+    def __init__(self, bundle_path=None, locate=resource_path):
+        self.locate = locate
+        self.bundle_path = bundle_path or locate(BUNDLE_NAME)
+        self._bundle = None
+        self._bundle_checked = False
+        self._images = {}
+        self._paths = {}
+        self._lock = threading.Lock()
+
+    @property
+    def bundle(self):
+        if not self._bundle_checked:
+            with self._lock:
+                if not self._bundle_checked:
+                    self._bundle = self._open_bundle()
+                    self._bundle_checked = True
+        return self._bundle
+
+    def _open_bundle(self):
+        try:
+            bundle = AssetBundle(self.bundle_path)
+        except (OSError, ValueError):
+            return None
+        if not _is_frozen():
+            # 源码运行时改过资源文件但没有重新构建资源包，以散放的文件为准
+            built = os.stat(self.bundle_path).st_mtime_ns
+            for name in bundle.index:
+                try:
+                    if os.stat(self.locate(name)).st_mtime_ns > built:
+                        bundle.close()
+                        return None
+                except OSError:
+                    pass
+        return bundle
+
+    def open(self, name):
+        """以二进制只读文件对象打开资源"""
+        bundle = self.bundle
+        if bundle is not None and name in bundle:
+            return bundle.open(name)
+        return open(self.locate(name), "rb")
+
+    def digest(self, name):
+        """资源内容的键，用于磁盘缓存失效：资源包中直接取索引里的 sha1，不用读取内容"""
+        bundle = self.bundle
+        if bundle is not None and name in bundle:
+            return bundle.digest(name)
+        path = self.locate(name)
+        if _is_frozen():
+            digest = hashlib.sha1()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def image(self, name):
+        """解码后的 PIL 图片（同一资源只解码一次，调用方不要修改它）"""
+        image = self._images.get(name)
+        if image is None:
+            from PIL import Image
+
+            with self.open(name) as f:
+                image = Image.open(f)
+                image.load()
+            self._images[name] = image
+        return image
+
+    def path(self, name):
+        """资源的文件路径；只在资源包中时写出到缓存目录（按内容哈希命名，只写一次）
+
+        缓存目录不可写时依次退回散放的文件、临时目录中的临时文件；都不行时抛出 OSError。
+        """
+        path = self._paths.get(name)
+        if path is not None:
+            return path
+        bundle = self.bundle
+        if bundle is None or name not in bundle:
+            path = self.locate(name)
+        else:
+            try:
+                path = self._extract_to_cache(bundle, name)
+            except OSError:
+                path = self.locate(name)
+                if not os.path.isfile(path):
+                    path = self._extract_to_temp(bundle, name)
+        self._paths[name] = path
+        return path
+
+    def _extract_to_cache(self, bundle, name):
+        path = os.path.join(cache_dir(), f"asset-{bundle.digest(name)[:16]}-{name}")
+        if not os.path.exists(path):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(bundle.view(name))
+                os.replace(tmp, path)
+            except OSError:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                raise
+        return path
+
+    def _extract_to_temp(self, bundle, name):
+        # 临时目录所有用户共享，按进程新建文件（不复用可能被他人放置的同名文件），进程结束后留给系统清理
+        import tempfile
+
+        fd, path = tempfile.mkstemp(prefix="vip-asset-", suffix=f"-{name}")
+        with os.fdopen(fd, "wb") as f:
+            f.write(bundle.view(name))
+        return path
+
+
+resources = Resources()
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), BUNDLE_NAME)
+    built = build(target)
+    print(f"{target}: {len(built)} 个资源，{os.path.getsize(target)} 字节")
@@ -0,0 +1,219 @@
+"""图片资源缓存
+
+GIF 动图的帧按需解码：首次启动由后台线程逐帧解码、缩放，并写入磁盘缓存文件；
+之后启动直接用 mmap 打开缓存文件，按需取帧，跳过解码和缩放。
+缓存文件以源文件内容的哈希和目标尺寸命名，源文件变化后自动失效。
+
+静态图片（hezhao.jpg、dp.jpg）的缩略图同样缓存在用户缓存目录，见 thumbnail()。
+资源内容通过 asset_bundle.resources 读取（打包后来自 mmap 打开的资源包），缓存键直接用资源包索引中的哈希。
+"""
+import glob
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+from asset_bundle import resources
+from paths import cache_dir
+
+# 帧缓存文件格式：魔数 + 头部长度(uint32) + JSON 头部 + 逐帧 RGBA 原始像素
+FRAMES_MAGIC = b"VIPF"
+FRAMES_VERSION = 1
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, chunks):
+    """先写临时文件再替换，避免其他进程读到写了一半的缓存"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _decode_resized(name, size):
+    with resources.open(name) as f:
+        return Image.open(f).resize(size)
+
+
+def thumbnail(name, size):
+    """返回缩放到 size 的资源图片，优先从缓存目录读取已缩放好的 PNG，没有时生成一次
+
+    缓存键：资源包中的资源用索引里的内容哈希；散放的文件在源码运行时用修改时间和大小，
+    打包后每次启动都会重新解压到新的 _MEIPASS 目录、修改时间不可靠，改用内容哈希"""
+    try:
+        directory = cache_dir()
+        key = resources.digest(name)[:16]
+    except OSError:
+        return _decode_resized(name, size)
+
+    prefix = f"thumb-{os.path.basename(name).replace('.', '_')}-{size[0]}x{size[1]}-"
+    path = os.path.join(directory, f"{prefix}{key}.png")
+    try:
+        image = Image.open(path)
+        image.load()
+        if image.size == tuple(size):
+            return image
+    except (OSError, ValueError):
+        pass
+
+    image = _decode_resized(name, size)
+    # 源文件变化后旧的缩略图不再有用
+    for stale in glob.glob(os.path.join(glob.escape(directory), glob.escape(prefix) + "*.png")):
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", compress_level=1)
+    try:
+        _write_atomic(path, [buffer.getvalue()])
+    except OSError:
+        pass
+    return image
+
+
+class GifFrames:
+    """按需解码的 GIF 帧序列
+
+    frame_count 在解码完成前会逐渐增长；photo(i) 在第 i 帧就绪前返回 None。
+    PhotoImage 只在 Tk 主线程中创建，每帧只创建一次并一直保留：动画按顺序循环播放，
+    容量小于帧数的 LRU 每一帧都不命中。max_photos 给出时才按 LRU 限制数量。
+    """
+
+    def __init__(self, path, size, max_photos=None, use_disk_cache=True, key=None, opener=None):
+        """path 为 GIF 文件路径；资源包中的资源用 from_resource()，此时 key 为内容哈希，opener 打开资源"""
+        self.path = path
+        self._opener = opener or (lambda: open(path, "rb"))
+        self.size = size
+        self.max_photos = max_photos
+        self.durations = []  # 每帧显示时长（毫秒）
+        self.complete = False
+        self._frame_bytes = size[0] * size[1] * 4
+        self._decoded = []  # 解码阶段在内存中暂存的帧像素
+        self._mmap = None
+        self._data_offset = 0
+        self._photos = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.cache_path = None
+        if use_disk_cache:
+            try:
+                self.cache_path = os.path.join(
+                    cache_dir(), f"gif-{key or file_digest(path)}-{size[0]}x{size[1]}.frames"
+                )
+            except OSError:
+                self.cache_path = None
+
+        if not (self.cache_path and self._open_cache()):
+            threading.Thread(target=self._produce, daemon=True).start()
+
+    @classmethod
+    def from_resource(cls, name, size, **options):
+        return cls(name, size, key=resources.digest(name), opener=lambda: resources.open(name), **options)
+
+    @property
+    def frame_count(self):
+        return len(self.durations)
+
+    def _open_cache(self):
+        try:
+            with open(self.cache_path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        try:
+            magic, header_len = struct.unpack_from("<4sI", mapped, 0)
+            header = json.loads(mapped[8:8 + header_len])
+            durations = header["durations"]
+            if (magic != FRAMES_MAGIC or header["version"] != FRAMES_VERSION
+                    or tuple(header["size"]) != tuple(self.size)
+                    or len(mapped) != 8 + header_len + len(durations) * self._frame_bytes):
+                raise ValueError("帧缓存文件无效")
+        except (struct.error, ValueError, KeyError):
+            mapped.close()
+            return False
+        self._mmap = mapped
+        self._data_offset = 8 + header_len
+        self.durations = durations
+        self.complete = True
+        return True
+
+    def _produce(self):
+        """后台线程：逐帧解码并缩放，每帧就绪后立即可用，全部完成后写入磁盘缓存"""
+        try:
+            with self._opener() as f, Image.open(f) as gif:
+                index = 0
+                while True:
+                    try:
+                        gif.seek(index)
+                    except EOFError:
+                        break
+                    frame = gif.convert("RGBA").resize(self.size)
+                    with self._lock:
+                        self._decoded.append(frame.tobytes())
+                        self.durations.append(gif.info.get("duration") or 100)
+                    index += 1
+        finally:
+            self.complete = True
+        if self.cache_path and self._decoded:
+            self._save_cache()
+
+    def _save_cache(self):
+        header = json.dumps({
+            "version": FRAMES_VERSION,
+            "size": list(self.size),
+            "durations": self.durations,
+        }).encode("utf-8")
+        try:
+            _write_atomic(self.cache_path, [struct.pack("<4sI", FRAMES_MAGIC, len(header)), header, *self._decoded])
+        except OSError:
+            return
+        # 写入成功后改为从 mmap 读取，释放内存中的帧
+        with self._lock:
+            if self._open_cache():
+                self._decoded = []
+
+    def frame(self, index):
+        """返回第 index 帧的 PIL 图像，尚未解码时返回 None"""
+        with self._lock:
+            if self._mmap is not None:
+                start = self._data_offset + index * self._frame_bytes
+                data = memoryview(self._mmap)[start:start + self._frame_bytes]
+            elif index < len(self._decoded):
+                data = self._decoded[index]
+            else:
+                return None
+        return Image.frombuffer("RGBA", self.size, data, "raw", "RGBA", 0, 1)
+
+    def photo(self, index):
+        """返回第 index 帧的 PhotoImage（必须在 Tk 主线程调用），尚未解码时返回 None"""
+        photo = self._photos.get(index)
+        if photo is not None:
+            self._photos.move_to_end(index)
+            return photo
+        image = self.frame(index)
+        if image is None:
+            return None
+        photo = ImageTk.PhotoImage(image)
+        self._photos[index] = photo
+        if self.max_photos is not None and len(self._photos) > self.max_photos:
+            self._photos.popitem(last=False)
+        return photo
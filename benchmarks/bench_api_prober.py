@@ -0,0 +1,43 @@
+"""用本地桩服务器验证接口探测：并发耗时接近最慢的单个请求，并选出最快的可用接口
+
+用法: python benchmarks/bench_api_prober.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_prober import fastest_healthy, probe_all
+from stub_server import Route, StubServer
+
+ROUTES = {
+    "/healthy": Route(delay=0.05),
+    "/fast": Route(delay=0.01),
+    "/slow": Route(delay=0.8),
+    "/error": Route(status=500),
+    "/drop": Route(status=None),
+    "/hang": Route(delay=5.0),
+    "/redirect": Route(delay=0.02, status=302),
+}
+
+
+def main(timeout=1.5):
+    with StubServer(ROUTES) as stub:
+        apis = {path.strip("/"): stub.url(path) + "?url=" for path in ROUTES}
+        apis["dead"] = "http://127.0.0.1:9/?url="
+
+        start = time.perf_counter()
+        results = probe_all(apis, timeout=timeout)
+        elapsed = time.perf_counter() - start
+
+    for result in results.values():
+        print(result)
+    best = fastest_healthy(results)
+    print(f"并发探测 {len(apis)} 个接口耗时 {elapsed * 1000:.0f} ms（单次超时 {timeout * 1000:.0f} ms）")
+    print(f"最快可用接口: {best}")
+    return 0 if best == "fast" and elapsed < timeout + 0.5 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""对比竞速解析与逐个重试：各接口延迟抖动、随机失败时，拿到可用响应的耗时分布和获胜接口
+
+用法: python benchmarks/bench_api_race.py [轮数]
+"""
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_prober import probe
+from api_race import race
+from stub_server import Route, StubServer
+
+# 按优先级排列：首选接口通常最快但不稳定，后面的更慢但更可靠
+ROUTES = {
+    "/primary": Route(delay=0.08, jitter=0.6, fail_rate=0.3),
+    "/backup": Route(delay=0.15, jitter=0.2, fail_rate=0.1),
+    "/steady": Route(delay=0.35, jitter=0.05),
+}
+HEDGE_DELAY = 0.2
+TIMEOUT = 2.0
+
+
+def sequential(candidates):
+    """逐个尝试，前一个失败或超时才换下一个"""
+    start = time.perf_counter()
+    for name, url in candidates:
+        if probe(name, url, TIMEOUT).ok:
+            return name, time.perf_counter() - start
+    return None, time.perf_counter() - start
+
+
+def raced(candidates):
+    result = race(candidates, hedge_delay=HEDGE_DELAY, timeout=TIMEOUT)
+    return (result.winner.name if result.ok else None), result.elapsed
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main(rounds=60):
+    with StubServer(ROUTES) as stub:
+        candidates = [(path.strip("/"), stub.url(path) + "?url=x") for path in ROUTES]
+        stats = {}
+        for label, strategy in (("逐个重试", sequential), ("竞速解析", raced)):
+            wins, latencies = Counter(), []
+            for _ in range(rounds):
+                winner, elapsed = strategy(candidates)
+                wins[winner] += 1
+                latencies.append(elapsed * 1000)
+            stats[label] = latencies
+            print(f"{label}: p50 {percentile(latencies, 0.5):.0f} ms, "
+                  f"p95 {percentile(latencies, 0.95):.0f} ms, "
+                  f"最慢 {max(latencies):.0f} ms, 获胜分布 {dict(wins)}")
+        print(f"请求次数: {stub.hits}")
+
+    seq_p95 = percentile(stats["逐个重试"], 0.95)
+    race_p95 = percentile(stats["竞速解析"], 0.95)
+    print(f"p95 降低 {seq_p95 - race_p95:.0f} ms")
+    return 0 if race_p95 < seq_p95 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,76 @@
+"""接口统计基准：单次更新耗时、条目数上限，以及模拟各平台接口好坏不同时推荐结果能否收敛
+
+用法: python benchmarks/bench_api_stats.py [模拟解析次数]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_stats import ApiStats
+from sources import PARSE_APIS
+
+PLATFORMS = ["爱奇艺", "腾讯视频", "优酷视频", "哔哩哔哩", "芒果TV"]
+
+
+def simulated_quality(rng):
+    """每个 (平台, 接口) 随机指定成功率和平均起播耗时"""
+    return {
+        (platform, api): (rng.uniform(0.1, 0.95), rng.uniform(300, 4000))
+        for platform in PLATFORMS for api in PARSE_APIS
+    }
+
+
+def ideal_best(quality, platform):
+    return max(PARSE_APIS, key=lambda api: quality[(platform, api)][0] / (1 + quality[(platform, api)][1] / 1000))
+
+
+def main(rounds=3000):
+    rng = random.Random(1)
+    quality = simulated_quality(rng)
+    apis = list(PARSE_APIS)
+
+    # 模拟用户：每次用当前推荐的接口（偶尔随机换一个），按真实质量产生结果
+    stats = ApiStats()
+    for _ in range(rounds):
+        platform = rng.choice(PLATFORMS)
+        best = stats.best(platform, apis)
+        api = best if best and rng.random() > 0.3 else rng.choice(apis)
+        success, latency = quality[(platform, api)]
+        ok = rng.random() < success
+        stats.record(platform, api, ok, rng.gauss(latency, latency * 0.2) if ok else None)
+
+    hits = 0
+    for platform in PLATFORMS:
+        best, ideal = stats.best(platform, apis), ideal_best(quality, platform)
+        hits += best == ideal
+        print(f"{platform}: 推荐 {best}，理想 {ideal}")
+    print(f"{rounds} 次解析后推荐命中 {hits}/{len(PLATFORMS)} 个平台")
+
+    # 单次更新耗时与条目数上限
+    bounded = ApiStats(max_entries=512)
+    keys = [(f"平台{i}", f"接口{j}") for i in range(200) for j in range(20)]
+    updates = 500_000
+    start = time.perf_counter()
+    for i in range(updates):
+        platform, api = keys[i % len(keys)]
+        bounded.record(platform, api, i % 3 != 0, 800.0)
+    per_update = (time.perf_counter() - start) / updates * 1e6
+    print(f"单次更新 {per_update:.2f} µs（{len(keys)} 个不同键轮流更新），条目数 {len(bounded)}/512")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bounded.path = os.path.join(tmp, "api_stats.json")
+        bounded.save()
+        size = os.path.getsize(bounded.path)
+        start = time.perf_counter()
+        reloaded = ApiStats(bounded.path)
+        load_ms = (time.perf_counter() - start) * 1000
+    print(f"统计文件 {size / 1024:.1f} KB，加载 {load_ms:.2f} ms，加载后条目数 {len(reloaded)}")
+    return 0 if hits >= len(PLATFORMS) - 1 and len(bounded) <= 512 and len(reloaded) == len(bounded) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,157 @@
+"""资源包基准：散放的资源文件与 mmap 打开的资源包对比
+
+1. 模拟 onefile 启动时的解压：把 5 个资源文件 / 1 个资源包复制到临时目录
+2. 启动时读取全部资源并计算缓存键（打包后散放的文件要读全文算哈希，资源包直接取索引）：
+   统计 open 次数（审计钩子）、read 系统调用次数和读取字节数（/proc/self/io）、缺页次数和耗时
+3. 装有 PIL 时，确认 Resources.image 对同一资源只解码一次
+
+每个场景在独立子进程中运行，互不影响。环境中没有 strace，系统调用次数取自 /proc/self/io 的 syscr，
+mmap 之后的读取表现为缺页而不是 read 调用，一并列出。
+用法: python benchmarks/bench_asset_bundle.py [重复次数]
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+import asset_bundle
+from asset_bundle import ASSETS, BUNDLE_NAME
+
+# 打包后的资源：按内容哈希作缓存键，与打包后的 asset_cache 一致
+CHILD_ENV = {"VIP_BENCH_FROZEN": "1"}
+
+
+def proc_io():
+    try:
+        with open("/proc/self/io") as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f)}
+    except OSError:
+        return None
+
+
+def child(mode, directory):
+    """子进程：按 mode 读取 directory 下的资源，输出统计"""
+    import resource
+
+    if os.environ.get("VIP_BENCH_FROZEN"):
+        sys.frozen = True
+    opened = []
+    sys.addaudithook(lambda event, args: event == "open" and isinstance(args[0], str)
+                     and args[0].startswith(directory) and opened.append(args[0]))
+    locate = lambda name: os.path.join(directory, name)
+    resources = asset_bundle.Resources(os.path.join(directory, BUNDLE_NAME), locate)
+
+    io_before = proc_io()
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    total = 0
+    keys = {}
+    for name in ASSETS:
+        keys[name] = resources.digest(name)
+        with resources.open(name) as f:
+            # 与 PIL 解码一样按块读完整个资源
+            while True:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    break
+                total += len(chunk)
+    elapsed = time.perf_counter() - start
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+    io_after = proc_io()
+
+    decodes = None
+    try:
+        from PIL import Image
+    except ImportError:
+        pass
+    else:
+        calls = []
+        original = Image.open
+        Image.open = lambda *args, **kwargs: calls.append(1) or original(*args, **kwargs)
+        first = resources.image("icon.png")
+        second = resources.image("icon.png")
+        decodes = len(calls) if first is second else -1
+
+    print(json.dumps({
+        "mode": mode,
+        "bundle": resources.bundle is not None,
+        "bytes": total,
+        "opens": len(opened),
+        "syscr": io_after and io_after["syscr"] - io_before["syscr"],
+        "rchar": io_after and io_after["rchar"] - io_before["rchar"],
+        "faults": usage_after.ru_minflt - usage_before.ru_minflt + usage_after.ru_majflt - usage_before.ru_majflt,
+        "ms": elapsed * 1000,
+        "decodes": decodes,
+        "keys": keys,
+    }))
+
+
+def extract(sources, target):
+    """模拟 PyInstaller onefile 启动时把数据文件解压到 _MEIPASS"""
+    start = time.perf_counter()
+    for source in sources:
+        shutil.copy(source, os.path.join(target, os.path.basename(source)))
+    return (time.perf_counter() - start) * 1000
+
+
+def run_child(mode, directory):
+    env = dict(os.environ, **CHILD_ENV)
+    output = subprocess.run([sys.executable, __file__, "--child", mode, directory],
+                            capture_output=True, text=True, env=env, check=True)
+    return json.loads(output.stdout)
+
+
+def main(repeat=5):
+    repeat = int(repeat)
+    results = {"loose": [], "bundle": []}
+    extraction = {"loose": [], "bundle": []}
+    with tempfile.TemporaryDirectory() as scratch:
+        bundle_path = os.path.join(scratch, BUNDLE_NAME)
+        asset_bundle.build(bundle_path, base_dir=ROOT)
+        sources = {"loose": [os.path.join(ROOT, name) for name in ASSETS], "bundle": [bundle_path]}
+        for i in range(repeat):
+            for mode in ("loose", "bundle"):
+                target = os.path.join(scratch, f"{mode}-{i}")
+                os.mkdir(target)
+                extraction[mode].append(extract(sources[mode], target))
+                results[mode].append(run_child(mode, target))
+
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    labels = {"loose": "散放的文件", "bundle": "资源包(mmap)"}
+    for mode in ("loose", "bundle"):
+        runs = results[mode]
+        last = runs[-1]
+        print(f"[{labels[mode]}] 解压 {len(sources[mode])} 个文件 {median(extraction[mode]):.2f} ms；"
+              f"读取 {len(ASSETS)} 个资源 {last['bytes']} 字节：open {last['opens']} 次，"
+              f"read 调用 {last['syscr']} 次、{last['rchar']} 字节，缺页 {median([r['faults'] for r in runs])} 次，"
+              f"耗时中位数 {median([r['ms'] for r in runs]):.3f} ms"
+              + (f"，icon.png 解码 {last['decodes']} 次" if last["decodes"] is not None else ""))
+
+    loose, bundle = results["loose"][-1], results["bundle"][-1]
+    ok = (bundle["bundle"] and not loose["bundle"] and loose["bytes"] == bundle["bytes"]
+          and loose["keys"] == bundle["keys"]  # 资源包索引中的哈希与读全文算出的一致
+          and bundle["opens"] == 1 and loose["opens"] >= 2 * len(ASSETS))
+    if bundle["syscr"] is not None:
+        ok = ok and bundle["syscr"] < loose["syscr"] and bundle["rchar"] < loose["rchar"]
+    if bundle["decodes"] is not None:
+        ok = ok and bundle["decodes"] == 1
+    else:
+        print("未安装 PIL，跳过解码次数检查")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(*sys.argv[2:4])
+    else:
+        sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,110 @@
+"""浏览器启动基准：用假浏览器（fake_browser.py）记录每次启动的参数和时间
+
+- 原来的做法：在调用线程中 webbrowser.open()，逐个链接启动浏览器
+- BrowserLauncher：调用方只把链接放入队列；短时间内的链接合并为一次启动
+场景：用全部解析接口打开同一个链接、间隔较长的几次单独点击。
+
+用法: python benchmarks/bench_browser_launcher.py [假浏览器启动耗时(秒)]
+"""
+import json
+import os
+import shlex
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from browser_launcher import BATCH_WINDOW, BrowserLauncher, resolve_browser
+from sources import PARSE_APIS
+from url_canonical import build_parse_url
+
+VIDEO_URL = "https://www.bilibili.com/video/BV1xx411c7mD/"
+FAKE_BROWSER = f"{shlex.quote(sys.executable)} {shlex.quote(os.path.join(BENCH_DIR, 'fake_browser.py'))}"
+
+
+def read_log(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def wait_for_log(path, count, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        entries = read_log(path)
+        if len(entries) >= count:
+            return entries
+        time.sleep(0.01)
+    return read_log(path)
+
+
+def legacy(urls, log):
+    """原来的做法：webbrowser 按 BROWSER 环境变量找到假浏览器，在调用线程中逐个打开"""
+    os.environ["BROWSER"] = FAKE_BROWSER + " %s"
+    import webbrowser
+    webbrowser._tryorder = None  # 重新探测浏览器，与首次使用时一致
+    blocked = []
+    for url in urls:
+        start = time.perf_counter()
+        webbrowser.open(url, new=2)
+        blocked.append((time.perf_counter() - start) * 1000)
+    entries = wait_for_log(log, len(urls))
+    print(f"[webbrowser.open] {len(urls)} 个链接：启动浏览器 {len(entries)} 次，"
+          f"调用线程阻塞 合计 {sum(blocked):.1f} ms（第一次 {blocked[0]:.1f} ms）")
+    return sum(blocked), len(entries)
+
+
+def batched(urls, log):
+    """全部接口一次打开：放入队列的耗时、启动次数、从放入到浏览器启动的延迟"""
+    launcher = BrowserLauncher(resolve=lambda: resolve_browser({"VIP_BROWSER": FAKE_BROWSER}))
+    start_wall = time.time()
+    start = time.perf_counter()
+    launcher.open_many(urls)
+    blocked = (time.perf_counter() - start) * 1000
+    entries = wait_for_log(log, 1)
+    launcher.close()
+    tabs = sum(len(entry["argv"]) for entry in entries)
+    delay = (entries[0]["time"] - start_wall) * 1000 if entries else float("inf")
+    print(f"[BrowserLauncher 全部接口] {len(urls)} 个链接：启动浏览器 {len(entries)} 次、{tabs} 个标签页，"
+          f"调用线程阻塞 {blocked:.3f} ms，{delay:.0f} ms 后浏览器启动（合并等待 {BATCH_WINDOW * 1000:.0f} ms）")
+    return blocked, len(entries), tabs
+
+
+def spaced(clicks, log):
+    """间隔大于合并窗口的几次单独点击，每次都应单独启动"""
+    launcher = BrowserLauncher(resolve=lambda: resolve_browser({"VIP_BROWSER": FAKE_BROWSER}))
+    blocked = []
+    for i in range(clicks):
+        start = time.perf_counter()
+        launcher.open(f"{VIDEO_URL}?p={i + 1}")
+        blocked.append((time.perf_counter() - start) * 1000)
+        time.sleep(BATCH_WINDOW * 3)
+    entries = wait_for_log(log, clicks)
+    launcher.close()
+    print(f"[BrowserLauncher 单独点击] {clicks} 次：启动浏览器 {len(entries)} 次，"
+          f"调用线程阻塞中位数 {statistics.median(blocked):.3f} ms")
+    return len(entries)
+
+
+def main(browser_delay="0.05"):
+    os.environ["FAKE_BROWSER_DELAY"] = browser_delay
+    urls = [build_parse_url(prefix, VIDEO_URL) for prefix in PARSE_APIS.values()]
+    with tempfile.TemporaryDirectory() as scratch:
+        logs = [os.path.join(scratch, f"{name}.jsonl") for name in ("legacy", "batched", "spaced")]
+        os.environ["FAKE_BROWSER_LOG"] = logs[0]
+        legacy_blocked, legacy_launches = legacy(urls, logs[0])
+        os.environ["FAKE_BROWSER_LOG"] = logs[1]
+        blocked, launches, tabs = batched(urls, logs[1])
+        os.environ["FAKE_BROWSER_LOG"] = logs[2]
+        spaced_launches = spaced(3, logs[2])
+    ok = (launches == 1 and tabs == len(urls) and spaced_launches == 3
+          and legacy_launches == len(urls) and blocked < legacy_blocked)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
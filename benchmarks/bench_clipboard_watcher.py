@@ -0,0 +1,76 @@
+"""剪贴板监听基准：用假剪贴板统计空闲时的唤醒次数、剪贴板读取次数和 CPU 占用，以及复制后多快填入
+
+用法: python benchmarks/bench_clipboard_watcher.py [空闲秒数]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clipboard_watcher import ClipboardWatcher
+from sources import default_matcher
+
+
+class FakeClipboard:
+    """内存中的剪贴板；with_sequence 为真时像 Windows 一样提供变更序号"""
+
+    def __init__(self, text="", with_sequence=False):
+        self.text = text
+        self.sequence = 0
+        self.pastes = 0
+        if with_sequence:
+            self.sequence_number = lambda: self.sequence
+
+    def copy(self, text):
+        self.text = text
+        self.sequence += 1
+
+    def paste(self):
+        self.pastes += 1
+        return self.text
+
+
+def run(with_sequence, idle):
+    clipboard = FakeClipboard("启动前就在剪贴板里的文字", with_sequence)
+    filled = []
+    got = threading.Event()
+
+    def on_url(url):
+        filled.append((url, time.perf_counter()))
+        got.set()
+
+    watcher = ClipboardWatcher(on_url, default_matcher.is_valid, clipboard=clipboard)
+    cpu = time.process_time()
+    watcher.start()
+    time.sleep(idle)
+    idle_cpu = time.process_time() - cpu
+    idle_rate = watcher.wakeups_per_second()
+    idle_reads = clipboard.pastes
+
+    # 复制一段普通文字，再复制一个视频链接
+    clipboard.copy("随便一段文字")
+    time.sleep(0.6)
+    copied_at = time.perf_counter()
+    clipboard.copy("https://www.bilibili.com/video/BV1xx411c7mD/")
+    got.wait(5)
+    watcher.stop()
+
+    latency = (filled[0][1] - copied_at) * 1000 if filled else float("inf")
+    label = "有变更序号" if with_sequence else "只能读取内容"
+    print(f"[{label}] 空闲 {idle:.0f} s：唤醒 {idle_rate:.2f} 次/秒，读取剪贴板 {idle_reads} 次，"
+          f"CPU {idle_cpu * 1000:.1f} ms；复制后 {latency:.0f} ms 填入，填入次数 {len(filled)}")
+    return idle_rate, latency, len(filled)
+
+
+def main(idle=5):
+    ok = True
+    for with_sequence in (False, True):
+        rate, latency, count = run(with_sequence, idle)
+        ok = ok and rate <= 2.0 and latency < 1500 and count == 1
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(float(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,123 @@
+"""对比整段快照 + list.pop(0) 的原撤销历史与基于改动的 EditHistory
+
+模拟用户粘贴一条很长的带跟踪参数的链接后逐字编辑，统计每次按键的耗时和历史记录占用的内存。
+用法: python benchmarks/bench_edit_history.py [链接长度] [按键次数]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from edit_history import EditHistory
+
+
+class LegacyHistory:
+    """原 EnhancedEntry 的做法：每次变化保存整段文本，栈满时 list.pop(0)"""
+
+    class HistoryState:
+        def __init__(self, text, cursor_pos=0):
+            self.text = text
+            self.cursor_pos = cursor_pos
+
+    def __init__(self):
+        self.undo_stack = []
+        self.redo_stack = []
+        self.current_state = None
+
+    def record(self, current_text, cursor_pos):
+        if not self.current_state or current_text != self.current_state.text:
+            if self.current_state:
+                self.undo_stack.append(self.current_state)
+                if len(self.undo_stack) > 50:
+                    self.undo_stack.pop(0)
+            self.current_state = self.HistoryState(current_text, cursor_pos)
+            self.redo_stack = []
+
+
+def edit_session(length, keystrokes, seed=0):
+    """生成 (文本, 光标) 序列：先粘贴长链接，再在随机位置逐字插入或删除"""
+    rng = random.Random(seed)
+    text = "https://www.bilibili.com/video/BV1xx411c7mD?" + "&".join(
+        f"spm_id_from={rng.randrange(10 ** 9)}" for _ in range(length // 24)
+    )
+    states = [(text, len(text))]
+    cursor = len(text)
+    for _ in range(keystrokes):
+        if rng.random() < 0.2:
+            # 偶尔把光标移到别处
+            cursor = rng.randrange(len(text) + 1)
+        if rng.random() < 0.7 or cursor == 0:
+            text = text[:cursor] + rng.choice("abcdef0123") + text[cursor:]
+            cursor += 1
+        else:
+            text = text[:cursor - 1] + text[cursor:]
+            cursor -= 1
+        states.append((text, cursor))
+    return states
+
+
+def fresh(text):
+    """模拟 Entry.get()：每次返回新的字符串对象，而不是同一个对象的引用"""
+    return (text + " ")[:-1]
+
+
+def run(factory, states):
+    """分别统计每次按键的耗时（不开 tracemalloc）和历史记录占用的内存"""
+    history = factory()
+    start = time.perf_counter()
+    for text, cursor in states:
+        history.record(fresh(text), cursor)
+    elapsed = time.perf_counter() - start
+
+    history = factory()
+    tracemalloc.start()
+    for text, cursor in states:
+        history.record(fresh(text), cursor)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return history, elapsed, memory
+
+
+def main(length=4000, keystrokes=20000):
+    states = edit_session(length, keystrokes)
+    _, legacy_time, legacy_mem = run(LegacyHistory, states)
+    history, delta_time, delta_mem = run(lambda: EditHistory(capacity=50), states)
+    steps = len(history.undo_stack)
+
+    print(f"链接长度约 {len(states[0][0])} 字符，按键 {keystrokes} 次，撤销栈上限 50 步")
+    print(f"整段快照: {legacy_time / len(states) * 1e6:7.2f} us/次  历史内存 {legacy_mem / 1024:8.1f} KB"
+          f"  ({legacy_mem / 51:.0f} B/步)")
+    print(f"改动记录: {delta_time / len(states) * 1e6:7.2f} us/次  历史内存 {delta_mem / 1024:8.1f} KB"
+          f"  ({delta_mem / max(steps, 1):.0f} B/步, 合并后 {steps} 步)")
+
+    # 撤销到底再全部重做，结果必须一致
+    final = history.text
+    while history.undo():
+        pass
+    while history.redo():
+        pass
+    if history.text != final:
+        return 1
+    return 0 if check_selection_replace() else 1
+
+
+def check_selection_replace():
+    """选中两个字符替换为一个字符（长度减一、光标前移一位）不能被当成退格：撤销必须依次回到真实出现过的文本"""
+    states = [("abcd", 3), ("aXd", 2), ("ad", 1), ("azd", 2)]
+    history = EditHistory(*states[0])
+    for text, cursor in states[1:]:
+        history.record(text, cursor)
+    seen = [history.text]
+    while history.undo():
+        seen.append(history.text)
+    expected = [text for text, _ in reversed(states)]
+    print(f"选区替换后撤销: {' -> '.join(seen)}" + ("" if seen == expected else f"  应为 {' -> '.join(expected)}"))
+    return seen == expected
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    sys.exit(main(*args))
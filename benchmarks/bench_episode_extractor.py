@@ -0,0 +1,224 @@
+"""剧集提取基准
+
+1. fixtures/episodes/ 下每个平台的剧集页：按不同块大小（1 字节起）喂给解析器，结果须与 expected.json 一致；
+   另有一段覆盖 <script>/<style>/注释各种写法的页面，按每种块大小切分后结果须一致
+2. 生成一个数 MB 的剧集页边生成边解析，统计吞吐和 tracemalloc 峰值内存，与整页读入后解析对比
+3. 剧集列表全在一段数 MB 的内嵌 JSON（<script>）里：检查第一集在最后一块之前就已产出，峰值内存与页面大小无关
+4. 通过 python vip.py episodes 走完整的命令行流程
+
+用法: python benchmarks/bench_episode_extractor.py [大页面 MB 数]
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+from episode_extractor import CHUNK_SIZE, iter_episodes
+
+FIXTURES = os.path.join(BENCH_DIR, "fixtures", "episodes")
+CHUNK_SIZES = (1, 7, 64, 4096, None)  # None 表示整页一次交给解析器
+
+
+def chunked(text, size):
+    if size is None:
+        yield text
+        return
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def check_fixtures():
+    with open(os.path.join(FIXTURES, "expected.json"), encoding="utf-8") as f:
+        expected = json.load(f)
+    failures = 0
+    for name, case in expected.items():
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            text = f.read()
+        for size in CHUNK_SIZES:
+            got = list(iter_episodes(case["page_url"], chunked(text, size)))
+            if got != case["episodes"]:
+                failures += 1
+                print(f"  {name} 块大小 {size}: 期望 {case['episodes']}，得到 {got}")
+    print(f"[fixtures] {len(expected)} 个平台 × {len(CHUNK_SIZES)} 种块大小，不一致 {failures} 处")
+    return failures == 0
+
+
+PAGE_URL = "https://v.qq.com/x/cover/mzc00200ab1c2d3.html"
+# <script>/<style> 的切分不依赖 HTMLParser 内部状态：大写标签、属性值中的 >、注释中的 <script>、
+# 带空格的结束标签、样式和 JSON 字符串中的伪结束标签都要与整页解析结果一致
+EDGE_PAGE = (
+    '<html><head><STYLE>a{background:url(/x/cover/mzc00200ab1c2d3/s0000000001.html)}</style >'
+    '<script type="text/x-data" data-note="a>b">var a = {"u":"https:\\/\\/v.qq.com\\/x\\/cover\\/mzc00200ab1c2d3\\/e0000000001.html",'
+    '"t":"<\\/script>"};</SCRIPT\n>'
+    '<!-- <script>"https://v.qq.com/x/cover/mzc00200ab1c2d3/c0000000001.html"</script> -->'
+    '<a href="/x/cover/mzc00200ab1c2d3/e0000000002.html">2</a>'
+    '<script>"//v.qq.com/x/cover/mzc00200ab1c2d3/e0000000003.html"</script>'
+    '<a href="/x/cover/mzc00200ab1c2d3/e0000000004.html">4</a></head></html>'
+)
+EDGE_EPISODES = [f"https://v.qq.com/x/cover/mzc00200ab1c2d3/e000000000{i}.html" for i in range(1, 5)]
+
+
+def check_raw_elements():
+    failures = 0
+    for size in range(1, 40):
+        got = list(iter_episodes(PAGE_URL, chunked(EDGE_PAGE, size)))
+        if got != EDGE_EPISODES:
+            failures += 1
+            print(f"  块大小 {size}: 期望 {EDGE_EPISODES}，得到 {got}")
+    print(f"[script/style 切分] 块大小 1-39，不一致 {failures} 处")
+    return failures == 0
+EPISODE = "/x/cover/mzc00200ab1c2d3/v{:010d}.html"
+NOISE = (
+    '<div class="item"><a href="/channel/tv?page={i}">频道 {i}</a>'
+    '<a href="/x/cover/mzc00200zz9y8x7/x{i:010d}.html">推荐 {i}</a>'
+    '<img src="//puui.qpic.cn/vcover_hz_pic/0/{i}.jpg" alt="海报"><p>简介文字&amp;说明 {i}</p></div>\n'
+)
+
+
+def big_page(megabytes, episode_every=50):
+    """逐段生成大页面：大量无关的链接、图片和文字，每隔若干段出现一集；中间夹一段较长的 <script>"""
+    yield f'<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>\n'
+    target = megabytes * 1024 * 1024
+    size = i = episodes = 0
+    while size < target:
+        block = NOISE.format(i=i)
+        if i % episode_every == 0:
+            block += f'<a class="episode" href="{EPISODE.format(episodes)}">第{episodes + 1}集</a>\n'
+            episodes += 1
+        if i % 5000 == 2500:
+            items = ",".join(
+                f'{{"url":"https:\\/\\/v.qq.com\\/x\\/cover\\/mzc00200ab1c2d3\\/s{i:06d}{k:04d}.html"}}'
+                for k in range(200)
+            )
+            block += f"<script>window.__DATA__={{\"list\":[{items}]}};</script>\n"
+            episodes += 200
+        size += len(block)
+        i += 1
+        yield block
+    yield "</body></html>\n"
+    big_page.episodes = episodes
+
+
+def rechunk(pieces, size=CHUNK_SIZE):
+    """把生成器产出的小段拼成固定大小的块，模拟按块读取文件或网络"""
+    buffer, length = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        length += len(piece)
+        if length >= size:
+            text = "".join(buffer)
+            for start in range(0, len(text) - size + 1, size):
+                yield text[start:start + size]
+            rest = text[len(text) - len(text) % size:]
+            buffer, length = [rest], len(rest)
+    if length:
+        yield "".join(buffer)
+
+
+def extract(megabytes, streaming):
+    if streaming:
+        return sum(1 for _ in iter_episodes(PAGE_URL, rechunk(big_page(megabytes))))
+    text = "".join(big_page(megabytes))
+    return sum(1 for _ in iter_episodes(PAGE_URL, [text]))
+
+
+def measure(megabytes, streaming):
+    """先计时，再在 tracemalloc 下重跑一遍统计峰值内存（tracemalloc 本身会拖慢很多）"""
+    start = time.perf_counter()
+    count = extract(megabytes, streaming)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    extract(megabytes, streaming)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    label = "按 64 KB 块流式解析" if streaming else "整页读入后解析"
+    print(f"[{label}] {megabytes} MB 页面：{count} 集（应为 {big_page.episodes}），"
+          f"{megabytes / elapsed:.2f} MB/s，峰值内存 {peak / 1024 / 1024:.2f} MB")
+    return count == big_page.episodes, peak
+
+
+SCRIPT_EPISODE = "https:\\/\\/v.qq.com\\/x\\/cover\\/mzc00200ab1c2d3\\/j{:010d}.html"
+SCRIPT_NOISE = ('{{"title":"推荐 {i}","cover":"https:\\/\\/puui.qpic.cn\\/vcover_hz_pic\\/0\\/{i}.jpg",'
+                '"link":"https:\\/\\/v.qq.com\\/x\\/cover\\/mzc00200zz9y8x7\\/z{i:010d}.html","desc":"简介 {i}"}},')
+
+
+def big_script_page(megabytes, episode_every=20):
+    """整个剧集列表都在一段很长的 <script> 内嵌 JSON 里，页面其余部分没有剧集链接"""
+    yield '<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>\n<script>window.__PINIA__={"list":['
+    target = megabytes * 1024 * 1024
+    size = i = episodes = 0
+    while size < target:
+        block = SCRIPT_NOISE.format(i=i)
+        if i % episode_every == 0:
+            block += f'{{"vid":"j{episodes:010d}","url":"{SCRIPT_EPISODE.format(episodes)}"}},'
+            episodes += 1
+        size += len(block)
+        i += 1
+        yield block
+    yield "{}]};</script>\n</body></html>\n"
+    big_script_page.episodes = episodes
+
+
+def measure_script(megabytes):
+    """记录第一集在第几块产出；再在 tracemalloc 下重跑一遍统计峰值内存"""
+    chunks = list(rechunk(big_script_page(megabytes)))
+    fed = [0]
+
+    def counted():
+        for chunk in chunks:
+            fed[0] += 1
+            yield chunk
+
+    first_at, count = None, 0
+    for _ in iter_episodes(PAGE_URL, counted()):
+        count += 1
+        if first_at is None:
+            first_at = fed[0]
+    total = len(chunks)
+    del chunks
+    tracemalloc.start()
+    sum(1 for _ in iter_episodes(PAGE_URL, rechunk(big_script_page(megabytes))))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"[内嵌 JSON 剧集列表] {megabytes} MB 脚本分 {total} 块：{count} 集（应为 {big_script_page.episodes}），"
+          f"第 1 集在第 {first_at} 块产出，峰值内存 {peak / 1024 / 1024:.2f} MB")
+    return count == big_script_page.episodes and first_at is not None and first_at < total / 2, peak
+
+
+def check_cli():
+    case = "qq.html"
+    with open(os.path.join(FIXTURES, "expected.json"), encoding="utf-8") as f:
+        expected = json.load(f)[case]
+    output = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "vip.py"), "episodes", "--api", "③M1907",
+         "--page-url", expected["page_url"], "-i", os.path.join(FIXTURES, case), "-q"],
+        capture_output=True, text=True, encoding="utf-8",
+    )
+    records = [json.loads(line) for line in output.stdout.splitlines()]
+    ok = (output.returncode == 0 and [r["canonical_url"] for r in records] == expected["episodes"]
+          and all(r["parse_url"].startswith("https://im1907.top/?jx=") for r in records))
+    print(f"[vip.py episodes] 输出 {len(records)} 条解析链接，{'与预期一致' if ok else '不一致: ' + output.stderr}")
+    return ok
+
+
+def main(megabytes=4):
+    megabytes = int(megabytes)
+    ok = check_fixtures() and check_raw_elements()
+    streamed_ok, streamed_peak = measure(megabytes, streaming=True)
+    whole_ok, whole_peak = measure(megabytes, streaming=False)
+    script_ok, script_peak = measure_script(megabytes)
+    ok = ok and streamed_ok and whole_ok and script_ok and check_cli()
+    # 流式解析的峰值内存应与页面大小无关（远小于页面本身）
+    ok = ok and streamed_peak < 2 * 1024 * 1024 and streamed_peak < whole_peak / 4
+    ok = ok and script_peak < 2 * 1024 * 1024
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,113 @@
+"""对比 qinqin.gif 的三种加载方式的启动耗时和峰值内存
+
+legacy: 原 create_ui 的做法，启动时解码并缩放全部帧
+cold:   GifFrames 首次启动（无磁盘缓存），记录第一帧就绪时间和全部解码完成时间
+warm:   GifFrames 再次启动（命中磁盘缓存）
+
+每种方式在独立子进程中运行，峰值内存取自 ru_maxrss（仅类 Unix 系统）。
+有显示器（或 Xvfb）时同时创建 PhotoImage，否则只统计 PIL 部分。
+用法: python benchmarks/bench_gif_frames.py
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+GIF = os.path.join(ROOT, "qinqin.gif")
+SIZE = (180, 180)
+
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def make_photo_factory():
+    """有显示器时返回 PhotoImage 构造函数，否则返回 None"""
+    try:
+        import tkinter as tk
+        from PIL import ImageTk
+        root = tk.Tk()
+        root.withdraw()
+        return ImageTk.PhotoImage
+    except Exception:
+        return None
+
+
+def run_legacy():
+    from PIL import Image
+    to_photo = make_photo_factory()
+    start = time.perf_counter()
+    gif = Image.open(GIF)
+    frames = []
+    try:
+        while True:
+            frame = gif.copy().resize(SIZE)
+            frames.append(to_photo(frame) if to_photo else frame)
+            gif.seek(gif.tell() + 1)
+    except EOFError:
+        pass
+    done = time.perf_counter() - start
+    return {"first_frame_ms": done * 1000, "all_frames_ms": done * 1000, "frames": len(frames)}
+
+
+def run_cached():
+    from asset_cache import GifFrames
+    to_photo = make_photo_factory()
+    start = time.perf_counter()
+    frames = GifFrames(GIF, SIZE)
+    while frames.frame(0) is None:
+        time.sleep(0.001)
+    first = time.perf_counter() - start
+    if to_photo:
+        frames.photo(0)
+    while not frames.complete:
+        time.sleep(0.001)
+    # 等待磁盘缓存写入完成
+    while frames.cache_path and not os.path.exists(frames.cache_path):
+        time.sleep(0.001)
+    done = time.perf_counter() - start
+    # 模拟播放两轮：每帧的 PhotoImage 只在第一轮创建，第二轮应全部复用
+    rebuilt = None
+    if to_photo:
+        photos = [frames.photo(index) for index in range(frames.frame_count)]
+        rebuilt = sum(frames.photo(index) is not photo for index, photo in enumerate(photos))
+    return {"first_frame_ms": first * 1000, "all_frames_ms": done * 1000, "frames": frames.frame_count,
+            "rebuilt_photos": rebuilt}
+
+
+def child(mode):
+    result = run_legacy() if mode == "legacy" else run_cached()
+    result["peak_rss_kb"] = peak_rss_kb()
+    print(json.dumps(result))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_home:
+        env = dict(os.environ, XDG_CACHE_HOME=cache_home, LOCALAPPDATA=cache_home)
+        for mode, label in (("legacy", "legacy"), ("cached", "cold"), ("cached", "warm")):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            rss = result["peak_rss_kb"]
+            print(f"{label:6s} 帧数 {result['frames']:3d}  第一帧 {result['first_frame_ms']:8.1f} ms  "
+                  f"全部 {result['all_frames_ms']:8.1f} ms  峰值内存 "
+                  f"{'%.1f MB' % (rss / 1024) if rss else '未知'}"
+                  + (f"  第二轮新建 PhotoImage {result['rebuilt_photos']} 个" if result.get("rebuilt_photos") is not None else ""))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        child(sys.argv[2])
+    else:
+        main()
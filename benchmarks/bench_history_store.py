@@ -0,0 +1,72 @@
+"""历史记录搜索基准：10 万条记录下前缀/子串查询的耗时
+
+用法: python benchmarks/bench_history_store.py [记录数]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import mixed_urls
+from history_store import HistoryStore
+from sources import REGISTRY
+from url_canonical import video_key
+
+QUERIES = [
+    "",                              # 最近记录
+    "https://www.bili",              # 前缀，命中很多
+    "bilibili",                      # 常见子串
+    "mgtv.com/b/12",                 # 较少命中
+    "id_zzzzzz",                     # 很少或没有命中
+    "ac",                            # 短查询
+    "no-such-video-anywhere",        # 不命中
+]
+
+
+def fill(store, count):
+    rows = []
+    now = time.time()
+    for index, url in enumerate(mixed_urls(count * 3, seed=1, valid_ratio=1.0)):
+        key = video_key(url)
+        if key:
+            rows.append((key[2], url, REGISTRY.platform_by_domain.get(key[0]), "①夜幕解析", now - count + index))
+        if len(rows) >= count:
+            break
+    start = time.perf_counter()
+    store.record_many(rows)
+    store.flush()
+    return len(rows), time.perf_counter() - start
+
+
+def main(count=100_000, repeat=50):
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, "history.sqlite3"))
+        rows, write_time = fill(store, count)
+        total = store._reader.execute("SELECT count(*) FROM history").fetchone()[0]
+        print(f"写入 {rows} 条（去重后 {total} 条）耗时 {write_time:.2f} s，FTS5 trigram: {store.has_fts}")
+
+        worst = 0.0
+        for query in QUERIES:
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                results = store.search(query, limit=10)
+                times.append((time.perf_counter() - start) * 1000)
+            worst = max(worst, max(times))
+            print(f"  {query!r:28s} 结果 {len(results):2d}  中位数 {statistics.median(times):6.2f} ms"
+                  f"  最大 {max(times):6.2f} ms")
+
+        start = time.perf_counter()
+        for index in range(1000):
+            store.record(f"https://www.bilibili.com/video/BVclick{index:05d}/", "x", "哔哩哔哩", "②8090g")
+        enqueue = (time.perf_counter() - start) / 1000 * 1e6
+        store.close()
+        print(f"record() 平均 {enqueue:.1f} us/次（只入队，不等磁盘）")
+    return 0 if worst < 10 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,137 @@
+"""输入框即时校验基准：模拟逐字输入链接，比较每次按键都校验和停止输入后才校验
+
+用模拟时钟驱动 Debouncer（不真正等待），按键间隔 40~150 ms，偶尔停顿超过校验延迟；
+统计每次按键的耗时、实际校验次数、完整匹配（规范化+正则）次数，并核对最终结果与 url_matcher 一致。
+
+用法: python benchmarks/bench_live_validation.py [链接数]
+"""
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import mixed_urls
+from live_validation import Debouncer, LiveValidator
+from sources import default_matcher
+from url_canonical import canonicalize
+
+DELAY = 0.3  # 与 vip.VALIDATE_DELAY 一致
+
+
+class SimulatedTk:
+    """模拟 Tk 的 after/after_cancel 和时钟，advance() 时按时间顺序执行到期的回调"""
+
+    def __init__(self):
+        self.now = 0.0
+        self._timers = []
+        self._cancelled = set()
+        self._seq = 0
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, func):
+        self._seq += 1
+        heapq.heappush(self._timers, (self.now + ms / 1000, self._seq, func))
+        return self._seq
+
+    def after_cancel(self, after_id):
+        self._cancelled.add(after_id)
+
+    def advance(self, seconds):
+        target = self.now + seconds
+        while self._timers and self._timers[0][0] <= target:
+            due, after_id, func = heapq.heappop(self._timers)
+            self.now = due
+            if after_id not in self._cancelled:
+                func()
+        self.now = target
+
+
+def sessions(count, seed=0):
+    """每个链接的按键序列：(输入后的文本, 距下一次按键的秒数)；部分链接整段粘贴，部分中途打错再退格"""
+    rng = random.Random(seed)
+    urls = [url for url in mixed_urls(count, seed=seed) if url]
+    for url in urls:
+        keys = []
+        if rng.random() < 0.3:
+            keys.append(url)
+        else:
+            text = ""
+            for ch in url:
+                text += ch
+                keys.append(text)
+                if rng.random() < 0.03:
+                    # 打错一个字符再删掉
+                    keys.append(text + "x")
+                    keys.append(text)
+        steps = []
+        for text in keys:
+            pause = rng.uniform(0.5, 1.0) if rng.random() < 0.05 else rng.uniform(0.04, 0.15)
+            steps.append((text, pause))
+        steps[-1] = (steps[-1][0], 1.0)  # 输入完停下来
+        yield url, steps
+
+
+def eager(count):
+    """原来的做法：每次按键都规范化并匹配一次"""
+    canonicalize.cache_clear()
+    keystrokes = 0
+    start = time.perf_counter()
+    for _, steps in sessions(count):
+        for text, _ in steps:
+            default_matcher.match(canonicalize(text) or text.strip())
+            keystrokes += 1
+    elapsed = time.perf_counter() - start
+    print(f"[每次按键校验] {keystrokes} 次按键，校验 {keystrokes} 次，每次按键 {elapsed / keystrokes * 1e6:.1f} µs")
+    return keystrokes
+
+
+def debounced(count):
+    canonicalize.cache_clear()
+    tk = SimulatedTk()
+    validator = LiveValidator(default_matcher)
+    current = [""]
+    results = []
+    debouncer = Debouncer(tk, DELAY, lambda: results.append(validator.check(current[0])), clock=tk.clock)
+
+    keystrokes = pauses = mismatches = 0
+    key_time = 0.0
+    for url, steps in sessions(count):
+        checks_before = len(results)
+        for text, pause in steps:
+            current[0] = text
+            fired = len(results)
+            start = time.perf_counter()
+            debouncer.poke()
+            key_time += time.perf_counter() - start
+            if len(results) != fired:
+                # 按键本身触发了校验
+                mismatches += 1
+            keystrokes += 1
+            pauses += pause >= DELAY
+            tk.advance(pause)
+        if len(results) == checks_before or results[-1].platform != default_matcher.match(canonicalize(url) or url):
+            mismatches += 1
+
+    print(f"[停止输入后校验] {keystrokes} 次按键，校验 {len(results)} 次（停顿 {pauses} 次），"
+          f"完整匹配 {validator.full_checks} 次，按域名直接判无效 {validator.prefix_skips} 次；"
+          f"每次按键 {key_time / keystrokes * 1e6:.2f} µs")
+    return keystrokes, len(results), pauses, mismatches
+
+
+def main(count=2000):
+    count = int(count)
+    eager(count)
+    keystrokes, checks, pauses, mismatches = debounced(count)
+    if mismatches:
+        print(f"结果不一致或按键时触发了校验: {mismatches}")
+    # 只在停顿时校验：校验次数等于停顿次数（每个链接末尾也算一次停顿）
+    return 0 if mismatches == 0 and checks == pauses and checks < keystrokes / 5 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,128 @@
+"""提示框基准：原来每次新建提示窗口的 show_warning 与复用同一个提示框的 NotificationDialog 对比
+
+分别测量第一次提示、提示框开着时重复同一条提示 20 次、连续 20 条不同的提示，
+记录每次调用的耗时和累计创建的窗口数。有显示器且装有 customtkinter 时使用真实 Tk，否则使用 fake_tk 中的假控件
+（此时测到的只是项目代码本身的开销）。
+
+用法: python benchmarks/bench_notifier.py [--mock]
+"""
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+BURST = 20
+
+
+def use_real_tk(argv):
+    if "--mock" in argv:
+        return False
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return False
+    try:
+        import customtkinter  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def legacy_show_warning(ctk, root, message):
+    """改动前 vip.VideoParser.show_warning 的做法（图标除外）：每次新建窗口，update() 后再居中"""
+    warning_window = ctk.CTkToplevel()
+    warning_window.title("提示")
+    warning_window.geometry("400*250")
+    warning_window.attributes('-topmost', True)
+    warning_window.transient(root)
+    warning_window.configure(fg_color="#ffffff")
+    text_frame = ctk.CTkFrame(warning_window, fg_color="#ffffff")
+    text_frame.pack(expand=True, fill="both", padx=20, pady=(20, 10))
+    label = ctk.CTkLabel(text_frame, text=message, font=("微软雅黑", 14), text_color="#000000",
+                         wraplength=360, justify="center")
+    label.pack(expand=True)
+    button_frame = ctk.CTkFrame(warning_window, fg_color="#ffffff")
+    button_frame.pack(fill="x", padx=20, pady=(0, 20))
+    btn = ctk.CTkButton(button_frame, text="确定", command=warning_window.destroy, width=100, height=40,
+                        fg_color="#e0e0e0", hover_color="#c0c0c0", text_color="#000000", corner_radius=8)
+    btn.pack(pady=10)
+    warning_window.update()
+    warning_window.minsize(warning_window.winfo_width(), warning_window.winfo_height())
+    x = (warning_window.winfo_screenwidth() - warning_window.winfo_width()) // 2
+    y = (warning_window.winfo_screenheight() - warning_window.winfo_height()) // 2
+    warning_window.geometry(f"+{x}+{y}")
+
+
+def count_toplevels(ctk):
+    """包装 CTkToplevel，统计创建的窗口数"""
+    created = [0]
+    original = ctk.CTkToplevel
+
+    class Counted(original):
+        def __init__(self, *args, **kwargs):
+            created[0] += 1
+            super().__init__(*args, **kwargs)
+
+    ctk.CTkToplevel = Counted
+    return created
+
+
+def timed(func, root, real):
+    start = time.perf_counter()
+    func()
+    if real:
+        # 把窗口真正画出来再停表
+        root.update_idletasks()
+    return (time.perf_counter() - start) * 1000
+
+
+def scenario(name, show, root, real, created):
+    before = created[0]
+    first = timed(lambda: show("请先获取视频链接！"), root, real)
+    repeated = [timed(lambda: show("请先获取视频链接！"), root, real) for _ in range(BURST)]
+    burst = [timed(lambda i=i: show(f"第 {i} 个解析接口没有响应"), root, real) for i in range(BURST)]
+    if real:
+        root.update()
+    windows = created[0] - before
+    print(f"[{name}] 第一次 {first:.2f} ms；重复提示中位数 {statistics.median(repeated):.3f} ms；"
+          f"连续不同提示中位数 {statistics.median(burst):.3f} ms；创建窗口 {windows} 个")
+    return first, statistics.median(repeated), windows
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    real = use_real_tk(argv)
+    if not real:
+        import fake_tk
+        fake_tk.install()
+    import customtkinter as ctk
+    from notifier import NotificationDialog
+
+    print(f"界面: {'真实 Tk' if real else '假控件'}")
+    created = count_toplevels(ctk)
+    root = ctk.CTk()
+    if real:
+        root.withdraw()
+        root.update()
+
+    _, legacy_repeat, legacy_windows = scenario(
+        "每次新建窗口", lambda message: legacy_show_warning(ctk, root, message), root, real, created)
+    if real:
+        for child in root.winfo_children():
+            child.destroy()
+
+    dialog = NotificationDialog(root)
+    build = timed(dialog.build, root, real)
+    print(f"预建提示框 {build:.2f} ms（启动后空闲时完成）")
+    _, new_repeat, new_windows = scenario("复用提示框", dialog.show, root, real, created)
+    if real:
+        root.destroy()
+
+    # 复用提示框不应再创建窗口，重复提示应明显快于新建窗口
+    ok = new_windows == 0 and legacy_windows == 1 + 2 * BURST and new_repeat < legacy_repeat
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
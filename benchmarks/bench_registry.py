@@ -0,0 +1,162 @@
+"""注册表基准：生成有数千个平台和接口的注册表，统计加载（编译）耗时、空轮询开销和热路径查询
+
+1. 加载：读取 JSON、校验、预编译全部正则（首次加载），以及只改了接口、沿用上一个快照中正则的重新加载，取中位数
+2. 空轮询：文件没变时 poll() 只做一次 stat
+3. 查询：直接用匹配器、经 watcher.current 取快照（不加锁）、每次加锁取快照，三者对比
+4. 热更新：后台线程不断原子替换文件（中途写入一次坏文件），RegistryWatcher 轮询替换快照；
+   查询线程每次取一次快照，检查平台名和接口名来自同一代，统计替换期间的查询吞吐
+
+用法: python benchmarks/bench_registry.py [条目数]
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from registry import RegistryWatcher, load_registry
+
+
+def registry_data(entries, generation):
+    """entries 个平台（各有域名和链接正则）和 entries 个接口；名称带上代号，便于检查是否来自同一次加载"""
+    return {
+        "platforms": [
+            {"name": f"平台{i}-g{generation}", "home": f"https://www.site{i}.com/",
+             "domain": f"site{i}.com", "pattern": rf"www\.site{i}\.com/(?:v|play)/[0-9a-z]+"}
+            for i in range(entries)
+        ],
+        "apis": [{"name": f"接口{i}-g{generation}", "prefix": f"https://jx{i}.example.com/?url="}
+                 for i in range(entries)],
+    }
+
+
+def write_atomic(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def generation_of(name):
+    return name.rpartition("-g")[2]
+
+
+def measure_load(path, previous=None, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        registry = load_registry(path, previous)
+        times.append((time.perf_counter() - start) * 1000)
+    return registry, statistics.median(times)
+
+
+def measure_lookups(registry, watcher, urls):
+    lock = threading.Lock()
+
+    def locked():
+        with lock:
+            return watcher.current
+
+    ways = {
+        "直接用匹配器": lambda url: registry.matcher.match(url),
+        "watcher.current": lambda url: watcher.current.matcher.match(url),
+        "加锁取快照": lambda url: locked().matcher.match(url),
+    }
+    results = {}
+    for label, lookup in ways.items():
+        start = time.perf_counter()
+        for url in urls:
+            lookup(url)
+        results[label] = (time.perf_counter() - start) / len(urls) * 1e6
+    print("[查询] " + "，".join(f"{label} {us:.2f} µs/次" for label, us in results.items()))
+
+
+def hot_reload(path, entries, urls, seconds=2.0, readers=2):
+    watcher = RegistryWatcher(load_registry(path), locate=lambda: path, interval=0.005)
+    stop = threading.Event()
+    stats = {"lookups": 0, "mismatches": 0, "generations": set()}
+    stats_lock = threading.Lock()
+
+    def reader():
+        lookups = mismatches = 0
+        generations = set()
+        while not stop.is_set():
+            for url in urls:
+                registry = watcher.current
+                platform = registry.matcher.match(url)
+                api = next(iter(registry.parse_apis))
+                generation = generation_of(api)
+                if platform is None or generation_of(platform) != generation:
+                    mismatches += 1
+                generations.add(generation)
+                lookups += 1
+        with stats_lock:
+            stats["lookups"] += lookups
+            stats["mismatches"] += mismatches
+            stats["generations"] |= generations
+
+    def writer():
+        generation = 1
+        while not stop.wait(0.1):
+            generation += 1
+            text = json.dumps(registry_data(entries, generation), ensure_ascii=False)
+            if generation == 4:
+                # 写到一半的文件：解析失败，应继续使用上一代
+                text = text[:-100]
+            write_atomic(path, text)
+            # 等轮询线程看到这次写入再写下一次（写入之后开始的轮询至少完成一次）
+            polls = watcher.polls
+            while watcher.polls < polls + 2 and not stop.is_set():
+                time.sleep(0.001)
+        stats["written"] = generation
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)] + [threading.Thread(target=writer)]
+    watcher.start()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    watcher.stop()
+    watcher.poll()
+    print(f"[热更新] {seconds:.0f} s 内写入 {stats['written'] - 1} 次（其中 1 次为坏文件）："
+          f"替换快照 {watcher.reloads} 次，加载失败 {watcher.failures} 次，轮询 {watcher.polls} 次；"
+          f"{readers} 个查询线程共 {stats['lookups'] / seconds:.0f} 次/秒，看到 {len(stats['generations'])} 代，"
+          f"平台与接口不属于同一代 {stats['mismatches']} 次")
+    ok = (stats["mismatches"] == 0 and watcher.failures == 1 and watcher.reloads == stats["written"] - 2
+          and generation_of(next(iter(watcher.current.parse_apis))) == str(stats["written"]))
+    return ok
+
+
+def main(entries=5000):
+    entries = int(entries)
+    urls = [f"https://www.site{i}.com/v/abc{i}" for i in range(0, entries, max(1, entries // 500))]
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "registry.json")
+        write_atomic(path, json.dumps(registry_data(entries, 1), ensure_ascii=False))
+        registry, load_ms = measure_load(path)
+        _, reload_ms = measure_load(path, registry)
+        print(f"[加载] {entries} 个平台 + {entries} 个接口（{os.path.getsize(path) / 1024:.0f} KB）："
+              f"首次加载（编译全部正则）{load_ms:.1f} ms，沿用已编译正则的重新加载 {reload_ms:.1f} ms")
+
+        watcher = RegistryWatcher(registry, locate=lambda: path)
+        polls = 20_000
+        start = time.perf_counter()
+        for _ in range(polls):
+            watcher.poll()
+        poll_us = (time.perf_counter() - start) / polls * 1e6
+        print(f"[空轮询] 文件未变时每次 poll() {poll_us:.1f} µs，重新加载 {watcher.reloads} 次")
+
+        measure_lookups(registry, watcher, urls * 20)
+        ok = watcher.reloads == 0 and all(registry.matcher.match(url) for url in urls)
+        ok = hot_reload(path, entries, urls) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,79 @@
+"""单实例交接基准：已有实例在运行时，再次启动 python vip.py <链接> 到进程退出的耗时
+
+在本进程中启动 InstanceServer 充当正在运行的窗口，子进程走 vip.py 的真实入口，
+在导入 customtkinter/PIL 之前就把链接交出并退出，所以没有安装界面依赖也能运行。
+用法: python benchmarks/bench_single_instance.py [启动次数]
+"""
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RUNTIME_DIR = tempfile.mkdtemp(prefix="vip-bench-run-")
+os.environ["XDG_RUNTIME_DIR"] = RUNTIME_DIR  # 须在导入 single_instance 之前设置
+os.environ["XDG_DATA_HOME"] = os.environ["APPDATA"] = RUNTIME_DIR
+
+import single_instance
+
+VIDEO_URL = "https://www.bilibili.com/video/BV1xx411c7mD/"
+
+
+def wall_ms(command):
+    start = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, check=True, capture_output=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def leave_stale_socket():
+    """模拟上次异常退出：套接字文件还在，但没有进程监听"""
+    if not single_instance.USE_UNIX_SOCKET:
+        return
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(single_instance.socket_path())
+    sock.close()
+
+
+def main(launches=10):
+    leave_stale_socket()
+    received = []
+    server = single_instance.InstanceServer.listen()
+    if server is None:
+        print("无法开始监听")
+        return 1
+    server.set_handler(received.append)
+    try:
+        second = single_instance.InstanceServer.listen()
+        print(f"第二个实例开始监听: {'否' if second is None else '是（错误）'}")
+
+        sends = []
+        for _ in range(200):
+            start = time.perf_counter()
+            single_instance.send({"url": VIDEO_URL, "parse": False})
+            sends.append((time.perf_counter() - start) * 1000)
+        print(f"进程内交接: 中位数 {statistics.median(sends):.3f} ms, 最慢 {max(sends):.3f} ms")
+
+        baseline = [wall_ms([sys.executable, "-c", "pass"]) for _ in range(launches)]
+        handoff = [wall_ms([sys.executable, "vip.py", VIDEO_URL, "--parse"]) for _ in range(launches)]
+        print(f"空解释器启动:             中位数 {statistics.median(baseline):6.1f} ms")
+        print(f"再次启动 vip.py 并交接:   中位数 {statistics.median(handoff):6.1f} ms"
+              f"（比空解释器多 {statistics.median(handoff) - statistics.median(baseline):.1f} ms）")
+        time.sleep(0.1)
+    finally:
+        server.close()
+
+    from_launches = [message for message in received if message.get("parse")]
+    print(f"收到消息 {len(received)} 条，其中来自启动的 {len(from_launches)} 条: {from_launches[:1]}")
+    stale = os.path.exists(single_instance.socket_path()) if single_instance.USE_UNIX_SOCKET else False
+    ok = second is None and len(from_launches) == launches and not stale
+    ok = ok and from_launches[0] == {"url": VIDEO_URL, "parse": True}
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:])))
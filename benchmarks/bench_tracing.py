@@ -0,0 +1,72 @@
+"""追踪开销基准：关闭时 span/装饰器的额外开销，打开时记录一个 span 的成本，并检查导出的 Chrome trace
+
+用法: python benchmarks/bench_tracing.py [次数]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_url_capture import FakeBrowser
+from sources import default_matcher
+from tracing import traced, tracer
+from url_capture import UrlCapture
+
+
+def plain():
+    return 1
+
+
+@traced("装饰的函数")
+def decorated():
+    return 1
+
+
+def with_span():
+    with tracer.span("上下文"):
+        return 1
+
+
+def per_call_ns(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1e9
+
+
+def main(count=200_000):
+    tracer.enabled = False
+    base = per_call_ns(plain, count)
+    off_span = per_call_ns(with_span, count) - base
+    off_decorated = per_call_ns(decorated, count) - base
+    print(f"关闭时额外开销: span {off_span:.0f} ns/次, 装饰器 {off_decorated:.0f} ns/次")
+
+    tracer.enabled = True
+    on_span = per_call_ns(with_span, count) - base
+    on_decorated = per_call_ns(decorated, count) - base
+    print(f"打开时额外开销: span {on_span:.0f} ns/次, 装饰器 {on_decorated:.0f} ns/次")
+
+    # 真实调用路径：用假浏览器获取几次链接，导出 trace 并检查格式
+    tracer.events.clear()
+    tracer.durations.clear()
+    for latency in (0.02, 0.05, 0.08):
+        browser = FakeBrowser(latency)
+        UrlCapture(default_matcher.is_valid, keyboard=browser, clipboard=browser, settle=0.01).capture()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = tracer.write(os.path.join(tmp, "trace.json"))
+        with open(path, encoding="utf-8") as f:
+            trace = json.load(f)
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    print(f"获取链接 3 次，导出 {len(spans)} 个 span")
+    print(tracer.summary())
+
+    ok = off_span < 1000 and off_decorated < 1000 and len(spans) == 12
+    ok = ok and all({"name", "ts", "dur", "pid", "tid"} <= event.keys() for event in spans)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,103 @@
+"""用假键盘和假剪贴板对比固定 200 ms 等待与自适应轮询的链接获取耗时
+
+假浏览器在收到 Ctrl+C 后经过 latency 秒才把链接写入剪贴板。
+用法: python benchmarks/bench_url_capture.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sources import default_matcher
+from url_capture import UrlCapture
+
+VIDEO_URL = "https://www.bilibili.com/video/BV1xx411c7mD"
+
+
+class FakeBrowser:
+    """同时充当键盘和剪贴板：Ctrl+C 之后 latency 秒剪贴板才出现链接"""
+
+    def __init__(self, latency, url=VIDEO_URL):
+        self.latency = latency
+        self.url = url
+        self.text = ""
+        self.ready_at = None
+        self.keys = []
+
+    def press_and_release(self, keys):
+        self.keys.append(keys)
+        if keys == "ctrl+c":
+            self.ready_at = time.perf_counter() + self.latency
+
+    def copy(self, text):
+        self.text = text
+        self.ready_at = None
+
+    def paste(self):
+        if self.ready_at is not None and time.perf_counter() >= self.ready_at:
+            self.text = self.url
+            self.ready_at = None
+        return self.text
+
+
+def legacy_capture(browser):
+    """原 get_current_url 的第一阶段：每步固定等待 200 ms"""
+    browser.copy('')
+    time.sleep(0.2)
+    browser.press_and_release('alt+tab')
+    time.sleep(0.2)
+    browser.press_and_release('alt+d')
+    time.sleep(0.2)
+    browser.press_and_release("ctrl+c")
+    time.sleep(0.2)
+    browser.press_and_release('alt+tab')
+    time.sleep(0.2)
+    return browser.paste().strip()
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    for latency in (0.02, 0.15, 0.4):
+        browser = FakeBrowser(latency)
+        url, legacy_ms = timed(lambda: legacy_capture(browser))
+        print(f"浏览器响应 {latency * 1000:.0f} ms")
+        print(f"  固定等待:   {legacy_ms:7.0f} ms  {'成功' if url == VIDEO_URL else '失败'}")
+
+        capture = UrlCapture(default_matcher.is_valid, keyboard=browser, clipboard=browser)
+        for run in range(1, 4):
+            url, ms = timed(capture.capture)
+            print(f"  自适应第{run}次: {ms:7.0f} ms  {'成功' if url == VIDEO_URL else '失败'}"
+                  f"  下次复制超时 {capture.copy_timer.timeout * 1000:.0f} ms")
+        for name, seconds in capture.last_steps:
+            print(f"    {name}: {seconds * 1000:.1f} ms")
+    return 0 if check_slow_browser() else 1
+
+
+def check_slow_browser(latency=0.8, runs=3):
+    """浏览器比初始超时还慢时（负载很高的机器），超时要逐步放大，之后第一次复制就能拿到链接"""
+    browser = FakeBrowser(latency)
+    capture = UrlCapture(default_matcher.is_valid, keyboard=browser, clipboard=browser)
+    initial = capture.copy_timer.timeout
+    print(f"浏览器响应 {latency * 1000:.0f} ms（比初始复制超时 {initial * 1000:.0f} ms 更慢）")
+    results = []
+    for run in range(1, runs + 1):
+        url, ms = timed(capture.capture)
+        copies = browser.keys.count("ctrl+c")
+        browser.keys.clear()
+        results.append((url == VIDEO_URL, copies))
+        print(f"  自适应第{run}次: {ms:7.0f} ms  {'成功' if url == VIDEO_URL else '失败'}  复制 {copies} 次"
+              f"  下次复制超时 {capture.copy_timer.timeout * 1000:.0f} ms")
+    ok = capture.copy_timer.timeout > latency and results[-1] == (True, 1)
+    if not ok:
+        print("  复制超时没有随超时增长")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(main())
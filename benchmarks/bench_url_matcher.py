@@ -0,0 +1,66 @@
+"""对比原 is_valid_video_url 与 VideoUrlMatcher 在 10 万条混合链接上的耗时
+
+用法: python benchmarks/bench_url_matcher.py [链接数]
+"""
+import os
+import re
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import mixed_urls
+from sources import SUPPORTED_PATTERNS
+from url_matcher import VideoUrlMatcher
+
+
+def legacy_is_valid_video_url(url):
+    """原 VideoParser.is_valid_video_url 的实现，作为对照组"""
+    if not url:
+        return False
+    try:
+        parsed = urlparse(url)
+        supported_patterns = [
+            ('youku.com', r'v\.youku\.com/v_show/id_[^?]+'),
+            ('iqiyi.com', r'www\.iqiyi\.com/[vw]_[^?]+'),
+            ('v.qq.com', r'v\.qq\.com/x/cover/|v\.qq\.com/x/page/[^?]+'),
+            ('bilibili.com', r'www\.bilibili\.com/video/[^?]+'),
+            ('mgtv.com', r'www\.mgtv\.com/b/[^?]+'),
+            ('le.com', r'www\.le\.com/ptv/vplay/[^?]+'),
+            ('sohu.com', r'tv\.sohu\.com/v/[^?]+'),
+            ('1905.com', r'www\.1905\.com/vod/play/[^?]+'),
+            ('pptv.com', r'v\.pptv\.com/show/[^?]+'),
+            ('fun.tv', r'www\.fun\.tv/vplay/[^?]+'),
+            ('acfun.cn', r'www\.acfun\.cn/v/[^?]+')
+        ]
+        return any(
+            domain in parsed.netloc and re.search(pattern, url)
+            for domain, pattern in supported_patterns
+        )
+    except Exception as e:
+        return False
+
+
+def main(count=100_000):
+    urls = mixed_urls(count)
+
+    start = time.perf_counter()
+    legacy = [legacy_is_valid_video_url(url) for url in urls]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = VideoUrlMatcher(SUPPORTED_PATTERNS)
+    matched = matcher.match_many(urls)
+    matcher_time = time.perf_counter() - start
+
+    mismatches = sum(1 for old, new in zip(legacy, matched) if old != (new is not None))
+    print(f"链接数: {count}  有效: {sum(legacy)}  结果不一致: {mismatches}")
+    print(f"原实现:          {legacy_time * 1000:9.1f} ms  ({legacy_time / count * 1e6:.2f} us/条)")
+    print(f"VideoUrlMatcher: {matcher_time * 1000:9.1f} ms  ({matcher_time / count * 1e6:.2f} us/条)")
+    print(f"加速比: {legacy_time / matcher_time:.1f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
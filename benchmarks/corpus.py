@@ -0,0 +1,46 @@
+import random
+
+
+# 可识别的视频链接模板
+VIDEO_URL_TEMPLATES = [
+    "https://v.youku.com/v_show/id_{id}.html?spm=a2hja.{n}",
+    "https://www.iqiyi.com/v_{id}.html",
+    "https://v.qq.com/x/cover/{id}/{id2}.html",
+    "https://v.qq.com/x/page/{id}.html",
+    "https://www.bilibili.com/video/BV{id}/?vd_source={id2}",
+    "https://www.mgtv.com/b/{n}/{n2}.html",
+    "https://www.le.com/ptv/vplay/{n}.html",
+    "https://tv.sohu.com/v/{id}.html",
+    "https://www.1905.com/vod/play/{n}.shtml",
+    "https://v.pptv.com/show/{id}.html",
+    "http://www.fun.tv/vplay/g-{n}/",
+    "https://www.acfun.cn/v/ac{n}",
+]
+
+# 无法识别的链接模板（其他站点、平台首页、非播放页）
+OTHER_URL_TEMPLATES = [
+    "https://www.google.com/search?q={id}",
+    "https://github.com/{id}/{id2}",
+    "https://www.youku.com/",
+    "https://www.bilibili.com/v/popular/{id}",
+    "https://m.iqiyi.com/search.html?key={id}",
+    "https://news.sohu.com/a/{n}_{n2}",
+    "not a url {id}",
+    "",
+]
+
+
+def mixed_urls(count, seed=0, valid_ratio=0.5):
+    """生成可复现的混合链接语料"""
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyz0123456789"
+    urls = []
+    for _ in range(count):
+        templates = VIDEO_URL_TEMPLATES if rng.random() < valid_ratio else OTHER_URL_TEMPLATES
+        urls.append(rng.choice(templates).format(
+            id="".join(rng.choice(alphabet) for _ in range(10)),
+            id2="".join(rng.choice(alphabet) for _ in range(8)),
+            n=rng.randrange(10 ** 6),
+            n2=rng.randrange(10 ** 6),
+        ))
+    return urls
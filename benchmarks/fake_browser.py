@@ -0,0 +1,13 @@
+"""假浏览器：把收到的命令行参数和启动时间追加到 FAKE_BROWSER_LOG 指定的文件（每次启动一行 JSON）
+
+FAKE_BROWSER_DELAY 可模拟浏览器启动耗时（秒）。用法: VIP_BROWSER="python benchmarks/fake_browser.py"
+"""
+import json
+import os
+import sys
+import time
+
+started = time.time()
+with open(os.environ["FAKE_BROWSER_LOG"], "a", encoding="utf-8") as f:
+    f.write(json.dumps({"argv": sys.argv[1:], "time": started, "pid": os.getpid()}) + "\n")
+time.sleep(float(os.environ.get("FAKE_BROWSER_DELAY", "0")))
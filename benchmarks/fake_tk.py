@@ -0,0 +1,171 @@
+"""没有显示器时供基准测试使用的假 Tk 控件
+
+install() 把一个假的 customtkinter 模块放进 sys.modules（必须在导入 vip 之前调用），
+patch(vip) 再把 vip 和 asset_cache 中用到的 tkinter 控件和 ImageTk.PhotoImage 换成假对象。
+控件的方法都是空操作，只有输入框按真实语义维护文本和光标，这样测到的是项目自身代码的开销。
+"""
+import sys
+import tkinter
+import types
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+class FakeWidget:
+    _next_after_id = 0
+
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = options
+
+    def __getattr__(self, name):
+        # pack/grid/bind/title/attributes 等一律当作空操作
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _noop
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    config = configure
+
+    def cget(self, key):
+        return self.options.get(key)
+
+    def after(self, ms, func=None, *args):
+        FakeWidget._next_after_id += 1
+        return f"after#{FakeWidget._next_after_id}"
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def winfo_width(self):
+        return self.options.get("width", 400)
+
+    def winfo_height(self):
+        return self.options.get("height", 250)
+
+    def winfo_screenwidth(self):
+        return 1920
+
+    def winfo_screenheight(self):
+        return 1080
+
+    def winfo_reqheight(self):
+        return self.winfo_height()
+
+    def winfo_toplevel(self):
+        widget = self
+        while isinstance(widget.master, FakeWidget):
+            widget = widget.master
+        return widget
+
+    def winfo_rootx(self):
+        return 0
+
+    def winfo_rooty(self):
+        return 0
+
+    def winfo_exists(self):
+        return True
+
+    def winfo_ismapped(self):
+        return True
+
+
+class FakeEntry(FakeWidget):
+    """按 Tk 输入框的语义维护文本和光标位置"""
+
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self._text = ""
+        self._cursor = 0
+
+    def _index(self, index):
+        if index in ("end", tkinter.END):
+            return len(self._text)
+        if index in ("insert", tkinter.INSERT):
+            return self._cursor
+        return max(0, min(int(index), len(self._text)))
+
+    def get(self):
+        return self._text
+
+    def index(self, index):
+        return self._index(index)
+
+    def icursor(self, index):
+        self._cursor = self._index(index)
+
+    def insert(self, index, text):
+        pos = self._index(index)
+        self._text = self._text[:pos] + text + self._text[pos:]
+        if self._cursor >= pos:
+            self._cursor += len(text)
+
+    def delete(self, first, last=None):
+        start = self._index(first)
+        end = start + 1 if last is None else self._index(last)
+        if end <= start:
+            return
+        self._text = self._text[:start] + self._text[end:]
+        if self._cursor > end:
+            self._cursor -= end - start
+        elif self._cursor > start:
+            self._cursor = start
+
+
+class FakeVariable:
+    def __init__(self, master=None, value=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+
+class FakePhotoImage:
+    def __init__(self, image=None, **options):
+        self.image = image
+        self.options = options
+
+
+def make_customtkinter():
+    module = types.ModuleType("customtkinter")
+    for name in ("CTk", "CTkToplevel", "CTkFrame", "CTkLabel", "CTkButton", "CTkOptionMenu",
+                 "CTkCheckBox", "CTkFont", "CTkImage"):
+        setattr(module, name, type(name, (FakeWidget,), {}))
+    module.CTkEntry = type("CTkEntry", (FakeEntry,), {})
+    module.StringVar = module.BooleanVar = FakeVariable
+    module.set_appearance_mode = module.set_default_color_theme = _noop
+    return module
+
+
+def make_tkinter():
+    """保留真实 tkinter 的常量和 TclError，只替换控件类"""
+    module = types.ModuleType("tkinter")
+    module.__dict__.update({name: value for name, value in vars(tkinter).items() if name.isupper()})
+    module.TclError = tkinter.TclError
+    for name in ("Tk", "Toplevel", "Label", "Listbox", "Frame"):
+        setattr(module, name, type(name, (FakeWidget,), {}))
+    module.PhotoImage = FakePhotoImage
+    return module
+
+
+def install():
+    sys.modules["customtkinter"] = make_customtkinter()
+
+
+def patch(*modules):
+    """把已导入模块中的 tk 和 ImageTk 换成假对象"""
+    fake_tk = make_tkinter()
+    fake_image_tk = types.SimpleNamespace(PhotoImage=FakePhotoImage)
+    for module in modules:
+        if hasattr(module, "tk"):
+            module.tk = fake_tk
+        if hasattr(module, "ImageTk"):
+            module.ImageTk = fake_image_tk
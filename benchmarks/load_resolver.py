@@ -0,0 +1,155 @@
+"""解析服务压测：启动 python vip.py serve（或连接已有服务），多个进程用长连接并发请求 /resolve
+
+服务端单进程运行，受 GIL 限制只用一个核；客户端放在其他进程里，避免和服务端争抢。
+用法:
+    python benchmarks/load_resolver.py [--seconds 5] [--processes 2] [--connections 8]
+    python benchmarks/load_resolver.py --url http://127.0.0.1:8765   # 压测已经在运行的服务
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import mixed_urls
+
+
+def start_server():
+    process = subprocess.Popen(
+        [sys.executable, "vip.py", "serve", "--port", "0"], cwd=ROOT,
+        stderr=subprocess.PIPE, text=True, encoding="utf-8",
+    )
+    line = process.stderr.readline().strip()
+    if not line.startswith("listening on "):
+        process.kill()
+        raise RuntimeError(f"服务启动失败: {line}")
+    return process, line[len("listening on "):]
+
+
+def cpu_seconds(pid):
+    """进程累计 CPU 时间（仅 Linux），无法获取时返回 None"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def connection_worker(base, paths, deadline, results):
+    parts = urlsplit(base)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=5)
+    latencies, errors, i = [], 0, 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=5)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+    results.append((latencies, errors))
+
+
+def client_process(base, connections, seconds, offset, queue):
+    # 各进程循环请求同一批 5000 个链接，第一轮未命中缓存，之后主要命中
+    urls = [url for url in mixed_urls(5_000, seed=0) if url.strip()]
+    paths = [f"/resolve?url={quote(url, safe='')}" for url in urls]
+    paths = paths[offset * 997:] + paths[:offset * 997]
+    deadline = time.perf_counter() + seconds
+    results = []
+    threads = [
+        threading.Thread(target=connection_worker, args=(base, paths[i::connections], deadline, results))
+        for i in range(connections)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies = [latency for items, _ in results for latency in items]
+    queue.put((latencies, sum(errors for _, errors in results)))
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="解析服务压测")
+    parser.add_argument("--url", help="已在运行的服务地址，不指定时自动启动")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--processes", type=int, default=2, help="客户端进程数")
+    parser.add_argument("--connections", type=int, default=8, help="每个客户端进程的长连接数")
+    args = parser.parse_args(argv)
+
+    process = None
+    base = args.url
+    if base is None:
+        process, base = start_server()
+    try:
+        cpu_before = cpu_seconds(process.pid) if process else None
+        queue = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=client_process, args=(base, args.connections, args.seconds, offset, queue))
+            for offset in range(args.processes)
+        ]
+        start = time.perf_counter()
+        for client in clients:
+            client.start()
+        collected = [queue.get() for _ in clients]
+        for client in clients:
+            client.join()
+        elapsed = time.perf_counter() - start
+        cpu_after = cpu_seconds(process.pid) if process else None
+
+        parts = urlsplit(base)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=5)
+        conn.request("GET", "/metrics")
+        metrics = json.loads(conn.getresponse().read())
+        conn.close()
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    latencies = sorted(latency for items, _ in collected for latency in items)
+    errors = sum(count for _, count in collected)
+    total = len(latencies)
+    rps = total / args.seconds
+    print(f"{args.processes} 个客户端进程 x {args.connections} 个长连接，持续 {args.seconds:.0f} s（含启动共 {elapsed:.1f} s）")
+    print(f"完成 {total} 个请求，错误 {errors} 个，吞吐 {rps:.0f} 请求/秒")
+    if latencies:
+        print(f"客户端延迟: p50 {percentile(latencies, 0.5) * 1000:.2f} ms, "
+              f"p95 {percentile(latencies, 0.95) * 1000:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms, "
+              f"平均 {statistics.mean(latencies) * 1000:.2f} ms")
+    capacity = rps
+    if cpu_before is not None and cpu_after is not None and cpu_after > cpu_before:
+        # 客户端和服务端可能在同一个核上争抢，按服务端实际用掉的 CPU 时间折算单核处理能力
+        capacity = total / (cpu_after - cpu_before)
+        print(f"服务端 CPU 占用 {(cpu_after - cpu_before) / elapsed * 100:.0f}%（单核为 100%），"
+              f"折合单核约 {capacity:.0f} 请求/秒")
+    print(f"服务端统计: {json.dumps(metrics['latency_ms'].get('/resolve'), ensure_ascii=False)}, "
+          f"缓存 {json.dumps(metrics['cache'])}")
+    return 0 if errors == 0 and capacity >= 1000 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
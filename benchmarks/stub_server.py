@@ -0,0 +1,73 @@
+"""本地桩 HTTP 服务器，按路径模拟健康、缓慢、出错和断连的解析接口"""
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Route:
+    """一个桩接口的行为：延迟 delay 秒（再加上 0~jitter 秒的随机抖动）后返回 status；
+    status 为 None 时直接断开连接；fail_rate 为随机返回 503 的概率"""
+
+    def __init__(self, delay=0.0, status=200, fail_rate=0.0, body=b"<html>ok</html>", jitter=0.0):
+        self.delay = delay
+        self.jitter = jitter
+        self.status = status
+        self.fail_rate = fail_rate
+        self.body = body
+
+
+class StubServer:
+    def __init__(self, routes, seed=0):
+        self.routes = routes
+        self.hits = {path: 0 for path in routes}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                route = stub.routes.get(path)
+                if route is None:
+                    self.send_error(404)
+                    return
+                with stub._lock:
+                    stub.hits[path] += 1
+                    failed = stub._rng.random() < route.fail_rate
+                    delay = route.delay + stub._rng.uniform(0, route.jitter)
+                time.sleep(delay)
+                if route.status is None:
+                    self.close_connection = True
+                    return
+                status = 503 if failed else route.status
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "text/html")
+                    self.send_header("Content-Length", str(len(route.body)))
+                    self.end_headers()
+                    self.wfile.write(route.body)
+                except ConnectionError:
+                    # 客户端已取消请求（如竞速解析中落败的接口）
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, path):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
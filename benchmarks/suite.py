@@ -0,0 +1,502 @@
+"""基准测试套件：统一运行各热点路径的计时用例，结果保存为 JSON，便于不同版本之间比较
+
+用法:
+    python benchmarks/suite.py                       # 运行全部用例，结果写入 benchmarks/results/
+    python benchmarks/suite.py -k edit -r 10         # 只运行名称包含 edit 的用例，每个重复 10 次
+    python benchmarks/suite.py --compare old.json    # 和之前的结果比较，变慢超过阈值时返回 1
+    python benchmarks/suite.py --tk mock             # 不用显示器，界面控件换成 fake_tk 中的假对象
+
+--tk auto（默认）在有显示器时使用真实 Tk；Linux 上没有显示器但装有 xvfb-run 时在 Xvfb 中重新运行，否则使用假控件。
+缓存和数据目录指向临时目录，不会读写用户自己的缓存；缺少依赖（如 PIL）的用例记为 skipped。
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+CASES = []
+
+
+class Skip(Exception):
+    """用例在当前环境下无法运行"""
+
+
+class Case:
+    def __init__(self, name, func, repeat, needs, items):
+        self.name = name
+        self.func = func  # func(env) -> run 或 (before, run)，before 在每次计时前运行且不计时；
+        # run.teardown 在全部重复结束后运行一次，用于关闭窗口、停止后台线程
+        self.repeat = repeat
+        self.needs = needs  # "vip"：需要导入 vip（PIL + 真实或假的界面库）；"tk"：需要创建窗口
+        self.items = items  # 每次运行处理的条目数，用于换算单条耗时
+
+
+def case(name, repeat=5, needs=(), items=None):
+    def register(func):
+        CASES.append(Case(name, func, repeat, needs, items))
+        return func
+    return register
+
+
+class Env:
+    """运行环境：界面模式、隔离的缓存目录，以及按需导入的 vip 模块"""
+
+    def __init__(self, tk_mode, scratch):
+        self.tk_mode = tk_mode  # "real" 或 "mock"
+        self.scratch = scratch
+        self._vip = None
+
+    def require(self, needs):
+        if "vip" in needs or "tk" in needs:
+            self.vip()
+
+    def vip(self):
+        if self._vip is None:
+            if self.tk_mode == "mock":
+                import fake_tk
+                fake_tk.install()
+            try:
+                import vip
+            except ImportError as e:
+                raise Skip(f"缺少依赖: {e.name}")
+            if self.tk_mode == "mock":
+                import asset_cache
+                fake_tk.patch(vip, asset_cache)
+            self._vip = vip
+        return self._vip
+
+    def clear_cache(self):
+        """清空缓存目录，模拟首次启动"""
+        from paths import cache_dir
+        directory = cache_dir()
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+
+
+def isolate_user_dirs(scratch):
+    """缓存和数据目录指向临时目录（须在导入 paths 之前设置）"""
+    for var in ("XDG_CACHE_HOME", "LOCALAPPDATA"):
+        os.environ[var] = os.path.join(scratch, "cache")
+    for var in ("XDG_DATA_HOME", "APPDATA"):
+        os.environ[var] = os.path.join(scratch, "data")
+    if sys.platform == "darwin":
+        # macOS 上缓存和数据目录在 ~/Library 下
+        os.environ["HOME"] = os.path.join(scratch, "home")
+    for sub in ("cache", "data", "home"):
+        os.makedirs(os.path.join(scratch, sub), exist_ok=True)
+
+
+# ---------------------------------------------------------------- 用例
+
+
+@case("url.is_valid_video_url[10万条混合链接]", items=100_000)
+def bench_url_validation(env):
+    from corpus import mixed_urls
+    from sources import default_matcher
+    from url_canonical import canonicalize, match_video_url
+
+    urls = mixed_urls(100_000, seed=42)
+
+    def before():
+        canonicalize.cache_clear()
+
+    def run():
+        # 与 VideoParser.is_valid_video_url 相同：先匹配原链接，不匹配且域名受支持时再规范化
+        for url in urls:
+            match_video_url(default_matcher, url)
+    return before, run
+
+
+def _typing_session(length):
+    """模拟一次长编辑：逐字输入、中途删改，返回 [(操作, 参数)]"""
+    import random
+    rng = random.Random(7)
+    text_len, ops = 0, []
+    while text_len < length:
+        if text_len > 10 and rng.random() < 0.05:
+            ops.append(("backspace", None))
+            text_len -= 1
+        else:
+            ops.append(("type", rng.choice("abcdefghijklmnopqrstuvwxyz0123456789/?=&._-")))
+            text_len += 1
+    return ops
+
+
+@case("edit.EditHistory[4000 字长编辑+撤销重做]", items=4000)
+def bench_edit_history(env):
+    from edit_history import EditHistory
+    ops = _typing_session(4000)
+    clock = iter(range(10 ** 9)).__next__  # 每步间隔 1 秒以上，不合并，最坏情况
+
+    def run():
+        history = EditHistory(clock=clock)
+        text = ""
+        for op, char in ops:
+            text = text + char if op == "type" else text[:-1]
+            history.record(text, len(text))
+        for _ in range(50):
+            history.undo()
+        for _ in range(50):
+            history.redo()
+    return run
+
+
+@case("edit.EnhancedEntry[save_state/undo/redo 长编辑]", needs=("tk",), items=2000)
+def bench_enhanced_entry(env):
+    vip = env.vip()
+    ops = _typing_session(2000)
+    root = _make_root(env, vip)
+
+    def run():
+        entry = vip.EnhancedEntry(root)
+        for op, char in ops:
+            if op == "type":
+                entry.insert("end", char)
+            else:
+                entry.delete(len(entry.get()) - 1, "end")
+            entry.icursor("end")
+            entry.save_state()
+        for _ in range(50):
+            entry.undo()
+        for _ in range(50):
+            entry.redo()
+        entry.destroy()
+    return run
+
+
+@case("gif.GifFrames[首帧就绪，无磁盘缓存]", needs=("vip",))
+def bench_gif_cold(env):
+    env.vip()
+    return _gif_case(env, cold=True)
+
+
+@case("gif.GifFrames[首帧就绪，命中磁盘缓存]", needs=("vip",))
+def bench_gif_warm(env):
+    env.vip()
+    return _gif_case(env, cold=False)
+
+
+def _gif_case(env, cold):
+    from asset_cache import GifFrames
+
+    def before():
+        env.clear_cache()
+        if not cold:
+            frames = GifFrames.from_resource("qinqin.gif", (180, 180))
+            while not frames.complete:
+                time.sleep(0.01)
+
+    def run():
+        # create_ui 中的做法：创建 GifFrames，等到第一帧可以显示
+        frames = GifFrames.from_resource("qinqin.gif", (180, 180))
+        while frames.frame_count == 0:
+            time.sleep(0.0005)
+        frames.frame(0)
+    return before, run
+
+
+@case("image.JPEG 缩放[Image.open+resize]", needs=("vip",), items=2)
+def bench_jpeg_resize(env):
+    env.vip()
+    from PIL import Image
+    from paths import resource_path
+
+    def run():
+        for name in ("hezhao.jpg", "dp.jpg"):
+            Image.open(resource_path(name)).resize((180, 180))
+    return run
+
+
+@case("image.thumbnail[命中缩略图缓存]", needs=("vip",), items=2)
+def bench_thumbnail_cached(env):
+    env.vip()
+    from asset_cache import thumbnail
+
+    def before():
+        for name in ("hezhao.jpg", "dp.jpg"):
+            thumbnail(name, (180, 180))
+
+    def run():
+        for name in ("hezhao.jpg", "dp.jpg"):
+            thumbnail(name, (180, 180))
+    return before, run
+
+
+@case("ui.show_warning[创建并关闭提示框]", needs=("tk",), repeat=10)
+def bench_show_warning(env):
+    vip = env.vip()
+    app = _make_app(env, vip)
+
+    def run():
+        # 提示框是复用的，关闭即隐藏
+        app.show_warning("请先获取视频链接！")
+        app.notifier.hide()
+        if env.tk_mode == "real":
+            app.root.update()
+    run.teardown = lambda: _close_app(app)
+    return run
+
+
+@case("ui.VideoParser()[同一进程内重复构造]", needs=("tk",))
+def bench_video_parser(env):
+    vip = env.vip()
+    apps = []
+
+    def before():
+        while apps:
+            _close_app(apps.pop())
+
+    def run():
+        apps.append(_make_app(env, vip))
+    run.teardown = before
+    return before, run
+
+
+@case("ui.VideoParser()[新进程冷启动：导入+构造]", needs=("tk",), repeat=3)
+def bench_cold_start(env):
+    env.vip()
+    code = (
+        "import sys, time; start = time.perf_counter(); "
+        f"sys.path[:0] = [{ROOT!r}, {BENCH_DIR!r}]; "
+        + ("import fake_tk; fake_tk.install(); " if env.tk_mode == "mock" else "")
+        + "import vip; "
+        + ("import asset_cache; fake_tk.patch(vip, asset_cache); " if env.tk_mode == "mock" else "")
+        + "vip.VideoParser.after_first_paint = lambda self: None; "  # 同 _make_app，不探测接口
+        + "app = vip.VideoParser(); "
+        + ("app.root.update(); " if env.tk_mode == "real" else "")
+        + "print(time.perf_counter() - start)"
+    )
+    elapsed = []
+
+    def run():
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        elapsed.append(float(output.stdout.strip().splitlines()[-1]))
+    run.reported = elapsed  # 以子进程内部计时为准，不含解释器启动
+    return run
+
+
+def _make_root(env, vip):
+    if env.tk_mode == "real":
+        root = vip.ctk.CTk()
+        root.withdraw()
+        return root
+    return vip.ctk.CTk()
+
+
+def _make_app(env, vip):
+    """构造主窗口，跳过首次绘制后的初始化：接口探测会访问网络，历史记录和注册表轮询会启动后台线程"""
+    original = vip.VideoParser.after_first_paint
+    vip.VideoParser.after_first_paint = lambda self: None
+    try:
+        app = vip.VideoParser()
+        if env.tk_mode == "real":
+            app.root.update()
+    finally:
+        vip.VideoParser.after_first_paint = original
+    # 之后窗口映射或 1 秒的兜底定时器到期时也不再做延迟初始化
+    app.first_paint_pending = False
+    return app
+
+
+def _close_app(app):
+    """关闭窗口并等动图解码线程结束，重复构造时后台线程不会越积越多"""
+    app.gif_animator.stop()
+    while not app.gif_frames.complete:
+        time.sleep(0.001)
+    app.on_close()
+
+
+# ---------------------------------------------------------------- 运行与比较
+
+
+def measure(case, env, repeat):
+    env.require(case.needs)
+    prepared = case.func(env)
+    before, run = prepared if isinstance(prepared, tuple) else (None, prepared)
+    samples = []
+    try:
+        for _ in range(repeat):
+            if before:
+                before()
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                run()
+                samples.append(time.perf_counter() - start)
+            finally:
+                gc.enable()
+    finally:
+        teardown = getattr(run, "teardown", None)
+        if teardown:
+            teardown()
+    reported = getattr(run, "reported", None)
+    if reported:
+        samples = reported
+    result = {
+        "status": "ok",
+        "unit": "s",
+        "repeat": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "max": max(samples),
+        "samples": samples,
+    }
+    if case.items:
+        result["items"] = case.items
+        result["median_per_item_us"] = result["median"] / case.items * 1e6
+    return result
+
+
+def has_display():
+    if sys.platform in ("win32", "darwin"):
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def git_commit():
+    try:
+        output = subprocess.run(
+            ["git", "-C", ROOT, "describe", "--always", "--dirty"], capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def module_version(name):
+    try:
+        module = __import__(name)
+    except ImportError:
+        return None
+    return getattr(module, "__version__", "unknown")
+
+
+def metadata(tk_mode):
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "tk": tk_mode,
+        "pillow": module_version("PIL"),
+        "customtkinter": None if tk_mode == "mock" else module_version("customtkinter"),
+    }
+
+
+def fmt_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:8.3f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds * 1e6:8.1f} µs"
+
+
+def compare(base, current, threshold):
+    """打印两次结果的中位数之比，返回变慢超过阈值的用例名"""
+    regressions = []
+    print(f"\n与 {base['meta'].get('commit')}（{base['meta'].get('time')}）比较:")
+    for name, result in current["results"].items():
+        old = base["results"].get(name)
+        if result["status"] != "ok" or not old or old.get("status") != "ok":
+            continue
+        ratio = result["median"] / old["median"]
+        mark = ""
+        if ratio > threshold:
+            mark = "  变慢"
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            mark = "  变快"
+        print(f"  {name:<44s}{fmt_seconds(old['median'])} -> {fmt_seconds(result['median'])}  x{ratio:5.2f}{mark}")
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="运行基准测试套件并保存 JSON 结果")
+    parser.add_argument("-k", "--filter", help="只运行名称包含该字符串的用例")
+    parser.add_argument("-r", "--repeat", type=int, help="每个用例的重复次数（默认按用例设置）")
+    parser.add_argument("-o", "--output", help="结果文件路径（默认 benchmarks/results/<时间>.json）")
+    parser.add_argument("--tk", choices=("auto", "real", "mock"), default="auto", help="界面模式")
+    parser.add_argument("--compare", metavar="JSON", help="与之前保存的结果比较")
+    parser.add_argument("--threshold", type=float, default=1.25, help="中位数变慢超过该倍数视为退化")
+    parser.add_argument("--list", action="store_true", help="只列出用例")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.list:
+        for item in CASES:
+            print(item.name)
+        return 0
+
+    tk_mode = args.tk
+    if tk_mode == "auto":
+        if has_display():
+            tk_mode = "real"
+        elif shutil.which("xvfb-run") and not os.environ.get("VIP_BENCH_XVFB"):
+            # 在虚拟显示器中重新运行自己
+            env = dict(os.environ, VIP_BENCH_XVFB="1")
+            command = ["xvfb-run", "-a", sys.executable, os.path.abspath(__file__)]
+            return subprocess.call(command + (sys.argv[1:] if argv is None else list(argv)), env=env)
+        else:
+            tk_mode = "mock"
+
+    with tempfile.TemporaryDirectory(prefix="vip-bench-") as scratch:
+        isolate_user_dirs(scratch)
+        env = Env(tk_mode, scratch)
+        report = {"meta": metadata(tk_mode), "results": {}}
+        print(f"界面模式: {tk_mode}，提交: {report['meta']['commit']}")
+        for item in CASES:
+            if args.filter and args.filter not in item.name:
+                continue
+            try:
+                result = measure(item, env, args.repeat or item.repeat)
+            except Skip as e:
+                result = {"status": "skipped", "reason": str(e)}
+            except Exception as e:
+                result = {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+            report["results"][item.name] = result
+            if result["status"] == "ok":
+                extra = f"  单条 {result['median_per_item_us']:.2f} µs" if "items" in result else ""
+                print(f"  {item.name:<44s}中位数 {fmt_seconds(result['median'])}  "
+                      f"最小 {fmt_seconds(result['min'])}  ±{result['stdev'] / result['median'] * 100:4.1f}%{extra}")
+            else:
+                print(f"  {item.name:<44s}{result['status']}: {result['reason']}")
+
+    output = args.output or os.path.join(BENCH_DIR, "results", time.strftime("%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(f"结果已写入 {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        regressions = compare(base, report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} 个用例变慢超过 {args.threshold} 倍")
+            return 1
+    if any(result["status"] == "error" for result in report["results"].values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""在后台线程打开浏览器，短时间内的多个链接合并为一次启动
+
+- 浏览器只解析一次并缓存；webbrowser 在 Linux 上首次使用时要探测已安装的浏览器，这一步也放在后台线程
+- open() 只把链接放入队列，立即返回，不会阻塞 Tk 主线程
+- 第一个链接到达后等待 window 秒，期间到达的链接一起交给浏览器：能在命令行接收多个链接的浏览器
+  （Chrome、Firefox、Edge 等，以及 macOS 的 open）只启动一次进程，每个链接一个标签页
+- 环境变量 VIP_BROWSER 可指定浏览器命令（如 "firefox" 或 "python fake_browser.py"），
+  命令中含 %s 时每个链接单独启动一次
+"""
+import logging
+import os
+import queue
+import shlex
+import subprocess
+import sys
+import threading
+import time
+
+from tracing import tracer
+
+logger = logging.getLogger("vip.browser")
+
+BATCH_WINDOW = 0.15  # 合并链接的等待时间（秒）
+
+# 可以在一条命令中接收多个链接、并在已打开的窗口中新建标签页的浏览器（按可执行文件名匹配）
+MULTI_TAB_BROWSERS = ("chrome", "chromium", "firefox", "msedge", "microsoft-edge", "brave", "opera",
+                      "vivaldi", "iceweasel", "librewolf", "epiphany")
+
+
+class CommandBrowser:
+    """直接启动的浏览器命令"""
+
+    def __init__(self, argv):
+        self.argv = list(argv)
+
+    def launch(self, urls):
+        if "%s" in self.argv:
+            for url in urls:
+                self._spawn([url if arg == "%s" else arg for arg in self.argv])
+        else:
+            self._spawn(self.argv + list(urls))
+
+    def _spawn(self, argv):
+        options = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if sys.platform != "win32":
+            # 浏览器不随本程序退出
+            options["start_new_session"] = True
+        subprocess.Popen(argv, **options)
+
+    def __repr__(self):
+        return f"CommandBrowser({self.argv!r})"
+
+
+class ControllerBrowser:
+    """交给 webbrowser 模块的控制器逐个打开（xdg-open、Windows 默认浏览器等只接受一个链接）"""
+
+    def __init__(self, controller):
+        self.controller = controller
+
+    def launch(self, urls):
+        for url in urls:
+            if not self.controller.open(url, new=2):
+                raise OSError(f"浏览器没有打开链接: {url}")
+
+    def __repr__(self):
+        return f"ControllerBrowser({type(self.controller).__name__})"
+
+
+def resolve_browser(environ=os.environ):
+    """确定用什么打开链接"""
+    command = environ.get("VIP_BROWSER")
+    if command:
+        return CommandBrowser(shlex.split(command, posix=os.name != "nt"))
+    if sys.platform == "darwin":
+        return CommandBrowser(["open"])
+    import webbrowser
+    controller = webbrowser.get()
+    name = getattr(controller, "name", "")
+    if isinstance(controller, webbrowser.UnixBrowser):
+        executable = os.path.basename(name).lower()
+        if any(browser in executable for browser in MULTI_TAB_BROWSERS):
+            return CommandBrowser([name])
+    return ControllerBrowser(controller)
+
+
+class BrowserLauncher:
+    def __init__(self, window=BATCH_WINDOW, resolve=resolve_browser, on_error=None):
+        self.window = window
+        self.resolve = resolve
+        self.on_error = on_error  # 启动失败时在后台线程中调用 on_error(链接列表, 异常)
+        self.browser = None
+        self.launches = 0  # 浏览器启动（合并后）的次数
+        self.opened = 0  # 打开的链接数
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def open(self, url):
+        self.open_many([url])
+
+    def open_many(self, urls):
+        for url in urls:
+            self._queue.put(url)
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="browser-launcher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            url = self._queue.get()
+            if url is None:
+                return
+            batch = [url]
+            deadline = time.monotonic() + self.window
+            stop = False
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    url = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if url is None:
+                    stop = True
+                    break
+                batch.append(url)
+            self._launch(list(dict.fromkeys(batch)))
+            if stop:
+                return
+
+    def _launch(self, urls):
+        with tracer.span("启动浏览器", "browser", {"tabs": len(urls)}):
+            try:
+                if self.browser is None:
+                    self.browser = self.resolve()
+                    logger.debug("使用浏览器 %r", self.browser)
+                self.browser.launch(urls)
+            except Exception as e:
+                logger.warning("打开浏览器失败: %s", e)
+                if self.on_error:
+                    self.on_error(urls, e)
+                return
+        self.launches += 1
+        self.opened += len(urls)
+
+    def close(self, timeout=1.0):
+        """把还在等待合并的链接打开后停止后台线程"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
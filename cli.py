@@ -0,0 +1,205 @@
+"""无界面命令行入口，只依赖标准库，不导入 customtkinter/PIL/keyboard
+
+用法:
+    python vip.py batch --api ③M1907 < urls.txt
+    python vip.py batch --api ③M1907 --format csv -i urls.txt > links.csv
+    python vip.py serve --port 8765
+    python vip.py episodes https://v.qq.com/x/cover/<cid>.html --api ③M1907
+    python vip.py episodes --page-url https://v.qq.com/x/cover/<cid>.html -i saved.html
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from registry import load_active
+from url_canonical import build_parse_url, canonicalize
+
+# vip.py 在导入 GUI 依赖之前会把这些子命令交给 main()
+HEADLESS_COMMANDS = ("batch", "serve", "episodes")
+
+
+def iter_urls(stream):
+    """逐行读取链接，跳过空行，不会把整个输入读入内存"""
+    for line in stream:
+        url = line.strip()
+        if url:
+            yield url
+
+
+def iter_parse_links(urls, api_prefix, matcher, keep_invalid=False, unique=False):
+    """把链接流转换为 (链接, 平台, 规范链接, 解析链接) 流，无效链接除原链接外均为 None
+
+    matcher 为注册表快照中的匹配器；unique 为真时同一视频（规范链接相同）只输出第一次出现的那条。
+    """
+    match = matcher.match
+    seen = set() if unique else None
+    for url in urls:
+        # 先规范化，移动端域名等写法也能识别
+        canonical = canonicalize(url) or url
+        platform = match(canonical)
+        if platform is None:
+            if keep_invalid:
+                yield url, None, None, None
+            continue
+        if seen is not None:
+            if canonical in seen:
+                continue
+            seen.add(canonical)
+        yield url, platform, canonical, build_parse_url(api_prefix, canonical)
+
+
+def check_api(api, registry):
+    if api not in registry.parse_apis:
+        print(f"未知的解析接口: {api}\n可用接口: {', '.join(registry.parse_apis)}", file=sys.stderr)
+        return False
+    return True
+
+
+def resolve_api(args, registry):
+    """命令行指定的解析接口，未指定时用注册表中的第一个接口；接口不存在时返回 None"""
+    api = args.api or next(iter(registry.parse_apis))
+    return api if check_api(api, registry) else None
+
+
+def open_input(path):
+    if path == "-":
+        sys.stdin.reconfigure(encoding="utf-8", errors="replace")
+        return sys.stdin
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def write_records(records, fmt):
+    """逐条写出 (链接, 平台, 规范链接, 解析链接)，返回 (输出条数, 有效条数)；下游关闭管道时返回 None"""
+    out = sys.stdout
+    out.reconfigure(encoding="utf-8", newline="\n")
+    total = valid = 0
+    try:
+        if fmt == "csv":
+            writer = csv.writer(out, lineterminator="\n")
+            writer.writerow(("url", "platform", "canonical_url", "parse_url"))
+            for url, platform, canonical, parse_url in records:
+                writer.writerow((url, platform or "", canonical or "", parse_url or ""))
+                total += 1
+                valid += platform is not None
+        else:
+            for url, platform, canonical, parse_url in records:
+                out.write(json.dumps(
+                    {"url": url, "platform": platform, "canonical_url": canonical, "parse_url": parse_url},
+                    ensure_ascii=False,
+                ))
+                out.write("\n")
+                total += 1
+                valid += platform is not None
+        out.flush()
+    except BrokenPipeError:
+        # 下游（如 head）提前关闭管道时安静退出，避免解释器退出时再次刷新报错
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return None
+    return total, valid
+
+
+def run_batch(args):
+    # 运行命令时才读取注册表，用的是当前的 registry.json
+    registry = load_active()
+    api = resolve_api(args, registry)
+    if api is None:
+        return 2
+
+    source = open_input(args.input)
+    try:
+        records = iter_parse_links(iter_urls(source), registry.parse_apis[api], registry.matcher,
+                                   args.keep_invalid, args.unique)
+        counts = write_records(records, args.format)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    if counts is not None and not args.quiet:
+        print(f"输出 {counts[0]} 条，有效 {counts[1]} 条", file=sys.stderr)
+    return 0
+
+
+def run_episodes(args):
+    registry = load_active()
+    api = resolve_api(args, registry)
+    if api is None:
+        return 2
+    import episode_extractor
+
+    page_url = args.page_url or args.url
+    if not page_url:
+        print("请给出剧集页链接（读取本地文件时用 --page-url 指定）", file=sys.stderr)
+        return 2
+    source = None
+    if args.input is not None:
+        source = open_input(args.input)
+        chunks = episode_extractor.read_chunks(source)
+    else:
+        chunks = episode_extractor.fetch_chunks(args.url or page_url, timeout=args.timeout)
+    try:
+        # 边解析边输出：每解析完一块，新发现的剧集就转换为解析链接写出
+        episodes = episode_extractor.iter_episodes(page_url, chunks)
+        counts = write_records(iter_parse_links(episodes, registry.parse_apis[api], registry.matcher), args.format)
+    except OSError as e:
+        print(f"读取剧集页失败: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if source is not None and source is not sys.stdin:
+            source.close()
+
+    if counts is not None and not args.quiet:
+        print(f"找到 {counts[0]} 集", file=sys.stderr)
+    return 0 if counts is None or counts[0] else 1
+
+
+def run_serve(args):
+    import resolver_server
+    # 服务从 sources 中的快照开始，之后由 RegistryWatcher 跟随文件修改
+    if args.api is not None and not check_api(args.api, resolver_server.REGISTRY):
+        return 2
+    return resolver_server.serve(args.host, args.port, args.api, args.cache_size, args.verbose)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="vip.py", description="视频解析器命令行模式")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="批量把视频链接转换为解析链接")
+    batch.add_argument("--api", help="解析接口名称，默认为注册表中的第一个接口")
+    batch.add_argument("-i", "--input", default="-", help="链接文件，每行一个，默认读取标准输入")
+    batch.add_argument("-f", "--format", choices=("jsonl", "csv"), default="jsonl", help="输出格式")
+    batch.add_argument("--keep-invalid", action="store_true", help="同时输出无法识别的链接")
+    batch.add_argument("-u", "--unique", action="store_true",
+                       help="同一视频只输出一次（需要记住已出现的规范链接，内存随视频数增长）")
+    batch.add_argument("-q", "--quiet", action="store_true", help="不在标准错误输出统计信息")
+    batch.set_defaults(handler=run_batch)
+
+    serve = commands.add_parser("serve", help="启动本地 HTTP 解析服务（/resolve、/metrics 等）")
+    serve.add_argument("--host", default="127.0.0.1", help="监听地址，默认只接受本机连接")
+    serve.add_argument("--port", type=int, default=8765, help="监听端口，0 表示由系统分配")
+    serve.add_argument("--api", help="未指定 api 参数时使用的解析接口，默认为第一个接口")
+    serve.add_argument("--cache-size", type=int, default=65536, help="规范化结果 LRU 缓存的条目数")
+    serve.add_argument("-v", "--verbose", action="store_true", help="在标准错误输出每个请求")
+    serve.set_defaults(handler=run_serve)
+
+    episodes = commands.add_parser("episodes", help="从剧集页提取每一集的链接并转换为解析链接")
+    episodes.add_argument("url", nargs="?", help="剧集页链接（未指定 -i 时下载该页面）")
+    episodes.add_argument("--api", help="解析接口名称，默认为注册表中的第一个接口")
+    episodes.add_argument("-i", "--input", help="读取已保存的页面文件（- 表示标准输入），不再下载")
+    episodes.add_argument("--page-url", help="页面的原始链接（读取本地文件或经镜像下载时），用于补全相对链接和确定剧集")
+    episodes.add_argument("-f", "--format", choices=("jsonl", "csv"), default="jsonl", help="输出格式")
+    episodes.add_argument("--timeout", type=float, default=10.0, help="下载页面的超时时间（秒）")
+    episodes.add_argument("-q", "--quiet", action="store_true", help="不在标准错误输出统计信息")
+    episodes.set_defaults(handler=run_episodes)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
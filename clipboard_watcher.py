@@ -0,0 +1,136 @@
+"""剪贴板监听：在后台线程轮询剪贴板，复制了有效的视频链接就自动填入
+
+- 剪贴板支持变更序号时（Windows 的 GetClipboardSequenceNumber）先比较序号，没变就不读取内容；
+  否则读取内容后先比较长度和哈希，不保留上一次的全文
+- 剪贴板一直没变化时轮询间隔逐步放大到 max_interval，有变化后立即回到 min_interval
+- 剪贴板后端可以注入，便于用假对象测试和统计唤醒次数
+"""
+import sys
+import threading
+import time
+
+from url_capture import SystemClipboard
+
+
+def _windows_sequence_number():
+    """返回读取剪贴板变更序号的函数，非 Windows 平台返回 None"""
+    if sys.platform != "win32":
+        return None
+    try:
+        import ctypes
+        return ctypes.windll.user32.GetClipboardSequenceNumber
+    except (ImportError, AttributeError, OSError):
+        return None
+
+
+class WatchedClipboard(SystemClipboard):
+    """系统剪贴板，额外提供变更序号（不支持的平台 sequence_number 为 None）"""
+
+    def __init__(self):
+        self.sequence_number = _windows_sequence_number()
+
+
+class ClipboardWatcher:
+    def __init__(self, on_url, is_valid, clipboard=None, min_interval=0.25, max_interval=1.0,
+                 backoff=1.5, clock=time.monotonic):
+        self.on_url = on_url  # 在监听线程中调用，界面程序需要自己转交给 Tk 主线程
+        self.is_valid = is_valid
+        self.clipboard = clipboard or WatchedClipboard()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.clock = clock
+        self.interval = min_interval
+        self.wakeups = 0  # 线程被唤醒的次数
+        self.reads = 0  # 实际读取剪贴板内容的次数
+        self._started_at = None
+        self._stopped = False
+        self._wake = threading.Event()
+        self._thread = None
+        self._sequence = None
+        self._fingerprint = None
+        self._last_url = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """开始监听。启动时剪贴板里已有的内容不会被当作新复制的链接"""
+        if self.running:
+            return
+        self._stopped = False
+        self._wake.clear()
+        self.wakeups = self.reads = 0
+        self.interval = self.min_interval
+        self._started_at = self.clock()
+        self._sequence = self._read_sequence()
+        text = self._read_text()
+        self._fingerprint = self._fingerprint_of(text)
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poke(self):
+        """立即检查一次并回到最短间隔（如窗口重新获得焦点时）"""
+        self.interval = self.min_interval
+        self._wake.set()
+
+    def wakeups_per_second(self):
+        if self._started_at is None:
+            return 0.0
+        elapsed = self.clock() - self._started_at
+        return self.wakeups / elapsed if elapsed > 0 else 0.0
+
+    def _read_sequence(self):
+        sequence_number = getattr(self.clipboard, "sequence_number", None)
+        return sequence_number() if sequence_number else None
+
+    def _read_text(self):
+        self.reads += 1
+        try:
+            return self.clipboard.paste() or ""
+        except Exception:
+            # 剪贴板被其他程序占用等，下次再读
+            return None
+
+    @staticmethod
+    def _fingerprint_of(text):
+        if text is None:
+            return None
+        return len(text), hash(text)
+
+    def check(self):
+        """检查一次剪贴板，有变化返回 True；发现新的有效链接时调用 on_url"""
+        sequence = self._read_sequence()
+        if sequence is not None and sequence == self._sequence:
+            return False
+        self._sequence = sequence
+        text = self._read_text()
+        fingerprint = self._fingerprint_of(text)
+        if fingerprint is None or fingerprint == self._fingerprint:
+            return False
+        self._fingerprint = fingerprint
+        url = text.strip()
+        if url and url != self._last_url and self.is_valid(url):
+            self._last_url = url
+            self.on_url(url)
+        return True
+
+    def _loop(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopped:
+                return
+            self.wakeups += 1
+            if self.check():
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.interval * self.backoff, self.max_interval)
@@ -0,0 +1,137 @@
+"""输入框的撤销/重做历史
+
+每一步只记录改动的部分（位置、删除的文本、插入的文本），不保存整段文本的快照；
+撤销栈和重做栈都是定长的 deque，超出容量时自动丢弃最早的记录。
+连续输入的单个字符会合并为一步撤销。
+每次改动都按光标位置核对实际文本（只比较首尾两段），不成立时再查找公共前后缀。
+"""
+import time
+from collections import deque
+
+
+class EditDelta:
+    """一次编辑：在 pos 处把 deleted 替换为 inserted"""
+
+    __slots__ = ("pos", "deleted", "inserted", "cursor_before", "cursor_after", "time")
+
+    def __init__(self, pos, deleted, inserted, cursor_before, cursor_after, time):
+        self.pos = pos
+        self.deleted = deleted
+        self.inserted = inserted
+        self.cursor_before = cursor_before
+        self.cursor_after = cursor_after
+        self.time = time
+
+
+def common_prefix_len(a, b):
+    """两个字符串公共前缀的长度（二分查找，比较在 C 层完成）"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a.startswith(b[lo:mid], lo):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def common_suffix_len(a, b, limit):
+    """两个字符串公共后缀的长度，不超过 limit"""
+    len_a, len_b = len(a), len(b)
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a.endswith(b[len_b - mid:len_b - lo], 0, len_a - lo):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def is_insertion(short, long, pos):
+    """long 是否为在 short 的 pos 处插入一段文本得到的
+
+    在末尾或开头插入时直接用 long 的 startswith/endswith 比较，不复制文本；
+    插入在中间时只复制 short 的前后两段，与 long 的首尾比较。
+    """
+    if pos == len(short):
+        return long.startswith(short)
+    if pos == 0:
+        return long.endswith(short)
+    return long.startswith(short[:pos]) and long.endswith(short[pos:])
+
+
+class EditHistory:
+    def __init__(self, text="", cursor=0, capacity=50, merge_window=1.0, clock=time.monotonic):
+        self.text = text  # 当前文本（用于和下一次的文本比较出改动）
+        self.cursor = cursor
+        self.undo_stack = deque(maxlen=capacity)
+        self.redo_stack = deque(maxlen=capacity)
+        self.merge_window = merge_window  # 间隔超过该秒数的输入不再合并
+        self.clock = clock
+        self._typing = False  # 上一步是否为可以继续合并的连续输入
+
+    def record(self, text, cursor):
+        """记录文本的新状态，没有变化时返回 False"""
+        old = self.text
+        if text == old:
+            self.cursor = cursor
+            return False
+
+        # 绝大多数改动是在光标处输入或删除：按光标位置核对首尾两段（见 is_insertion），不成立再二分查找公共前后缀
+        grow = len(text) - len(old)
+        if grow > 0:
+            prefix, removed, added = cursor - grow, 0, grow
+            at_cursor = 0 <= prefix <= len(old) and is_insertion(old, text, prefix)
+        elif grow < 0:
+            prefix, removed, added = cursor, -grow, 0
+            at_cursor = 0 <= prefix <= len(text) and is_insertion(text, old, prefix)
+        else:
+            at_cursor = False
+        if not at_cursor:
+            prefix = common_prefix_len(old, text)
+            suffix = common_suffix_len(old, text, min(len(old), len(text)) - prefix)
+            removed, added = len(old) - suffix - prefix, len(text) - suffix - prefix
+        now = self.clock()
+
+        last = self.undo_stack[-1] if self._typing else None
+        if (last is not None and added == 1 and not removed and prefix == last.pos + len(last.inserted)
+                and now - last.time <= self.merge_window):
+            # 连续输入的下一个字符：并入同一步撤销
+            last.inserted += text[prefix]
+            last.cursor_after = cursor
+            last.time = now
+        else:
+            self.undo_stack.append(EditDelta(
+                prefix, old[prefix:prefix + removed], text[prefix:prefix + added], self.cursor, cursor, now,
+            ))
+            self._typing = added == 1 and not removed
+
+        self.redo_stack.clear()
+        self.text = text
+        self.cursor = cursor
+        return True
+
+    def undo(self):
+        """撤销一步，返回被撤销的 EditDelta（调用方据此还原输入框），没有可撤销的返回 None"""
+        if not self.undo_stack:
+            return None
+        delta = self.undo_stack.pop()
+        text = self.text
+        self.text = text[:delta.pos] + delta.deleted + text[delta.pos + len(delta.inserted):]
+        self.cursor = delta.cursor_before
+        self.redo_stack.append(delta)
+        self._typing = False
+        return delta
+
+    def redo(self):
+        """重做一步，返回重新应用的 EditDelta，没有可重做的返回 None"""
+        if not self.redo_stack:
+            return None
+        delta = self.redo_stack.pop()
+        text = self.text
+        self.text = text[:delta.pos] + delta.inserted + text[delta.pos + len(delta.deleted):]
+        self.cursor = delta.cursor_after
+        self.undo_stack.append(delta)
+        self._typing = False
+        return delta
@@ -0,0 +1,255 @@
+"""从剧集页（腾讯视频 cover 页、芒果TV 剧集页、哔哩哔哩多 P 视频等）中流式提取每一集的播放链接
+
+- 基于 html.parser.HTMLParser 增量解析，不建 DOM：页面按块 feed()，每块解析完就产出这一块中新发现的剧集，
+  内存占用与页面大小无关；HTMLParser 在 </script> 出现之前会把整段脚本留在缓冲区里，
+  所以 <script>/<style> 元素在交给 HTMLParser 之前就从文本流中分出来自己处理（见 feed），
+  很长的内嵌 JSON 也能边收边出结果，且不依赖 HTMLParser 的内部状态
+- 候选链接来自 <a> 等标签的 href/data-url 属性，以及 <script> 中内嵌的 JSON（含 https:\\/\\/ 转义写法）；
+  相对链接按页面地址（或 <base href>）补全，再经 url_canonical 规范化、按规范链接去重
+- 只保留与页面同一平台（可注册域名相同）的播放页；页面链接本身能确定剧集时（见 SERIES_RULES）只保留同一剧集的链接
+"""
+import codecs
+import re
+from collections import deque
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+from url_canonical import CANONICAL_RULES, video_key
+from url_matcher import registrable_domain
+
+CHUNK_SIZE = 64 * 1024
+MAX_URL_LENGTH = 2048  # 超过这个长度的链接不视为剧集链接，也是 <script> 中跨块保留的最大长度
+TAG_TAIL = 16  # 块末尾可能是半个 <script、<style、<!-- 或 </script 的最大长度
+URL_ATTRS = ("href", "data-href", "data-url", "data-link")
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
+
+# 视频 ID 中分隔剧集与单集的字符，以及单集 ID 是否必须带有这一部分
+# 腾讯视频 cid/vid、芒果TV 剧集/单集、哔哩哔哩 BV/p2、AcFun ac123_2、风行视频 g-1.v-2
+SERIES_RULES = {
+    "qq.com": ("/", True),
+    "mgtv.com": ("/", False),
+    "bilibili.com": ("/", False),
+    "acfun.cn": ("_", False),
+    "fun.tv": (".", True),
+}
+
+# 需要从文本流中分出来的元素的开始标签（属性值中可能有 >），以及注释的开头：注释中的 <script> 不是脚本
+_RAW_START_RE = re.compile(r"<!--|<(script|style)(?=[\s/>])(?:[^>\"']|\"[^\"]*\"|'[^']*')*>", re.IGNORECASE)
+_RAW_OPEN_RE = re.compile(r"<!--|<(?:script|style)(?=[\s/>])", re.IGNORECASE)
+_RAW_END_RE = {
+    "script": re.compile(r"</script[\s/>]", re.IGNORECASE),
+    "style": re.compile(r"</style[\s/>]", re.IGNORECASE),
+}
+
+# <script> 中的绝对链接或协议相对链接，允许 JSON 中的 \/ 转义
+_SCRIPT_URL_RE = re.compile(r"(?:https?:)?\\?/\\?/[A-Za-z0-9.-]+\.[A-Za-z]{2,}(?:\\?/[^\s\"'<>\\]*)*")
+# 链接中不会出现的字符：脚本中链接之后总会跟着其中之一（JSON 字符串的引号等）
+_URL_DELIMITERS = ("\"", "'", "<", ">", " ", "\n", "\t")
+
+
+def path_markers(domain):
+    """该平台播放页路径正则开头的固定文字（如 "x/cover/"），用于在拼接、规范化之前快速排除无关链接；
+    有的规则开头没有固定文字时返回 None，表示不做预筛"""
+    markers = []
+    for _, pattern, _, _ in CANONICAL_RULES.get(domain, ()):
+        literal = re.match(r"\^/((?:[^\\()\[\].?*+{|^$]|\\\W)*)", pattern)
+        prefix = literal.group(1).replace("\\", "") if literal else ""
+        if not prefix:
+            return None
+        markers.append(prefix)
+    return tuple(markers)
+
+
+def page_domain(page_url):
+    try:
+        host = urlsplit(page_url).hostname or ""
+    except ValueError:
+        return ""
+    return registrable_domain(host.rstrip("."))
+
+
+class EpisodeExtractor(HTMLParser):
+    def __init__(self, page_url):
+        super().__init__(convert_charrefs=True)
+        page_url = page_url.strip()
+        if "//" not in page_url:
+            # 允许省略协议，补全后相对链接才能正确拼接
+            page_url = "https://" + page_url
+        self.page_url = page_url
+        self.base_url = page_url
+        self.domain = page_domain(page_url)
+        self.markers = path_markers(self.domain)
+        self.series = None
+        rule = SERIES_RULES.get(self.domain)
+        key = video_key(page_url)
+        if rule and key:
+            self.series = key[1].split(rule[0])[0]
+        self.candidates = 0  # 检查过的候选链接数
+        self._seen = set()
+        self._found = deque()
+        self._pending = ""  # 还不能确定归属的文本：被切开的标签、注释或脚本结尾
+        self._raw = None  # 正在读取内容的 script/style 元素
+        self._script_tail = ""
+
+    # ------------------------------------------------------------------ 解析回调
+
+    def feed(self, data):
+        """<script>/<style> 元素（含标签）不交给 HTMLParser：脚本内容直接交给 _scan_script，样式丢弃；
+        其余文本（含注释）照常交给 HTMLParser。块末尾不完整的标签留到下一块"""
+        text = self._pending + data
+        pos = 0
+        while pos < len(text):
+            if self._raw is not None:
+                end = _RAW_END_RE[self._raw].search(text, pos)
+                if end is None:
+                    # 结束标签可能被切开，末尾留一小段
+                    cut = max(pos, len(text) - TAG_TAIL)
+                    if self._raw == "script":
+                        self._scan_script(text[pos:cut])
+                    pos = cut
+                    break
+                close = text.find(">", end.start())
+                if close < 0:
+                    if self._raw == "script":
+                        self._scan_script(text[pos:end.start()])
+                    pos = end.start()
+                    break
+                if self._raw == "script":
+                    self._scan_script(text[pos:end.start()], final=True)
+                self._raw = None
+                pos = close + 1
+                continue
+            start = _RAW_OPEN_RE.search(text, pos)
+            if start is None:
+                # 末尾可能是半个 <script 或 <!--
+                cut = text.rfind("<", max(pos, len(text) - TAG_TAIL))
+                cut = len(text) if cut < 0 or ">" in text[cut:] else cut
+                super().feed(text[pos:cut])
+                pos = cut
+                break
+            super().feed(text[pos:start.start()])
+            pos = start.start()
+            if start.group() == "<!--":
+                close = text.find("-->", pos + 4)
+                if close < 0:
+                    break
+                super().feed(text[pos:close + 3])
+                pos = close + 3
+                continue
+            tag = _RAW_START_RE.match(text, pos)
+            if tag is None:
+                # 开始标签还没收完整
+                break
+            self._raw = tag.group(1).lower()
+            self._script_tail = ""
+            pos = tag.end()
+        self._pending = text[pos:]
+
+    def close(self):
+        pending, self._pending = self._pending, ""
+        if self._raw == "script":
+            self._scan_script(pending, final=True)
+        elif self._raw is None:
+            super().feed(pending)
+        self._raw = None
+        super().close()
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "base":
+            href = dict(attrs).get("href")
+            if href:
+                self.base_url = urljoin(self.page_url, href)
+            return
+        for name, value in attrs:
+            if name in URL_ATTRS and value:
+                self._consider(value)
+
+    def _scan_script(self, data, final=False):
+        """<script> 的内容可能分多次交来：只处理到最后一个不可能出现在链接中的字符为止，
+        之后的部分（可能是没读完的链接）留到下一次"""
+        text = self._script_tail + data
+        end = len(text) if final else max(map(text.rfind, _URL_DELIMITERS)) + 1
+        for match in _SCRIPT_URL_RE.finditer(text, 0, end):
+            self._consider(match.group().replace("\\/", "/"))
+        self._script_tail = "" if final else text[end:][-MAX_URL_LENGTH:]
+
+    # ------------------------------------------------------------------ 筛选
+
+    def _consider(self, value):
+        value = value.strip()
+        if len(value) > MAX_URL_LENGTH or value.startswith(("#", "javascript:", "mailto:")):
+            return
+        if self.markers is not None and not any(marker in value for marker in self.markers):
+            return
+        if self.series is not None and self.series not in value:
+            # 剧集页中推荐的其他剧集
+            return
+        self.candidates += 1
+        key = video_key(urljoin(self.base_url, value))
+        if key is None:
+            return
+        domain, video_id, canonical = key
+        if domain != self.domain or canonical in self._seen:
+            return
+        if self.series is not None:
+            separator, require_child = SERIES_RULES[self.domain]
+            if video_id.split(separator)[0] != self.series or (require_child and separator not in video_id):
+                return
+        self._seen.add(canonical)
+        self._found.append(canonical)
+
+    # ------------------------------------------------------------------ 结果
+
+    def drain(self):
+        """取出上次调用以来新发现的剧集链接（按在页面中出现的顺序）"""
+        found = self._found
+        while found:
+            yield found.popleft()
+
+    @property
+    def count(self):
+        return len(self._seen)
+
+
+def iter_episodes(page_url, chunks):
+    """逐块解析文本块，边解析边产出规范化的剧集链接"""
+    extractor = EpisodeExtractor(page_url)
+    for chunk in chunks:
+        extractor.feed(chunk)
+        yield from extractor.drain()
+    extractor.close()
+    yield from extractor.drain()
+
+
+def read_chunks(stream, size=CHUNK_SIZE):
+    """按块读取文本文件对象"""
+    while True:
+        chunk = stream.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def decode_chunks(raw_chunks, encoding="utf-8"):
+    """按块解码字节流，多字节字符跨块时由增量解码器拼接"""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for raw in raw_chunks:
+        text = decoder.decode(raw)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def fetch_chunks(url, timeout=10.0, size=CHUNK_SIZE):
+    """下载页面并按块产出文本，不把整个页面读入内存"""
+    from urllib.request import Request, urlopen
+
+    with urlopen(Request(url, headers={"User-Agent": USER_AGENT}), timeout=timeout) as response:
+        encoding = response.headers.get_content_charset() or "utf-8"
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            encoding = "utf-8"
+        yield from decode_chunks(iter(lambda: response.read(size), b""), encoding)
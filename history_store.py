@@ -0,0 +1,203 @@
+"""解析历史记录（SQLite，WAL 模式）
+
+- 每个规范链接一行，重复解析只更新最近使用的接口、时间和次数
+- 写入交给后台线程批量提交，界面线程调用 record() 只是把记录放进队列
+- search() 支持前缀和子串查询：三个字符以上走 FTS5 trigram 索引，按 id 倒序取最近的匹配项
+"""
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from paths import data_dir
+
+logger = logging.getLogger("vip.history")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    canonical_url TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    platform TEXT,
+    api TEXT,
+    ts REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_history_ts ON history(ts);
+CREATE INDEX IF NOT EXISTS idx_history_platform_ts ON history(platform, ts);
+CREATE INDEX IF NOT EXISTS idx_history_api_ts ON history(api, ts);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    canonical_url, content='history', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts(rowid, canonical_url) VALUES (new.id, new.canonical_url);
+END;
+CREATE TRIGGER IF NOT EXISTS history_fts_delete AFTER DELETE ON history BEGIN
+    INSERT INTO history_fts(history_fts, rowid, canonical_url) VALUES ('delete', old.id, old.canonical_url);
+END;
+"""
+
+# 重复解析时删除旧行再插入新行（hits 累加），使 id 顺序始终等于最近使用顺序，
+# 这样“最近的匹配项”可以按 id 倒序边扫描边停止，不需要对全部匹配结果排序
+UPSERT = """
+INSERT OR REPLACE INTO history (canonical_url, url, platform, api, ts, hits)
+VALUES (?1, ?2, ?3, ?4, ?5, COALESCE((SELECT hits FROM history WHERE canonical_url = ?1), 0) + 1)
+"""
+
+# 不足三个字符的查询（trigram 索引用不上）只在最近的这么多条记录里筛选
+SHORT_QUERY_WINDOW = 2000
+
+
+def default_db_path():
+    return os.path.join(data_dir(), "history.sqlite3")
+
+
+class HistoryEntry:
+    def __init__(self, canonical_url, url, platform, api, ts, hits):
+        self.canonical_url = canonical_url
+        self.url = url
+        self.platform = platform
+        self.api = api
+        self.ts = ts
+        self.hits = hits
+
+    def __repr__(self):
+        return f"<HistoryEntry {self.canonical_url} {self.platform} {self.api} hits={self.hits}>"
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=5)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # INSERT OR REPLACE 删除旧行时也要触发 FTS 的删除触发器
+    conn.execute("PRAGMA recursive_triggers=ON")
+    return conn
+
+
+class HistoryStore:
+    def __init__(self, path=None, batch_size=500):
+        self.path = path or default_db_path()
+        self.batch_size = batch_size
+
+        conn = _connect(self.path)
+        with conn:
+            conn.executescript(SCHEMA)
+            had_fts = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'history_fts'").fetchone()
+            try:
+                conn.executescript(FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite 版本过旧（< 3.34）没有 trigram 分词器，退回 LIKE 扫描
+                self.has_fts = False
+            if self.has_fts and not had_fts and conn.execute("SELECT 1 FROM history LIMIT 1").fetchone():
+                # 旧版 SQLite 写下的记录没有进索引（升级 SQLite 后第一次打开），按 history 表重建
+                conn.execute("INSERT INTO history_fts(history_fts) VALUES ('rebuild')")
+        # 读连接归创建者线程（界面线程）使用，写连接归后台线程使用
+        self._reader = conn
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def record(self, canonical_url, url, platform=None, api=None, ts=None):
+        """记录一次解析，不等待写入磁盘"""
+        self._queue.put((canonical_url, url, platform, api, ts or time.time()))
+
+    def record_many(self, rows):
+        """批量记录 (规范链接, 原链接, 平台, 接口, 时间戳)"""
+        for row in rows:
+            self._queue.put(row)
+
+    def flush(self, timeout=None):
+        """等待队列中已有的记录全部写入"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        self.flush(timeout=5)
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        self._reader.close()
+
+    def _write_loop(self):
+        """后台写线程：取出队列中已有的全部记录（最多 batch_size 条）合并为一个事务提交"""
+        conn = _connect(self.path)
+        try:
+            while True:
+                item = self._queue.get()
+                batch, waiters = [], []
+                while True:
+                    if item is None:
+                        break
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                try:
+                    if batch:
+                        # 出错时 with 回滚这一批，写线程继续处理后面的记录
+                        with conn:
+                            conn.executemany(UPSERT, batch)
+                except sqlite3.Error as e:
+                    logger.warning("写入 %d 条历史记录失败，已丢弃: %s", len(batch), e)
+                finally:
+                    for waiter in waiters:
+                        waiter.set()
+                if item is None:
+                    return
+        finally:
+            conn.close()
+
+    def recent(self, limit=10, platform=None):
+        """最近解析过的链接，可按平台筛选"""
+        if platform:
+            rows = self._reader.execute(
+                "SELECT canonical_url, url, platform, api, ts, hits FROM history "
+                "WHERE platform = ? ORDER BY id DESC LIMIT ?", (platform, limit),
+            )
+        else:
+            rows = self._reader.execute(
+                "SELECT canonical_url, url, platform, api, ts, hits FROM history "
+                "ORDER BY id DESC LIMIT ?", (limit,),
+            )
+        return [HistoryEntry(*row) for row in rows]
+
+    def search(self, text, limit=10):
+        """按前缀或子串查找历史链接，最近使用的排在前面
+
+        不足三个字符的查询用不上 trigram 索引，只在最近 SHORT_QUERY_WINDOW 条记录里筛选。
+        """
+        text = text.strip()
+        if not text:
+            return self.recent(limit)
+        if len(text) >= 3 and self.has_fts:
+            rows = self._reader.execute(
+                "SELECT h.canonical_url, h.url, h.platform, h.api, h.ts, h.hits "
+                "FROM history_fts JOIN history h ON h.id = history_fts.rowid "
+                "WHERE history_fts MATCH ? ORDER BY history_fts.rowid DESC LIMIT ?",
+                ('"' + text.replace('"', '""') + '"', limit),
+            )
+        elif len(text) >= 3:
+            rows = self._reader.execute(
+                "SELECT canonical_url, url, platform, api, ts, hits FROM history "
+                "WHERE instr(canonical_url, ?) > 0 ORDER BY id DESC LIMIT ?", (text, limit),
+            )
+        else:
+            rows = self._reader.execute(
+                "SELECT canonical_url, url, platform, api, ts, hits FROM "
+                "(SELECT * FROM history ORDER BY id DESC LIMIT ?) "
+                "WHERE instr(canonical_url, ?) > 0 LIMIT ?",
+                (SHORT_QUERY_WINDOW, text, limit),
+            )
+        return [HistoryEntry(*row) for row in rows]
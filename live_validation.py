@@ -0,0 +1,115 @@
+"""输入框的即时校验：停止输入后判断链接是否有效、属于哪个平台
+
+- Debouncer：每次按键只记录时间，输入暂停 delay 秒后才回调一次；任意时刻最多一个待执行的 after 回调
+- LiveValidator：校验结果按整段文本缓存（撤销、退格回到之前的内容时直接命中）；
+  scheme://host 部分不变时复用对域名的判断，不支持的域名不跑任何正则；注册表更新后用 set_matcher() 换用新的匹配器
+"""
+import time
+from collections import OrderedDict
+
+from url_canonical import canonicalize
+from url_matcher import registrable_domain, split_authority
+
+
+class UrlCheck:
+    __slots__ = ("text", "platform", "canonical")
+
+    def __init__(self, text, platform=None, canonical=None):
+        self.text = text
+        self.platform = platform  # 所属平台，无效链接为 None
+        self.canonical = canonical  # 规范链接，无法规范化时为 None
+
+    @property
+    def valid(self):
+        return self.platform is not None
+
+    @property
+    def state(self):
+        """"empty"、"valid" 或 "invalid" """
+        if not self.text:
+            return "empty"
+        return "valid" if self.platform is not None else "invalid"
+
+
+class LiveValidator:
+    def __init__(self, matcher, cache_size=256):
+        self.matcher = matcher
+        self.cache_size = cache_size
+        self._results = OrderedDict()  # 文本 -> UrlCheck（LRU）
+        self._prefixes = {}  # scheme://host 部分 -> 域名是否受支持
+        self.full_checks = 0  # 实际做了规范化和正则匹配的次数
+        self.prefix_skips = 0  # 因域名不受支持直接判为无效的次数
+
+    def set_matcher(self, matcher):
+        """换用新的匹配器，之前缓存的结果全部作废"""
+        self.matcher = matcher
+        self._results.clear()
+        self._prefixes.clear()
+
+    def check(self, text):
+        text = text.strip()
+        result = self._results.get(text)
+        if result is not None:
+            self._results.move_to_end(text)
+            return result
+        result = self._check(text)
+        self._results[text] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return result
+
+    def _check(self, text):
+        if not text:
+            return UrlCheck(text)
+        prefix, host = split_authority(text)
+        supported = self._prefixes.get(prefix)
+        if supported is None:
+            if len(self._prefixes) >= self.cache_size:
+                self._prefixes.clear()
+            supported = self._prefixes[prefix] = registrable_domain(host) in self.matcher.domains
+        if not supported:
+            self.prefix_skips += 1
+            return UrlCheck(text)
+        self.full_checks += 1
+        canonical = canonicalize(text)
+        return UrlCheck(text, self.matcher.match(canonical or text), canonical)
+
+
+class Debouncer:
+    """输入暂停 delay 秒后调用 callback
+
+    poke() 只更新最后一次输入的时间，已有待执行的回调时不重新注册；回调触发时若期间又有输入，
+    就按剩余时间再等一次。这样每次按键的开销是常数，且不需要 after_cancel。
+    """
+
+    def __init__(self, widget, delay, callback, clock=time.monotonic):
+        self.widget = widget
+        self.delay = delay
+        self.callback = callback
+        self.clock = clock
+        self.fired = 0
+        self._last = 0.0
+        self._after_id = None
+
+    @property
+    def pending(self):
+        return self._after_id is not None
+
+    def poke(self):
+        self._last = self.clock()
+        if self._after_id is None:
+            self._after_id = self.widget.after(int(self.delay * 1000), self._expire)
+
+    def _expire(self):
+        remaining = self._last + self.delay - self.clock()
+        if remaining > 0.001:
+            self._after_id = self.widget.after(int(remaining * 1000) + 1, self._expire)
+            return
+        self._after_id = None
+        self.fired += 1
+        self.callback()
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
@@ -0,0 +1,146 @@
+"""提示框：整个程序只建一个对话框，之后每次只替换文字
+
+- 提示框还开着时再次出现相同的提示只累加次数，不再弹出新窗口
+- 提示框开着时连续出现不同的提示则限速：只保留最新的一条，间隔到了再替换文字
+- 窗口大小固定，居中位置直接按屏幕尺寸计算，不需要先 update() 做一次同步布局
+"""
+import time
+
+import customtkinter as ctk
+import tkinter as tk
+
+
+class NotificationGate:
+    """决定一条提示是立即显示、合并到当前提示，还是推迟显示（与 Tk 无关，便于测试）"""
+
+    def __init__(self, min_interval=0.5, clock=time.monotonic):
+        self.min_interval = min_interval  # 两条不同提示之间的最短间隔（秒）
+        self.clock = clock
+        self.current = None
+        self.repeats = 0
+        self.pending = None
+        self._last_shown = None
+
+    def offer(self, message, visible):
+        """返回 ("show", 0)、("coalesce", 0) 或 ("defer", 还需等待的秒数)"""
+        if visible and message == self.current:
+            # 最新的提示又回到了正在显示的这条，等待中的提示作废
+            self.pending = None
+            self.repeats += 1
+            return "coalesce", 0
+        now = self.clock()
+        # 提示框已被关闭时直接显示；开着时文字的更换不快于 min_interval
+        if visible and self._last_shown is not None and now - self._last_shown < self.min_interval:
+            self.pending = message
+            return "defer", self.min_interval - (now - self._last_shown)
+        self.accept(message, now)
+        return "show", 0
+
+    def accept(self, message, now=None):
+        self.current = message
+        self.repeats = 1
+        self.pending = None
+        self._last_shown = self.clock() if now is None else now
+
+    def take_pending(self):
+        message = self.pending
+        if message is not None:
+            self.accept(message)
+        return message
+
+
+class NotificationDialog:
+    def __init__(self, root, icon=None, width=400, height=250, min_interval=0.5, clock=time.monotonic):
+        self.root = root
+        self.icon = icon
+        self.width = width
+        self.height = height
+        self.gate = NotificationGate(min_interval, clock)
+        self.window = None
+        self.label = None
+        self.visible = False
+        self.shown = 0  # 实际显示（或更新文字）的次数
+        self._flush_id = None
+
+    def build(self):
+        """预先创建对话框并隐藏，之后每次提示只替换文字"""
+        if self.window is not None:
+            return
+        window = ctk.CTkToplevel(self.root)
+        window.withdraw()
+        window.title("提示")
+        window.resizable(False, False)
+        window.attributes("-topmost", True)
+        window.transient(self.root)
+        window.configure(fg_color="#ffffff")
+        window.protocol("WM_DELETE_WINDOW", self.hide)
+        if self.icon:
+            try:
+                window.iconbitmap(self.icon)
+            except tk.TclError:
+                pass
+        text_frame = ctk.CTkFrame(window, fg_color="#ffffff")
+        text_frame.pack(expand=True, fill="both", padx=20, pady=(20, 10))
+        self.label = ctk.CTkLabel(
+            text_frame,
+            text="",
+            font=("微软雅黑", 14),
+            text_color="#000000",
+            wraplength=self.width - 40,
+            justify="center",
+        )
+        self.label.pack(expand=True)
+        button_frame = ctk.CTkFrame(window, fg_color="#ffffff")
+        button_frame.pack(fill="x", padx=20, pady=(0, 20))
+        btn = ctk.CTkButton(
+            button_frame,
+            text="确定",
+            command=self.hide,
+            width=100,
+            height=40,
+            fg_color="#e0e0e0",
+            hover_color="#c0c0c0",
+            text_color="#000000",
+            corner_radius=8,
+        )
+        btn.pack(pady=10)
+        window.bind("<Return>", lambda event: self.hide())
+        window.bind("<Escape>", lambda event: self.hide())
+        self.window = window
+
+    def show(self, message):
+        action, delay = self.gate.offer(message, self.visible)
+        if action == "show":
+            self._display(message)
+        elif action == "coalesce":
+            self._display(f"{message}\n\n（已出现 {self.gate.repeats} 次）")
+        elif self._flush_id is None:
+            self._flush_id = self.root.after(int(delay * 1000) + 1, self._flush)
+
+    def _flush(self):
+        self._flush_id = None
+        message = self.gate.take_pending()
+        if message is not None:
+            self._display(message)
+
+    def _display(self, text):
+        self.build()
+        self.label.configure(text=text)
+        self.shown += 1
+        if not self.visible:
+            x = (self.window.winfo_screenwidth() - self.width) // 2
+            y = (self.window.winfo_screenheight() - self.height) // 2
+            self.window.geometry(f"{self.width}x{self.height}+{x}+{y}")
+            self.window.deiconify()
+            self.visible = True
+        self.window.lift()
+        self.window.focus_set()
+
+    def hide(self):
+        if self._flush_id is not None:
+            self.root.after_cancel(self._flush_id)
+            self._flush_id = None
+        self.gate.pending = None
+        if self.window is not None:
+            self.window.withdraw()
+        self.visible = False
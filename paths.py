@@ -0,0 +1,34 @@
+import os
+import sys
+
+APP_NAME = "vip-video-analysis"
+
+
+def resource_path(resource_path):
+    try:
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path,resource_path)
+
+
+def _user_dir(windows_env, mac_dir, xdg_env, xdg_default):
+    if sys.platform == "win32":
+        base = os.environ.get(windows_env) or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser(mac_dir)
+    else:
+        base = os.environ.get(xdg_env) or os.path.expanduser(xdg_default)
+    path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_dir():
+    """可写的用户缓存目录（打包后 _MEIPASS 为只读临时目录，不能写在那里），内容可随时删除"""
+    return _user_dir("LOCALAPPDATA", "~/Library/Caches", "XDG_CACHE_HOME", "~/.cache")
+
+
+def data_dir():
+    """可写的用户数据目录，保存历史记录等需要长期保留的数据"""
+    return _user_dir("APPDATA", "~/Library/Application Support", "XDG_DATA_HOME", "~/.local/share")
@@ -0,0 +1,248 @@
+"""平台与解析接口注册表：平台首页、视频链接正则和解析接口都写在一个 JSON 文件（registry.json）里
+
+- 加载时一次性校验并编译成 Registry 快照（只读映射 + 预编译正则的匹配器），之后不再修改，
+  任何线程拿到引用后都可以不加锁地查询；重新加载时正则没变的条目沿用上一个快照中编译好的对象
+- RegistryWatcher 在后台线程按文件的 inode、修改时间和大小轮询，变化后在后台编译新快照，再整体替换引用；
+  新文件有错误时保留旧快照，文件再次变化后才重试
+- 文件查找顺序：环境变量 VIP_REGISTRY，用户数据目录下的 registry.json，程序自带的 registry.json。
+  打包后修改用户数据目录下的文件即可增删接口，不用重新打包、重启
+
+文件格式:
+    {"platforms": [{"name": "腾讯视频", "home": "https://v.qq.com/", "domain": "qq.com", "pattern": "..."}, ...],
+     "apis": [{"name": "③M1907", "prefix": "https://im1907.top/?jx="}, {"name": ..., "enabled": false}, ...]}
+没有 domain/pattern 的平台只出现在平台下拉框中；enabled 为 false 的接口不加载。
+"""
+import json
+import logging
+import os
+import re
+import sys
+import threading
+from types import MappingProxyType
+
+from paths import data_dir
+from url_matcher import VideoUrlMatcher
+
+logger = logging.getLogger("vip.registry")
+
+REGISTRY_NAME = "registry.json"
+POLL_INTERVAL = 2.0  # 轮询文件的间隔（秒）
+
+
+class Registry:
+    """编译后的注册表快照，创建后不再修改"""
+
+    __slots__ = ("platform_urls", "parse_apis", "patterns", "platform_by_domain", "matcher", "source", "version",
+                 "_regexes")
+
+    def __init__(self, platform_urls, parse_apis, patterns, source=None, version=None, regexes=None):
+        self.platform_urls = MappingProxyType(dict(platform_urls))  # 平台名 -> 首页
+        self.parse_apis = MappingProxyType(dict(parse_apis))  # 接口名 -> 链接前缀
+        self.patterns = tuple(patterns)  # (平台名, 可注册域名, 链接正则)
+        self.platform_by_domain = MappingProxyType({domain: name for name, domain, _ in self.patterns})
+        # 正则文本 -> 编译好的正则，供下一次加载复用
+        self._regexes = regexes if regexes is not None else {p: re.compile(p) for _, _, p in self.patterns}
+        self.matcher = VideoUrlMatcher((name, domain, self._regexes[p]) for name, domain, p in self.patterns)
+        self.source = source  # 来源文件
+        self.version = version  # 来源文件的 (路径, inode, 修改时间, 大小)
+
+    @property
+    def platforms(self):
+        """能识别视频链接的平台名"""
+        return [platform for platform, _, _ in self.patterns]
+
+    def __repr__(self):
+        return (f"Registry({len(self.platform_urls)} 个平台, {len(self.patterns)} 条链接规则, "
+                f"{len(self.parse_apis)} 个接口, source={self.source!r})")
+
+
+def _entries(data, key):
+    entries = data.get(key)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{key} 应为非空列表")
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{key}[{i}] 应为对象")
+        yield i, entry
+
+
+def _text(entry, key, where, required=True):
+    value = entry.get(key)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"{where}.{key} 应为非空字符串")
+    return value
+
+
+def compile_registry(data, source=None, version=None, previous=None):
+    """校验注册表内容并编译成 Registry，内容有误时抛出 ValueError（说明是哪一项）
+
+    previous 为上一个快照时，正则文本没变的条目直接沿用其中编译好的正则（编译占加载的绝大部分时间）。
+    """
+    if not isinstance(data, dict):
+        raise ValueError("注册表应为 JSON 对象")
+    reuse = previous._regexes if previous is not None else {}
+    platform_urls, patterns, domains, regexes = {}, [], set(), {}
+    for i, entry in _entries(data, "platforms"):
+        where = f"platforms[{i}]"
+        name = _text(entry, "name", where)
+        if name in platform_urls:
+            raise ValueError(f"{where}: 平台 {name} 重复")
+        platform_urls[name] = _text(entry, "home", where)
+        domain = _text(entry, "domain", where, required=False)
+        pattern = _text(entry, "pattern", where, required=False)
+        if (domain is None) != (pattern is None):
+            raise ValueError(f"{where}: domain 和 pattern 需要同时给出")
+        if domain is None:
+            continue
+        domain = domain.lower()
+        if domain in domains:
+            # 匹配器按可注册域名建索引，一个域名只能属于一个平台
+            raise ValueError(f"{where}: 域名 {domain} 重复")
+        if pattern not in regexes:
+            compiled = reuse.get(pattern)
+            if compiled is None:
+                try:
+                    compiled = re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"{where}.pattern 不是有效的正则: {e}") from None
+            regexes[pattern] = compiled
+        domains.add(domain)
+        patterns.append((name, domain, pattern))
+
+    parse_apis = {}
+    for i, entry in _entries(data, "apis"):
+        where = f"apis[{i}]"
+        name = _text(entry, "name", where)
+        prefix = _text(entry, "prefix", where)
+        if entry.get("enabled", True) is False:
+            continue
+        if name in parse_apis:
+            raise ValueError(f"{where}: 接口 {name} 重复")
+        parse_apis[name] = prefix
+    if not parse_apis:
+        raise ValueError("没有启用的解析接口")
+    return Registry(platform_urls, parse_apis, patterns, source, version, regexes)
+
+
+def file_version(path, stat):
+    return (path, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def load_registry(path, previous=None):
+    """读取并编译注册表文件；版本取自读取时打开的同一个文件"""
+    with open(path, "rb") as f:
+        version = file_version(path, os.fstat(f.fileno()))
+        raw = f.read()
+    try:
+        data = json.loads(raw.decode("utf-8-sig"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"{path} 不是有效的 JSON: {e}") from None
+    return compile_registry(data, path, version, previous)
+
+
+def bundled_path():
+    """程序自带的注册表（打包后在 _MEIPASS 中）"""
+    base = getattr(sys, "_MEIPASS", None) or os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base, REGISTRY_NAME)
+
+
+def registry_path(environ=os.environ):
+    """当前应使用的注册表文件"""
+    path = environ.get("VIP_REGISTRY")
+    if path:
+        return path
+    try:
+        user_path = os.path.join(data_dir(), REGISTRY_NAME)
+    except OSError:
+        user_path = None
+    if user_path and os.path.exists(user_path):
+        return user_path
+    return bundled_path()
+
+
+def load_active(locate=registry_path):
+    """加载当前注册表；指定的文件无法使用时退回程序自带的注册表"""
+    path = locate()
+    try:
+        return load_registry(path)
+    except (OSError, ValueError) as e:
+        if os.path.abspath(path) == os.path.abspath(bundled_path()):
+            raise
+        logger.warning("注册表 %s 无法使用，改用自带的注册表: %s", path, e)
+        return load_registry(bundled_path())
+
+
+class RegistryWatcher:
+    """轮询注册表文件，变化后整体替换 current
+
+    读取方只需 watcher.current（一次属性读取），不加锁；_lock 只让并发的 poll() 不重复加载。
+    """
+
+    def __init__(self, registry=None, locate=registry_path, on_change=None, on_error=None,
+                 interval=POLL_INTERVAL):
+        self.current = registry if registry is not None else load_active(locate)
+        self.locate = locate
+        self.on_change = on_change  # 替换后在轮询线程中调用 on_change(新快照, 旧快照)
+        self.on_error = on_error  # 新文件有错误时在轮询线程中调用 on_error(路径, 异常)
+        self.interval = interval
+        self.polls = 0
+        self.reloads = 0
+        self.failures = 0
+        self._seen = self.current.version
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def poll(self):
+        """检查一次文件，有变化时重新加载并替换；返回是否替换了快照"""
+        with self._lock:
+            self.polls += 1
+            path = self.locate()
+            try:
+                version = file_version(path, os.stat(path))
+            except OSError:
+                return False
+            if version == self._seen:
+                return False
+            self._seen = version
+            try:
+                registry = load_registry(path, self.current)
+            except (OSError, ValueError) as e:
+                self.failures += 1
+                logger.warning("注册表 %s 有错误，继续使用原来的: %s", path, e)
+                if self.on_error:
+                    self.on_error(path, e)
+                return False
+            self._seen = registry.version
+            old, self.current = self.current, registry
+            self.reloads += 1
+        logger.info("已重新加载注册表 %s", path)
+        if self.on_change:
+            self.on_change(registry, old)
+        return True
+
+    def start(self):
+        if self.running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="registry-watcher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("轮询注册表失败")
+
+    def stop(self):
+        self._stopped.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(1.0)
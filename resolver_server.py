@@ -0,0 +1,282 @@
+"""本地解析服务：通过 HTTP 提供链接校验和解析链接生成，供其他内部工具调用（python vip.py serve）
+
+接口（均返回 JSON）：
+    GET  /resolve?url=<视频链接>[&api=<接口名>]   单个链接
+    POST /resolve[?api=<接口名>]                  批量，正文为 {"urls": [...], "api": ...} 或每行一个链接的纯文本
+    GET  /apis                                    可用的解析接口和支持的平台
+    GET  /metrics                                 请求数、状态码、延迟 p50/p95/p99、缓存命中率
+    GET  /healthz
+
+使用 HTTP/1.1 长连接；同一链接的规范化结果保存在进程内的 LRU 缓存里。只依赖标准库。
+注册表（registry.json）修改后自动换用新的平台和接口，不用重启服务；每个请求只取一次快照，前后一致。
+"""
+import json
+import sys
+import threading
+import time
+from collections import Counter, deque
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from registry import RegistryWatcher
+from sources import REGISTRY
+from url_canonical import build_parse_url, canonicalize
+
+MAX_BODY = 1 << 20  # 批量请求正文上限
+MAX_BATCH = 10_000  # 批量请求的链接数上限
+
+
+class LatencyStats:
+    """按接口统计请求数和最近 window 次请求的延迟"""
+
+    def __init__(self, window=10_000):
+        self.started = time.time()
+        self.requests = Counter()
+        self.statuses = Counter()
+        self._latencies = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, status, seconds):
+        with self._lock:
+            self.requests[endpoint] += 1
+            self.statuses[status] += 1
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = deque(maxlen=self._window)
+            latencies.append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            latencies = {endpoint: sorted(values) for endpoint, values in self._latencies.items()}
+            requests, statuses = dict(self.requests), dict(self.statuses)
+
+        def pick(values, q):
+            return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 3)
+
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": requests,
+            "statuses": {str(status): count for status, count in statuses.items()},
+            "latency_ms": {
+                endpoint: {"p50": pick(values, 0.5), "p95": pick(values, 0.95), "p99": pick(values, 0.99),
+                           "window": len(values)}
+                for endpoint, values in latencies.items() if values
+            },
+        }
+
+
+class Resolver:
+    """链接 -> (平台, 规范链接)，结果带 LRU 缓存
+
+    缓存键包含注册表快照，注册表替换后旧结果不会再被命中（同时清空缓存释放内存）。
+    """
+
+    def __init__(self, default_api=None, cache_size=65536, watcher=None):
+        self.watcher = watcher or RegistryWatcher(REGISTRY)
+        self.watcher.on_change = self._registry_changed
+        self._default_api = default_api
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    @property
+    def registry(self):
+        return self.watcher.current
+
+    def default_api_of(self, registry):
+        """启动时指定的默认接口，它已从注册表中删除时用第一个接口"""
+        apis = registry.parse_apis
+        return self._default_api if self._default_api in apis else next(iter(apis))
+
+    @property
+    def default_api(self):
+        return self.default_api_of(self.registry)
+
+    def _registry_changed(self, registry, old):
+        self.lookup.cache_clear()
+
+    @staticmethod
+    def _lookup(url, registry):
+        canonical = canonicalize(url) or url.strip()
+        platform = registry.matcher.match(canonical)
+        if platform is None:
+            return None, None
+        return platform, canonical
+
+    def resolve(self, url, api, registry=None):
+        registry = registry or self.registry
+        platform, canonical = self.lookup(url, registry)
+        return {
+            "url": url,
+            "valid": platform is not None,
+            "platform": platform,
+            "canonical_url": canonical,
+            "api": api,
+            "parse_url": build_parse_url(registry.parse_apis[api], canonical) if platform else None,
+        }
+
+    def cache_stats(self):
+        info = self.lookup.cache_info()
+        total = info.hits + info.misses
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize,
+                "hit_rate": round(info.hits / total, 4) if total else None}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ResolverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 默认长连接
+    disable_nagle_algorithm = True  # 响应头和正文分两次写出时避免 Nagle 算法带来的延迟
+    server_version = "vip-resolver"
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method):
+        start = time.perf_counter()
+        parts = urlsplit(self.path)
+        endpoint = parts.path
+        self.body_consumed = False
+        try:
+            route = self.server.routes.get((method, endpoint))
+            if route is None:
+                known = any(path == endpoint for _, path in self.server.routes)
+                endpoint = "其他"
+                raise HttpError(405 if known else 404, f"不支持 {method} {parts.path}")
+            status, payload = 200, route(self, parse_qs(parts.query))
+        except HttpError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            self.log_error("处理 %s %s 出错: %r", method, parts.path, e)
+            status, payload = 500, {"error": "服务内部错误"}
+        if not self.body_consumed and (self.headers.get("Transfer-Encoding")
+                                       or self.headers.get("Content-Length", "0").strip() != "0"):
+            # 没有读取的正文会被当作下一个请求解析，不能继续复用这个连接
+            self.close_connection = True
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.stats.record(endpoint, status, time.perf_counter() - start)
+
+    def _api(self, query, registry, body=None):
+        api = ((query.get("api") or [None])[0] or (body or {}).get("api")
+               or self.server.resolver.default_api_of(registry))
+        if api not in registry.parse_apis:
+            raise HttpError(400, f"未知的解析接口: {api}")
+        return api
+
+    def resolve_one(self, query):
+        url = (query.get("url") or [""])[0].strip()
+        if not url:
+            raise HttpError(400, "缺少 url 参数")
+        registry = self.server.resolver.registry
+        return self.server.resolver.resolve(url, self._api(query, registry), registry)
+
+    def read_body(self):
+        """按 Content-Length 读取正文；长度缺失、不是非负整数或超过上限时报错（响应后关闭连接，见 _handle）"""
+        if self.headers.get("Transfer-Encoding"):
+            raise HttpError(400, "不支持分块传输，请给出 Content-Length")
+        value = (self.headers.get("Content-Length") or "").strip()
+        if not (value.isascii() and value.isdigit()):
+            raise HttpError(400, "缺少 Content-Length 或不是非负整数")
+        length = int(value)
+        if length > MAX_BODY:
+            raise HttpError(413, f"正文超过 {MAX_BODY} 字节")
+        raw = self.rfile.read(length)
+        self.body_consumed = True
+        if len(raw) < length:
+            self.close_connection = True
+            raise HttpError(400, "正文不完整")
+        return raw
+
+    def resolve_batch(self, query):
+        raw = self.read_body().decode("utf-8", errors="replace")
+        body = None
+        if "json" in (self.headers.get("Content-Type") or ""):
+            try:
+                body = json.loads(raw or "{}")
+                urls = body["urls"]
+            except (ValueError, KeyError, TypeError):
+                raise HttpError(400, '正文应为 {"urls": [...]}')
+            if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+                raise HttpError(400, "urls 应为字符串列表")
+        else:
+            urls = raw.splitlines()
+        urls = [url.strip() for url in urls if url.strip()]
+        if len(urls) > MAX_BATCH:
+            raise HttpError(413, f"一次最多 {MAX_BATCH} 个链接")
+        registry = self.server.resolver.registry
+        api = self._api(query, registry, body)
+        resolve = self.server.resolver.resolve
+        results = [resolve(url, api, registry) for url in urls]
+        return {"api": api, "count": len(results), "valid": sum(r["valid"] for r in results), "results": results}
+
+    def list_apis(self, query):
+        registry = self.server.resolver.registry
+        return {
+            "default": self.server.resolver.default_api_of(registry),
+            "apis": list(registry.parse_apis),
+            "platforms": registry.platforms,
+        }
+
+    def metrics(self, query):
+        watcher = self.server.resolver.watcher
+        return dict(self.server.stats.snapshot(), cache=self.server.resolver.cache_stats(),
+                    registry={"source": watcher.current.source, "reloads": watcher.reloads,
+                              "failures": watcher.failures})
+
+    def healthz(self, query):
+        return {"ok": True}
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ResolverServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, resolver=None, verbose=False):
+        super().__init__(address, ResolverHandler)
+        self.resolver = resolver or Resolver()
+        self.stats = LatencyStats()
+        self.verbose = verbose
+        self.routes = {
+            ("GET", "/resolve"): ResolverHandler.resolve_one,
+            ("POST", "/resolve"): ResolverHandler.resolve_batch,
+            ("GET", "/apis"): ResolverHandler.list_apis,
+            ("GET", "/metrics"): ResolverHandler.metrics,
+            ("GET", "/healthz"): ResolverHandler.healthz,
+        }
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def serve(host="127.0.0.1", port=8765, api=None, cache_size=65536, verbose=False):
+    resolver = Resolver(api, cache_size)
+    server = ResolverServer((host, port), resolver, verbose)
+    # 第一行输出监听地址（端口为 0 时由系统分配），便于脚本读取
+    print(f"listening on {server.url}", file=sys.stderr, flush=True)
+    resolver.watcher.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        resolver.watcher.stop()
+        server.server_close()
+    return 0
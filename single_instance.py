@@ -0,0 +1,237 @@
+"""单实例运行：后启动的进程把命令行参数交给已经在运行的窗口，自己立即退出
+
+- Linux/macOS 使用用户私有的 Unix 域套接字（在 XDG_RUNTIME_DIR 中；没有时在临时目录下的私有子目录中）
+- Windows 使用 127.0.0.1 上的 TCP 端口，端口号和随机口令写在用户数据目录的 instance.json 中
+- 只依赖标准库，vip.py 在导入 customtkinter/PIL 之前调用 hand_off()，交接只需几毫秒
+协议：客户端发送一行 JSON 消息，服务端回复 ok 后关闭连接。
+"""
+import json
+import logging
+import os
+import socket
+import stat
+import sys
+import threading
+
+from paths import APP_NAME, data_dir
+
+logger = logging.getLogger("vip.instance")
+
+USE_UNIX_SOCKET = hasattr(socket, "AF_UNIX") and sys.platform != "win32"
+TIMEOUT = 2.0
+MAX_MESSAGE = 64 * 1024
+
+
+def socket_path():
+    """套接字文件路径；临时目录下的私有目录被他人占用时抛出 OSError"""
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if not base:
+        import tempfile
+        # 临时目录所有用户都能写，套接字放在只属于当前用户的子目录中，别人无法抢先创建或替换
+        base = _private_dir(os.path.join(tempfile.gettempdir(), f"{APP_NAME}-{uid}"), uid)
+    return os.path.join(base, f"{APP_NAME}-{uid}.sock")
+
+
+def _private_dir(path, uid):
+    """创建（或检查已有的）权限为 0700、属于当前用户的目录"""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != uid or info.st_mode & 0o077:
+        raise OSError(f"{path} 不是当前用户私有的目录")
+    return path
+
+
+def port_file():
+    return os.path.join(data_dir(), "instance.json")
+
+
+def parse_launch_args(argv):
+    """从命令行参数中取出视频链接；--parse 表示填入后立即解析。没有链接时消息只是让窗口前置"""
+    message = {"url": None, "parse": "--parse" in argv}
+    for arg in argv:
+        if not arg.startswith("-"):
+            message["url"] = arg
+            break
+    return message
+
+
+def _read_line(conn):
+    data = b""
+    while not data.endswith(b"\n") and len(data) < MAX_MESSAGE:
+        chunk = conn.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def _connect():
+    """连接正在运行的实例，没有时返回 (None, None)"""
+    if USE_UNIX_SOCKET:
+        try:
+            address, token = socket_path(), None
+        except OSError:
+            return None, None
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        try:
+            with open(port_file(), encoding="utf-8") as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+        conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address, token = ("127.0.0.1", info["port"]), info["token"]
+    conn.settimeout(TIMEOUT)
+    try:
+        conn.connect(address)
+    except OSError:
+        conn.close()
+        return None, None
+    return conn, token
+
+
+def send(message):
+    """把消息交给正在运行的实例，对方确认收到时返回 True"""
+    conn, token = _connect()
+    if conn is None:
+        return False
+    with conn:
+        try:
+            payload = dict(message, token=token) if token else message
+            conn.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+            return _read_line(conn).strip() == b"ok"
+        except OSError:
+            return False
+
+
+def hand_off(argv):
+    """已有实例在运行时把参数交给它并返回 True，调用方随即退出"""
+    return send(parse_launch_args(argv))
+
+
+class InstanceServer:
+    """在后台线程接收后启动进程发来的消息
+
+    listen() 之后立即开始确认收到的消息；set_handler() 之前收到的消息先暂存，设置处理函数时再依次交出，
+    这样窗口还在启动时发来的链接也不会丢失。处理函数在服务线程中调用。
+    """
+
+    def __init__(self):
+        self.sock = None
+        self.path = None  # 套接字文件或端口文件，关闭时删除
+        self.token = None
+        self._handler = None
+        self._pending = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def listen(cls):
+        """成为第一个实例并开始监听；已有实例在运行（或地址被占用）时返回 None"""
+        server = cls()
+        try:
+            server._bind()
+        except OSError:
+            return None
+        threading.Thread(target=server._serve, daemon=True).start()
+        return server
+
+    def _bind(self):
+        if USE_UNIX_SOCKET:
+            path = socket_path()
+            if os.path.exists(path):
+                conn, _ = _connect()
+                if conn is not None:
+                    conn.close()
+                    raise OSError("已有实例在运行")
+                # 上次异常退出留下的套接字文件
+                os.remove(path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            old_umask = os.umask(0o077)  # 只有当前用户可以连接
+            try:
+                sock.bind(path)
+            finally:
+                os.umask(old_umask)
+            self.path = path
+        else:
+            import secrets
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(("127.0.0.1", 0))
+            self.token = secrets.token_hex(16)
+            tmp = f"{port_file()}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"port": sock.getsockname()[1], "token": self.token, "pid": os.getpid()}, f)
+            self.path = port_file()
+            os.replace(tmp, self.path)
+        sock.listen(8)
+        self.sock = sock
+
+    def _serve(self):
+        while not self._closed:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            # 单个连接出了任何问题（格式不对、处理函数出错）都只丢掉这条消息，继续接收后面的连接
+            try:
+                with conn:
+                    message = self._receive(conn)
+                if message is not None:
+                    self._dispatch(message)
+            except Exception:
+                logger.exception("处理其他进程发来的消息失败")
+
+    def _receive(self, conn):
+        """读取并校验一条消息，确认收到后返回；消息无效时返回 None"""
+        conn.settimeout(TIMEOUT)
+        try:
+            message = json.loads(_read_line(conn).decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(message, dict):
+            return None
+        if self.token and message.pop("token", None) != self.token:
+            return None
+        if not isinstance(message.get("url"), (str, type(None))):
+            return None
+        try:
+            conn.sendall(b"ok\n")
+        except OSError:
+            pass
+        return message
+
+    def _dispatch(self, message):
+        with self._lock:
+            handler = self._handler
+            if handler is None:
+                self._pending.append(message)
+                return
+        handler(message)
+
+    def set_handler(self, handler):
+        with self._lock:
+            self._handler = handler
+            pending, self._pending = self._pending, []
+        for message in pending:
+            handler(message)
+
+    def close(self):
+        self._closed = True
+        if self.sock is None:
+            return
+        try:
+            # 唤醒阻塞在 accept() 上的服务线程
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        if self.path is None:
+            return
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,18 @@
+"""启动时加载的平台与解析接口（内容见 registry.json，加载与热更新见 registry.py）
+
+无界面命令直接使用这里的快照；界面和本地解析服务通过 registry.RegistryWatcher 在文件修改后换用新快照。
+"""
+from registry import load_active
+
+REGISTRY = load_active()
+
+# 视频平台首页
+PLATFORM_URLS = REGISTRY.platform_urls
+
+# 解析接口，视频链接直接拼接在前缀之后
+PARSE_APIS = REGISTRY.parse_apis
+
+# 支持的视频链接规则：(平台名, 可注册域名, 链接正则)
+SUPPORTED_PATTERNS = REGISTRY.patterns
+
+default_matcher = REGISTRY.matcher
@@ -0,0 +1,47 @@
+"""Tk 事件循环卡顿监测
+
+每隔 interval 毫秒安排一次 after 回调，回调实际执行时间比预期晚出的部分即为事件循环被阻塞的时间。
+设置环境变量 VIP_STALL_MONITOR=1 启动程序，退出时在标准错误输出统计结果。
+"""
+import time
+
+
+class StallMonitor:
+    def __init__(self, root, interval=20, threshold=50):
+        self.root = root
+        self.interval = interval  # 采样间隔（毫秒）
+        self.threshold = threshold  # 超过该值（毫秒）才记为一次卡顿
+        self.stalls = []  # 每次卡顿的时长（毫秒）
+        self.samples = 0
+        self._expected = None
+        self._after_id = None
+
+    def start(self):
+        self._expected = time.perf_counter() + self.interval / 1000
+        self._after_id = self.root.after(self.interval, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        now = time.perf_counter()
+        late_ms = (now - self._expected) * 1000
+        self.samples += 1
+        if late_ms > self.threshold:
+            self.stalls.append(late_ms)
+        self._expected = now + self.interval / 1000
+        self._after_id = self.root.after(self.interval, self._tick)
+
+    @property
+    def max_stall_ms(self):
+        return max(self.stalls, default=0.0)
+
+    @property
+    def total_stall_ms(self):
+        return sum(self.stalls)
+
+    def summary(self):
+        return (f"事件循环卡顿: {len(self.stalls)} 次, 最长 {self.max_stall_ms:.0f} ms, "
+                f"累计 {self.total_stall_ms:.0f} ms（采样 {self.samples} 次, 阈值 {self.threshold} ms）")
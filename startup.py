@@ -0,0 +1,89 @@
+"""启动阶段的延迟初始化与耗时统计
+
+lazy_import 返回一个模块代理，第一次访问属性时才真正导入，导入耗时计入启动统计。
+使用 python vip.py --profile-startup 启动时，首次绘制完成后在标准错误输出各阶段耗时。
+"""
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from tracing import tracer
+
+
+class StartupProfiler:
+    """按阶段累计耗时；阶段可以嵌套，父阶段只统计扣除子阶段后的部分
+
+    只统计主线程中的阶段：工作线程中的阶段（如接口探测时首次导入 api_prober）与主线程同时进行，
+    计入同一个栈会把时间算到错误的阶段上，这些阶段只记入 trace。
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.enabled = False
+        self.totals = {}  # 阶段名 -> 累计秒数（按首次出现顺序）
+        self._stack = []  # 正在进行的阶段的子阶段耗时累计
+
+    def add(self, name, seconds):
+        """累计一段刚刚结束、持续 seconds 秒的阶段"""
+        end = time.perf_counter()
+        tracer.record(name, end - seconds, end, "startup")
+        self._accumulate(name, seconds)
+
+    def _accumulate(self, name, seconds):
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        if threading.current_thread() is not threading.main_thread():
+            try:
+                yield
+            finally:
+                tracer.record(name, start, time.perf_counter(), "startup")
+            return
+        self._stack.append(0.0)
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            elapsed = end - start
+            children = self._stack.pop()
+            tracer.record(name, start, end, "startup")
+            self._accumulate(name, elapsed - children)
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def elapsed(self):
+        return time.perf_counter() - self.origin
+
+    def report(self, file=None):
+        file = file or sys.stderr
+        total = self.elapsed()
+        print(f"启动耗时 {total * 1000:.1f} ms", file=file)
+        for name, seconds in self.totals.items():
+            print(f"  {name:<16s}{seconds * 1000:9.1f} ms  {seconds / total * 100:5.1f}%", file=file)
+
+
+profiler = StartupProfiler()
+
+
+class LazyModule:
+    """首次访问属性时才导入的模块代理"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            with profiler.phase(f"导入 {self._name}"):
+                module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
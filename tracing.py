@@ -0,0 +1,173 @@
+"""轻量级耗时追踪
+
+用 tracer.span("名称") 或 @traced("名称") 包住需要统计的代码，关闭时 span() 直接返回一个空的上下文管理器，几乎没有开销。
+打开追踪：设置环境变量 VIP_TRACE=1（或 true/yes/on，或 VIP_TRACE=输出文件路径；VIP_TRACE=0 或为空时不追踪），或启动时加 --trace / --trace=输出文件路径。
+退出时写出 Chrome trace-event JSON（可在 chrome://tracing 或 Perfetto 中打开），并在标准错误输出每个 span 的 p50/p95。
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+ENV_VAR = "VIP_TRACE"
+_DISABLED_VALUES = ("0", "false", "no", "off")
+_ENABLED_VALUES = ("1", "true", "yes", "on")  # 打开追踪并使用默认文件名
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter(), self.cat, self.args)
+        return False
+
+
+class Tracer:
+    def __init__(self, max_events=100_000, window=1000):
+        self.enabled = False
+        self.output = None  # 退出时写出的 trace 文件路径
+        self.origin = time.perf_counter()
+        self.events = deque(maxlen=max_events)  # (名称, 分类, 开始, 结束, 线程 id, 参数)
+        self.window = window
+        self.durations = {}  # 名称 -> 最近 window 次的耗时（秒）
+        self.thread_names = {}
+        self._lock = threading.Lock()  # 各线程都会记录 span，保护 events/durations/thread_names
+
+    def configure(self, argv=(), environ=os.environ):
+        """按环境变量和命令行参数打开追踪，返回去掉 --trace 参数后的 argv"""
+        rest = []
+        # VIP_TRACE 为 1/true/yes/on 时使用默认文件名，其他非空值为输出文件路径；空值和 0/false/no/off 表示不追踪
+        output = environ.get(ENV_VAR, "").strip() or None
+        enabled = output is not None and output.lower() not in _DISABLED_VALUES
+        if not enabled:
+            output = None
+        for arg in argv:
+            if arg == "--trace":
+                enabled = True
+            elif arg.startswith("--trace="):
+                enabled, output = True, arg.split("=", 1)[1]
+            else:
+                rest.append(arg)
+        if enabled:
+            self.enabled = True
+            if not output or output.lower() in _ENABLED_VALUES:
+                output = time.strftime("vip-trace-%Y%m%d-%H%M%S.json")
+            self.output = output
+        return rest
+
+    def span(self, name, cat="app", args=None):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def record(self, name, start, end, cat="app", args=None):
+        """记录一个已经结束的 span，start/end 为 time.perf_counter() 的读数"""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        with self._lock:
+            self.thread_names.setdefault(thread.ident, thread.name)
+            self.events.append((name, cat, start, end, thread.ident, args))
+            durations = self.durations.get(name)
+            if durations is None:
+                durations = self.durations[name] = deque(maxlen=self.window)
+            durations.append(end - start)
+
+    def percentiles(self, name):
+        """返回 (次数, p50, p95)，单位为秒"""
+        with self._lock:
+            samples = sorted(self.durations.get(name, ()))
+        if not samples:
+            return 0, 0.0, 0.0
+
+        def pick(q):
+            return samples[min(len(samples) - 1, int(q * len(samples)))]
+        return len(samples), pick(0.5), pick(0.95)
+
+    def summary(self):
+        lines = ["span 耗时（最近 %d 次）:" % self.window]
+        with self._lock:
+            names = list(self.durations)
+        for name in names:
+            count, p50, p95 = self.percentiles(name)
+            lines.append(f"  {name:<20s} n={count:<5d} p50 {p50 * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        with self._lock:
+            thread_names = list(self.thread_names.items())
+            recorded = list(self.events)
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in thread_names
+        ]
+        for name, cat, start, end, tid, args in recorded:
+            event = {
+                "name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                "ts": round((start - self.origin) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path=None):
+        path = path or self.output
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+        return path
+
+    def finish(self, file=None):
+        """程序退出时调用：写出 trace 文件并输出统计"""
+        if not self.enabled:
+            return
+        file = file or sys.stderr
+        path = self.write()
+        print(self.summary(), file=file)
+        print(f"trace 已写入 {os.path.abspath(path)}", file=file)
+
+
+tracer = Tracer()
+
+
+def traced(name=None, cat="app"):
+    """装饰器版本的 tracer.span，追踪关闭时只多一次属性判断"""
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(tracer, span_name, cat, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,140 @@
+"""视频链接规范化
+
+同一集视频会以多种形式出现：带 spm/vd_source 等跟踪参数、有无 www、http/https、移动端 m. 域名……
+这里按平台把链接归约为稳定的视频 ID，再拼成唯一的规范链接，供解析、去重和历史记录使用。
+平台规则以 registry.json 中的可注册域名为键；注册表中新增的平台没有规则时，链接按原样交给匹配器。
+这里不读取注册表：video_key 只给出可注册域名，调用方用自己持有的 Registry.platform_by_domain 换成平台名，
+注册表热更新后自然用上新的平台。
+"""
+import re
+from functools import lru_cache
+from urllib.parse import parse_qs, quote, urlsplit
+
+from url_matcher import registrable_domain, split_authority
+
+# 可注册域名 -> [(主机名后缀, 路径正则, 规范链接模板, 需要保留的查询参数)]
+# 模板中的 {0}、{1} 为路径正则捕获的视频 ID
+CANONICAL_RULES = {
+    "youku.com": [
+        ("youku.com", r"^/v_show/id_([0-9A-Za-z=_-]+?)(?:\.html)?$", "https://v.youku.com/v_show/id_{0}.html", ()),
+        ("youku.com", r"^/video/id_([0-9A-Za-z=_-]+?)(?:\.html)?$", "https://v.youku.com/v_show/id_{0}.html", ()),
+    ],
+    "iqiyi.com": [
+        ("iqiyi.com", r"^/([vw]_[0-9a-z]+)\.html", "https://www.iqiyi.com/{0}.html", ()),
+    ],
+    "qq.com": [
+        ("v.qq.com", r"^/x/cover/(\w+)/(\w+)\.html", "https://v.qq.com/x/cover/{0}/{1}.html", ()),
+        ("v.qq.com", r"^/x/cover/(\w+)\.html", "https://v.qq.com/x/cover/{0}.html", ("vid",)),
+        ("v.qq.com", r"^/x/page/(\w+)\.html", "https://v.qq.com/x/page/{0}.html", ()),
+    ],
+    "bilibili.com": [
+        ("bilibili.com", r"^/video/(BV[0-9A-Za-z]{10}|av\d+)", "https://www.bilibili.com/video/{0}/", ("p",)),
+    ],
+    "mgtv.com": [
+        ("mgtv.com", r"^/b/(\d+)/(\d+)\.html", "https://www.mgtv.com/b/{0}/{1}.html", ()),
+    ],
+    "le.com": [
+        ("le.com", r"^/ptv/vplay/(\d+)\.html", "https://www.le.com/ptv/vplay/{0}.html", ()),
+        ("le.com", r"^/vplay_(\d+)\.html", "https://www.le.com/ptv/vplay/{0}.html", ()),
+    ],
+    "sohu.com": [
+        ("tv.sohu.com", r"^/v/([0-9A-Za-z=+_-]+)\.html", "https://tv.sohu.com/v/{0}.html", ()),
+    ],
+    "1905.com": [
+        ("1905.com", r"^/vod/play/(\d+)\.shtml", "https://www.1905.com/vod/play/{0}.shtml", ()),
+    ],
+    "pptv.com": [
+        ("pptv.com", r"^/show/(\w+)\.html", "https://v.pptv.com/show/{0}.html", ()),
+    ],
+    "fun.tv": [
+        ("fun.tv", r"^/vplay/([gv]-\d+(?:\.[gv]-\d+)?)/?", "http://www.fun.tv/vplay/{0}/", ()),
+    ],
+    "acfun.cn": [
+        ("acfun.cn", r"^/v/(ac\d+(?:_\d+)?)", "https://www.acfun.cn/v/{0}", ()),
+    ],
+}
+
+_COMPILED_RULES = {
+    domain: [(host_suffix, re.compile(pattern), template, keep) for host_suffix, pattern, template, keep in rules]
+    for domain, rules in CANONICAL_RULES.items()
+}
+
+
+def _host_matches(host, suffix):
+    return host == suffix or host.endswith("." + suffix)
+
+
+def video_key(url):
+    """返回 (可注册域名, 视频 ID, 规范链接)，无法识别时返回 None"""
+    url = url.strip()
+    if "//" not in url:
+        # 允许省略协议，如 v.qq.com/x/page/xxx.html
+        url = "https://" + url
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").rstrip(".")
+    except ValueError:
+        return None
+
+    domain = registrable_domain(host)
+    for host_suffix, pattern, template, keep in _COMPILED_RULES.get(domain, ()):
+        if not _host_matches(host, host_suffix):
+            continue
+        match = pattern.match(parts.path)
+        if match is None:
+            continue
+        ids = list(match.groups())
+        canonical = template.format(*ids)
+        if keep and parts.query:
+            query = parse_qs(parts.query)
+            if "vid" in keep and "vid" in query and len(ids) == 1:
+                # 腾讯视频 cover 页通过 ?vid= 指定具体某一集
+                ids.append(query["vid"][0])
+                canonical = "https://v.qq.com/x/cover/{0}/{1}.html".format(*ids)
+            if "p" in keep and query.get("p", ["1"])[0] not in ("", "1"):
+                # 哔哩哔哩多 P 视频的分集号
+                ids.append("p" + query["p"][0])
+                canonical = f"{canonical}?p={query['p'][0]}"
+        return domain, "/".join(ids), canonical
+    return None
+
+
+@lru_cache(maxsize=4096)
+def canonicalize(url):
+    """返回规范链接，无法识别的链接返回 None（结果带缓存）"""
+    if not url:
+        return None
+    key = video_key(url)
+    return key[2] if key else None
+
+
+def match_video_url(matcher, url):
+    """返回链接所属的平台名：先直接匹配原链接（绝大多数情况），不匹配且域名受支持时
+    （移动端域名、省略协议等写法）才规范化后再匹配一次；域名不受支持的链接不做规范化"""
+    platform = matcher.match(url)
+    if platform is not None or not url:
+        return platform
+    if registrable_domain(split_authority(url.strip())[1]) not in matcher.domains:
+        return None
+    canonical = canonicalize(url)
+    return matcher.match(canonical) if canonical else None
+
+
+def canonicalize_many(urls):
+    """批量规范化，按输入顺序返回规范链接（无法识别为 None）"""
+    return [canonicalize(url) for url in urls]
+
+
+def unique_canonical(urls):
+    """逐个产出首次出现的 (原链接, 规范链接)，同一视频的其他写法会被跳过"""
+    seen = set()
+    for url in urls:
+        canonical = canonicalize(url)
+        if canonical is not None and canonical not in seen:
+            seen.add(canonical)
+            yield url, canonical
+
+
+def build_parse_url(api_prefix, url):
+    """把（已规范化的）视频链接编码后拼接到解析接口前缀之后，链接中的 ?、&、= 不会和接口自身的参数混淆"""
+    return api_prefix + quote(url.strip(), safe=":/")
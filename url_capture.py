@@ -0,0 +1,129 @@
+"""从浏览器地址栏复制视频链接
+
+原实现每次按键后固定等待 200 ms。这里改为按递增间隔轮询剪贴板，复制到有效链接就立即返回。
+每次成功复制的实际等待时间会记入滑动平均，用来调整下一次获取的超时；超时时放大估计值（不超过上限），
+浏览器很慢时超时会逐步增长，而不是一直停在初始估计上。
+键盘和剪贴板都可以注入，便于用假对象测试和计时。
+"""
+import time
+
+from tracing import tracer
+
+
+class SystemKeyboard:
+    """基于 keyboard 库的按键发送，首次使用时才导入"""
+
+    def press_and_release(self, keys):
+        import keyboard
+        keyboard.press_and_release(keys)
+
+
+class SystemClipboard:
+    """基于 pyperclip 的剪贴板读写，首次使用时才导入"""
+
+    def copy(self, text):
+        import pyperclip
+        pyperclip.copy(text)
+
+    def paste(self):
+        import pyperclip
+        return pyperclip.paste()
+
+
+class StepTimer:
+    """记录某一步从按键到剪贴板变化的耗时（滑动平均），据此给出下次的超时"""
+
+    def __init__(self, initial=0.2, alpha=0.3, headroom=3.0, minimum=0.1, maximum=1.5, backoff=2.0):
+        self.average = initial
+        self.alpha = alpha
+        self.headroom = headroom  # 超时 = 平均耗时 * headroom
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff  # 超时后平均耗时放大的倍数
+
+    def record(self, seconds):
+        self.average += self.alpha * (seconds - self.average)
+
+    def timed_out(self):
+        """等到超时也没有结果：实际耗时比估计的长，放大估计值，直到超时达到 maximum"""
+        self.average = min(self.average * self.backoff, self.maximum / self.headroom)
+
+    @property
+    def timeout(self):
+        return min(self.maximum, max(self.minimum, self.average * self.headroom))
+
+
+class UrlCapture:
+    """按键从浏览器复制链接，每次复制后轮询剪贴板直到出现新内容或超时"""
+
+    def __init__(self, is_valid, keyboard=None, clipboard=None, settle=0.05,
+                 poll_start=0.01, poll_growth=1.5, poll_max=0.05, copy_initial=0.2, copy_maximum=1.5,
+                 sleep=time.sleep, clock=time.perf_counter):
+        self.is_valid = is_valid
+        self.keyboard = keyboard or SystemKeyboard()
+        self.clipboard = clipboard or SystemClipboard()
+        self.settle = settle  # 切换窗口后等待窗口获得焦点的时间
+        self.poll_start = poll_start
+        self.poll_growth = poll_growth
+        self.poll_max = poll_max
+        self.sleep = sleep
+        self.clock = clock
+        # 复制的预计耗时从 copy_initial 开始按实际情况调整，超时不超过 copy_maximum
+        self.copy_timer = StepTimer(initial=copy_initial, maximum=copy_maximum)
+        self.last_steps = []  # 最近一次获取每一步的 (步骤, 耗时秒)
+
+    def wait_for_text(self, timer, accept=None):
+        """以递增间隔轮询剪贴板，读到新内容（给出 accept 时须通过 accept 检查）即返回；
+        超时返回最后读到的内容（可能为空字符串）"""
+        start = self.clock()
+        deadline = start + timer.timeout
+        interval = self.poll_start
+        while True:
+            text = self.clipboard.paste().strip()
+            now = self.clock()
+            if text and (accept is None or accept(text)):
+                # 成功的耗时计入平均；超时的等待时间并不是复制实际需要的时间，只据此放大估计值
+                timer.record(now - start)
+                return text
+            if now >= deadline:
+                timer.timed_out()
+                return text
+            self.sleep(min(interval, deadline - now))
+            interval = min(interval * self.poll_growth, self.poll_max)
+
+    def _step(self, name, keys, wait):
+        with tracer.span(name, "capture"):
+            start = self.clock()
+            self.keyboard.press_and_release(keys)
+            if wait:
+                self.sleep(wait)
+            self.last_steps.append((name, self.clock() - start))
+
+    def _copy(self, name):
+        with tracer.span(name, "capture"):
+            # 先清空剪贴板，之后读到的任何内容都是这次复制的结果
+            self.clipboard.copy("")
+            start = self.clock()
+            self.keyboard.press_and_release("ctrl+c")
+            # 剪贴板可能先出现别的内容（剪贴板管理器、地址栏的搜索建议），等到有效链接再返回
+            url = self.wait_for_text(self.copy_timer, self.is_valid)
+            self.last_steps.append((name, self.clock() - start))
+            return url
+
+    def capture(self):
+        """先用 Alt+D 定位地址栏，失败后改用多次 F6，返回最终读到的剪贴板内容"""
+        self.last_steps = []
+        self._step("切换窗口", "alt+tab", self.settle)
+        self._step("定位地址栏", "alt+d", self.settle)
+        url = self._copy("复制")
+        self._step("切回窗口", "alt+tab", 0)
+        if url and self.is_valid(url):
+            return url
+
+        self._step("切换窗口(备用)", "alt+tab+tab", self.settle)
+        for attempt in range(3):
+            self._step(f"F6 第{attempt + 1}次", "f6", self.settle)
+            url = self._copy(f"复制 第{attempt + 1}次")
+            if url and self.is_valid(url):
+                break
+        return url
@@ -0,0 +1,62 @@
+import re
+
+
+# 提取 scheme://[user@]host[:port] 中的 host
+_HOST_RE = re.compile(r"^(?:[A-Za-z][A-Za-z0-9+.\-]*:)?//(?:[^@/?#]*@)?([^:/?#]*)")
+
+
+def registrable_domain(host):
+    """取主机名的最后两级作为可注册域名，如 v.qq.com -> qq.com"""
+    last_dot = host.rfind(".")
+    if last_dot < 0:
+        return host
+    return host[host.rfind(".", 0, last_dot) + 1:]
+
+
+def split_authority(text):
+    """不用正则取出链接开头到主机名结束的部分，以及小写的主机名；允许省略协议"""
+    start = 0
+    slash = text.find("/")
+    if slash >= 0 and text.startswith("//", slash) and (slash == 0 or text[slash - 1] == ":"):
+        start = slash + 2
+    end = len(text)
+    for sep in "/?#":
+        pos = text.find(sep, start, end)
+        if pos >= 0:
+            end = pos
+    host = text[start:end].rpartition("@")[2].partition(":")[0]
+    return text[:end], host.lower().rstrip(".")
+
+
+class VideoUrlMatcher:
+    """视频链接匹配器：构建时预编译正则并按域名建立索引，每个链接只需一次字典查找和一次正则匹配
+
+    patterns 为 (平台名, 可注册域名, 链接正则) 列表，正则可以是已编译的对象；默认的规则见 registry.json
+    """
+
+    def __init__(self, patterns):
+        self._index = {}
+        for platform, domain, pattern in patterns:
+            self._index[domain] = (platform, re.compile(pattern))
+        self.domains = frozenset(self._index)  # 受支持的可注册域名
+
+    def match(self, url):
+        """返回链接所属的平台名，不支持的链接返回 None"""
+        if not url:
+            return None
+        host = _HOST_RE.match(url)
+        if host is None:
+            return None
+        entry = self._index.get(registrable_domain(host.group(1).lower()))
+        if entry is None or entry[1].search(url) is None:
+            return None
+        return entry[0]
+
+    def match_many(self, urls):
+        """批量匹配，按输入顺序返回每个链接对应的平台名（不支持为 None）"""
+        match = self.match
+        return [match(url) for url in urls]
+
+    def is_valid(self, url):
+        return self.match(url) is not None
+
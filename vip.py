@@ -1,39 +1,83 @@
 import os
-import re
 import sys
-import webbrowser
-from tkinter import messagebox
-from urllib.parse import urlparse
-
-import keyboard
-import pyperclip
 import time
 
-
-from PIL import Image, ImageTk
+from startup import lazy_import, profiler
+from tracing import traced, tracer
+
+# 无界面子命令（如 batch）必须在导入 keyboard/PIL/customtkinter 之前分发，
+# 这样才能在没有显示器的服务器和定时任务里运行
+# 子命令都是单个英文单词，链接等其他参数不必导入 cli，再次启动交接链接时省去这部分开销
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1].isidentifier():
+    import cli
+    if sys.argv[1] in cli.HEADLESS_COMMANDS:
+        sys.exit(cli.main(sys.argv[1:]))
+
+instance_server = None
+if __name__ == "__main__":
+    # 取走 --trace 参数，之后的参数处理看不到它
+    sys.argv[1:] = tracer.configure(sys.argv[1:])
+    import single_instance
+    if "--new-instance" not in sys.argv[1:]:
+        # 已有窗口在运行时把链接交给它，本进程不再加载界面
+        if single_instance.hand_off(sys.argv[1:]):
+            sys.exit(0)
+        instance_server = single_instance.InstanceServer.listen()
+        # 两个进程同时启动、对方抢先开始监听时，再交接一次
+        if instance_server is None and single_instance.hand_off(sys.argv[1:]):
+            sys.exit(0)
+
+import queue
+import threading
+
+from PIL import ImageTk
 import customtkinter as ctk
 import tkinter as tk
 
-
-
-class HistoryState:
-    """历史记录状态类，存储输入框状态"""
-
-    def __init__(self, text, cursor_pos=0):
-        self.text = text
-        self.cursor_pos = cursor_pos
+from animation import FrameAnimator
+from api_stats import ApiStats, default_stats_path
+from asset_bundle import resources
+from asset_cache import GifFrames, thumbnail
+from clipboard_watcher import ClipboardWatcher
+from edit_history import EditHistory
+from live_validation import Debouncer, LiveValidator
+from notifier import NotificationDialog
+from registry import RegistryWatcher
+from sources import REGISTRY
+from stall_monitor import StallMonitor
+from url_canonical import build_parse_url, canonicalize, match_video_url
+from url_capture import UrlCapture
+
+# 不是每次启动都会用到的模块，首次使用时再导入
+browser_launcher = lazy_import("browser_launcher")
+api_prober = lazy_import("api_prober")
+api_race = lazy_import("api_race")
+history_store = lazy_import("history_store")  # 连带导入 sqlite3，首次绘制后才打开历史记录
+
+# 停止输入多久后校验输入框中的链接（秒）
+VALIDATE_DELAY = 0.3
+# 竞速解析：同时尝试的接口数、追加下一个接口前等待的秒数
+RACE_CANDIDATES = 3
+RACE_HEDGE_DELAY = 0.6
+# 同一视频在这么多秒内换用其他接口重新解析，视为前一个接口没能播放
+RETRY_WINDOW = 120
+
+profiler.add("导入模块", profiler.elapsed())
 
 
 class EnhancedEntry(ctk.CTkEntry):
-    """增强型输入框，支持撤销/重做功能"""
+    """增强型输入框，支持撤销/重做功能；传入 validator 时停止输入后即时校验内容"""
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, validator=None, on_validated=None, validate_delay=VALIDATE_DELAY, **kwargs):
         super().__init__(*args, **kwargs)
 
-        # 初始化历史记录
-        self.undo_stack = []  # 撤销栈
-        self.redo_stack = []  # 重做栈
-        self.current_state = None  # 当前状态
+        # 即时校验：validator.check(文本) 的结果交给 on_validated
+        self.validator = validator
+        self.on_validated = on_validated
+        self.debouncer = Debouncer(self, validate_delay, self.validate_now) if validator else None
+
+        # 初始化历史记录（只保存每一步的改动，最多 50 步）
+        self.history = EditHistory(self.get(), self.index(tk.INSERT), capacity=50)
 
         # 绑定事件
         self.bind("<KeyRelease>", self.track_changes)
@@ -41,29 +85,13 @@ class EnhancedEntry(ctk.CTkEntry):
         self.bind("<Control-Z>", self.undo)
         self.bind("<Control-y>", self.redo)
         self.bind("<Control-Y>", self.redo)
-
-        # 初始状态
-        self.save_state()
+        if validator:
+            # 鼠标中键、菜单等不经过按键的粘贴
+            self.bind("<<Paste>>", lambda event: self.debouncer.poke(), add="+")
 
     def save_state(self):
         """保存当前状态到历史记录"""
-        current_text = self.get()
-        cursor_pos = self.index(tk.INSERT)  # 获取光标位置
-
-        # 只有当状态变化时才保存
-        if not self.current_state or current_text != self.current_state.text:
-            # 保存当前状态到撤销栈
-            if self.current_state:
-                self.undo_stack.append(self.current_state)
-                # 限制栈大小
-                if len(self.undo_stack) > 50:
-                    self.undo_stack.pop(0)
-
-            # 创建新状态
-            self.current_state = HistoryState(current_text, cursor_pos)
-
-            # 清除重做栈（新操作使重做历史无效）
-            self.redo_stack = []
+        self.history.record(self.get(), self.index(tk.INSERT))
 
     def track_changes(self, event):
         """跟踪文本变化并保存状态"""
@@ -73,108 +101,245 @@ class EnhancedEntry(ctk.CTkEntry):
             return
 
         self.save_state()
-
-    def apply_state(self, state):
-        """应用历史状态到输入框"""
-        # 解除事件绑定避免循环
-        self.unbind("<KeyRelease>")
-
-        # 更新文本
-        self.delete(0, "end")
-        self.insert(0, state.text)
-
-        # 恢复光标位置
-        self.icursor(state.cursor_pos)
-
-        # 重新绑定事件
-        self.bind("<KeyRelease>", self.track_changes)
-
-        # 更新当前状态
-        self.current_state = state
+        if self.debouncer:
+            self.debouncer.poke()
+
+    def validate_now(self):
+        """立即校验（程序填入链接时调用），取消尚未触发的延迟校验"""
+        if self.validator is None:
+            return None
+        self.debouncer.cancel()
+        result = self.validator.check(self.get())
+        if self.on_validated:
+            self.on_validated(result)
+        return result
+
+    def apply_delta(self, pos, remove, insert, cursor_pos):
+        """只替换发生改动的那一段文本，并恢复光标位置"""
+        if remove:
+            self.delete(pos, pos + len(remove))
+        if insert:
+            self.insert(pos, insert)
+        self.icursor(cursor_pos)
 
     def undo(self, event=None):
         """执行撤销操作"""
-        if self.undo_stack:
-            # 将当前状态保存到重做栈
-            if self.current_state:
-                self.redo_stack.append(self.current_state)
-                if len(self.redo_stack) > 50:
-                    self.redo_stack.pop(0)
-
-            # 应用上一个状态
-            previous_state = self.undo_stack.pop()
-            self.apply_state(previous_state)
+        # 先记录尚未保存的改动（如程序填入或清空的链接），保证历史中的文本与输入框一致
+        self.save_state()
+        delta = self.history.undo()
+        if delta:
+            self.apply_delta(delta.pos, delta.inserted, delta.deleted, delta.cursor_before)
 
         return "break"  # 阻止默认行为
 
     def redo(self, event=None):
         """执行重做操作"""
-        if self.redo_stack:
-            # 将当前状态保存到撤销栈
-            if self.current_state:
-                self.undo_stack.append(self.current_state)
-                if len(self.undo_stack) > 50:
-                    self.undo_stack.pop(0)
-
-            # 应用重做状态
-            next_state = self.redo_stack.pop()
-            self.apply_state(next_state)
+        self.save_state()
+        delta = self.history.redo()
+        if delta:
+            self.apply_delta(delta.pos, delta.deleted, delta.inserted, delta.cursor_after)
 
         return "break"  # 阻止默认行为
 
-def resource_path(resource_path):
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path,resource_path)
 
+class RecentDropdown:
+    """输入框下方的历史链接下拉列表，内容来自 HistoryStore.search()
+
+    查询历史要访问 SQLite，和即时校验一样停止输入 delay 秒后才搜索，按键本身只更新 Debouncer 的时间戳。
+    """
+
+    # 这些按键不会改变输入内容，不触发搜索
+    IGNORED_KEYS = ("Left", "Right", "Up", "Down", "Shift_L", "Shift_R", "Control_L", "Control_R",
+                    "Alt_L", "Alt_R", "Caps_Lock", "Escape", "Return", "Tab")
+
+    def __init__(self, entry, search, on_select, limit=8, delay=VALIDATE_DELAY):
+        self.entry = entry
+        self.search = search
+        self.on_select = on_select
+        self.limit = limit
+        self.window = None
+        self.listbox = None
+        self.items = []
+        self.debouncer = Debouncer(entry, delay, self.refresh)
+
+        entry.bind("<KeyRelease>", self.on_key_release)
+        entry.bind("<Down>", self.on_down)
+        entry.bind("<Escape>", lambda event: self.hide())
+        entry.bind("<FocusOut>", lambda event: self.entry.after(150, self.hide_unless_focused))
+
+    def build(self):
+        self.window = tk.Toplevel(self.entry)
+        self.window.withdraw()
+        self.window.overrideredirect(True)
+        self.window.attributes("-topmost", True)
+        self.listbox = tk.Listbox(
+            self.window,
+            font=("微软雅黑", 11),
+            activestyle="none",
+            borderwidth=1,
+            relief="solid",
+            highlightthickness=0,
+            selectbackground="#c0c0c0",
+            selectforeground="#000000",
+        )
+        self.listbox.pack(fill="both", expand=True)
+        self.listbox.bind("<ButtonRelease-1>", self.choose)
+        self.listbox.bind("<Return>", self.choose)
+        self.listbox.bind("<Escape>", lambda event: self.hide())
+        self.listbox.bind("<FocusOut>", lambda event: self.entry.after(150, self.hide_unless_focused))
+
+    @property
+    def visible(self):
+        return self.window is not None and self.window.winfo_ismapped()
+
+    def show(self, text):
+        items = self.search(text, self.limit)
+        if not items or (len(items) == 1 and items[0].canonical_url == text.strip()):
+            self.hide()
+            return
+        if self.window is None:
+            self.build()
+        self.items = items
+        self.listbox.delete(0, "end")
+        for item in items:
+            self.listbox.insert("end", item.canonical_url)
+        self.listbox.configure(height=len(items))
+        x = self.entry.winfo_rootx()
+        y = self.entry.winfo_rooty() + self.entry.winfo_height()
+        self.window.geometry(f"{self.entry.winfo_width()}x{self.listbox.winfo_reqheight()}+{x}+{y}")
+        self.window.deiconify()
+
+    def hide(self):
+        self.debouncer.cancel()
+        if self.window is not None:
+            self.window.withdraw()
+
+    def entry_focused(self):
+        return self.entry.focus_get() is getattr(self.entry, "_entry", None)
+
+    def hide_unless_focused(self):
+        if self.entry.focus_get() is not self.listbox and not self.entry_focused():
+            self.hide()
+
+    def on_key_release(self, event):
+        if event.keysym not in self.IGNORED_KEYS:
+            self.debouncer.poke()
+
+    def refresh(self):
+        """停止输入后搜索；焦点已经离开输入框时不再弹出"""
+        if self.entry_focused():
+            self.show(self.entry.get())
+
+    def on_down(self, event):
+        if not self.visible:
+            self.show(self.entry.get())
+        if self.visible:
+            self.listbox.focus_set()
+            self.listbox.selection_clear(0, "end")
+            self.listbox.selection_set(0)
+            self.listbox.activate(0)
+        return "break"
+
+    def choose(self, event=None):
+        selection = self.listbox.curselection()
+        if selection:
+            self.on_select(self.items[selection[0]].canonical_url)
+        self.hide()
+        self.entry.focus_set()
 
 
 class VideoParser:
-    def __init__(self):
+    def __init__(self, instance_server=None):
 
 
         ctk.set_appearance_mode("light")
         ctk.set_default_color_theme("dark-blue")
 
-        self.root = ctk.CTk()
-        self.root.title("视频解释器")
-        self.root.geometry("800x494")
-        self.root.iconbitmap(resource_path("icon.ico"))
-
-        self.platform_urls = {
-            "腾讯视频": "https://v.qq.com/",
-            "优酷视频": "https://www.youku.com/",
-            "爱奇艺": "https://www.iqiyi.com/",
-            "哔哩哔哩": "https://www.bilibili.com/",
-            "芒果TV": "https://www.mgtv.com/",
-            "乐视视频": "https://www.le.com/",
-            "暴风影音": "http://www.baofeng.com/",
-            "搜狐视频": "https://tv.sohu.com/",
-            "1905电影": "https://www.1905.com/",
-            "PPTV": "https://www.pptv.com/",
-            "风行视频": "http://www.fun.tv/",
-            "AcFun": "https://www.acfun.cn/"
-        }
-
-        self.parse_apis = {
-            "①夜幕解析": "https://www.yemu.xyz/?url=",
-            "②8090g": "https://www.8090g.cn/?url=",
-            "③M1907": "https://im1907.top/?jx=",
-            "④PlayerJY": "https://jx.playerjy.com/?url=",
-            "⑤虾米": "https://jx.xmflv.com/?url=",
-            "⑥ckplayer": "https://www.ckplayer.vip/jiexi/?url=",
-            "⑦yparse": "https://jx.yparse.com/index.php?url=",
-            "⑧剖云": "https://www.pouyun.com/?url=",
-            "⑨咸鱼": "https://jx.aidouer.net/?url=",
-            "⑩m3u8 ": "https://jx.m3u8.tv/jiexi/?url=",
-            #"冰豆": "https://api.qianqi.net/vip/?url=",
-            #"play": "https://www.playm3u8.cn/jiexi.php?url=",
-        }
-
+        with profiler.phase("创建窗口"):
+            self.root = ctk.CTk()
+            self.root.title("视频解释器")
+            self.root.geometry("800x494")
+            self.root.iconbitmap(resources.path("icon.ico"))
+
+        # 平台、解析接口和链接匹配器来自注册表快照，注册表文件修改后由 apply_registry 在主线程中整体换掉
+        self.registry = REGISTRY
+        self.platform_urls = self.registry.platform_urls
+        self.parse_apis = self.registry.parse_apis
+        self.registry_watcher = None  # 首次绘制后再开始轮询，见 after_first_paint
+
+        # 下拉框显示文本 -> 接口名，探测完成后显示文本会带上延迟
+        self.api_labels = {name: name for name in self.parse_apis}
+        # 用户手动选的接口只对选择时的平台有效，换成其他平台的链接后重新按该平台的表现推荐
+        self.api_chosen_by_user = False
+        self.api_chosen_for = None  # 手动选择接口时输入框中链接所属的平台
+        self.probe_results = {}  # 最近一次接口探测结果，竞速解析时据此排列候选接口
+        self.api_stats = None  # 各平台上接口的历史表现，首次绘制后再加载
+        self.detected_platform = None  # 输入框中链接所属的平台
+        self.last_parse = None  # (规范链接, 平台, 接口, 时间)，用于识别“换接口重试”
+        # 后台线程交给 Tk 主线程执行的回调
+        self.ui_queue = queue.Queue()
+        self.capture_thread = None
+        self.url_capture = UrlCapture(self.is_valid_video_url)
+        self.clipboard_watcher = None  # 勾选“监听剪贴板”后才创建
+        self.notifier = NotificationDialog(self.root, resources.path("icon.ico"))
+        self.browser = None  # 第一次打开链接时创建，见 open_in_browser
+
+        self.history = None  # 首次绘制后再打开，见 after_first_paint
         self.current_frame = None
-        self.create_ui()
+        self.about_frame = None
+        with profiler.phase("构建控件"):
+            self.create_ui()
+        self.ui_built_at = time.perf_counter()
+        # after_idle 会在窗口真正显示之前就执行，这里等主窗口映射（<Map>）之后、
+        # 处理完这一轮重绘（after_idle）再做延迟初始化；最小化启动等不会映射的情况下 1 秒后照常初始化
+        self.first_paint_pending = True
+        self.root.bind("<Map>", self.on_first_map, add="+")
+        self.root.after(1000, self.after_first_paint)
+
+        # 后启动的进程交来的链接，在 Tk 主线程中处理
+        self.instance_server = instance_server
+        if instance_server is not None:
+            instance_server.set_handler(lambda message: self.call_in_ui(self.on_instance_message, message))
+
+    def on_first_map(self, event):
+        # 绑定在根窗口上的事件子控件也会触发，只看根窗口自己
+        if event.widget is self.root and self.first_paint_pending:
+            self.root.after_idle(self.after_first_paint)
+
+    def after_first_paint(self):
+        """窗口首次绘制后再做的初始化：侧栏图片解码、接口探测、注册表轮询
+
+        profiler 中的“首次绘制”是控件建好到主窗口映射并处理完随后的重绘所用的时间。
+        """
+        if not self.first_paint_pending:
+            return
+        self.first_paint_pending = False
+        profiler.add("首次绘制", time.perf_counter() - self.ui_built_at)
+        with profiler.phase("侧栏图片(延迟)"):
+            self.load_sidebar_images()
+        self.start_api_probe()
+        with profiler.phase("打开历史记录(延迟)"):
+            try:
+                self.history = history_store.HistoryStore()
+            except (history_store.sqlite3.Error, OSError) as e:
+                # 数据目录不可写、数据库损坏或被锁定时不记录历史，其他功能照常
+                print(f"无法打开历史记录，本次不保存历史: {e}", file=sys.stderr)
+            self.api_stats = ApiStats(default_stats_path())
+        with profiler.phase("预建提示框(延迟)"):
+            self.notifier.build()
+        self.registry_watcher = RegistryWatcher(
+            self.registry, on_change=lambda registry, old: self.call_in_ui(self.apply_registry, registry)
+        )
+        self.registry_watcher.start()
+        tracer.record("启动(到首次绘制后初始化完成)", profiler.origin, time.perf_counter(), "startup")
+        if profiler.enabled:
+            profiler.report()
+
+    def load_sidebar_images(self):
+        for label, name in self.sidebar_images:
+            photo = ImageTk.PhotoImage(thumbnail(name, (180, 180)))
+            label.configure(image=photo)
+            label.image = photo
 
     def create_ui(self):
 
@@ -199,42 +364,24 @@ class VideoParser:
 
         author_btn.pack(pady=20,padx=20,fill="x",side="bottom")
 
-        image = Image.open(resource_path("hezhao.jpg"))
-        image = image.resize((180, 180))
-        photo = ImageTk.PhotoImage(image)
-        author_label = tk.Label(left_panel, image=photo, bg="#f0f0f0")
-        author_label.image = photo
-        author_label.pack(expand=True)
-
-        image = Image.open(resource_path("dp.jpg"))
-        image = image.resize((180, 180))
-        photo = ImageTk.PhotoImage(image)
-        author_label = tk.Label(left_panel, image=photo, bg="#f0f0f0")
-        author_label.image = photo
-        author_label.pack(expand=True)
-
-
-        gif = Image.open(resource_path("qinqin.gif"))
-        frames = []
-        try:
-            while True:
-                frame = ImageTk.PhotoImage(gif.copy().resize((180, 180)))
-                frames.append(frame)
-                gif.seek(gif.tell() + 1)
-        except EOFError:
-            pass
-
-        if frames:
-            gif_label = tk.Label(left_panel, bg="#f0f0f0")
-            gif_label.pack(expand=True)
-            self.frames = frames
-
-            def update_frame(frame_index=0):
-                frame = self.frames[frame_index]
-                gif_label.configure(image=frame)
-                next_frame = (frame_index + 1) % len(self.frames)
-                self.root.after(50,update_frame,next_frame)
-            update_frame()
+        # 侧栏图片在首次绘制后才解码（见 load_sidebar_images），先用同尺寸的空白图占位
+        placeholder = tk.PhotoImage(width=180, height=180)
+        self.sidebar_images = []
+        for name in ("hezhao.jpg", "dp.jpg"):
+            author_label = tk.Label(left_panel, image=placeholder, bg="#f0f0f0")
+            author_label.image = placeholder
+            author_label.pack(expand=True)
+            self.sidebar_images.append((author_label, name))
+
+        # 动图帧由后台线程解码或从磁盘缓存读取，不阻塞窗口显示
+        with profiler.phase("图片解码"):
+            self.gif_frames = GifFrames.from_resource("qinqin.gif", (180, 180))
+        gif_label = tk.Label(left_panel, bg="#f0f0f0")
+        gif_label.pack(expand=True)
+
+        # 按帧时长播放，窗口最小化或被遮挡时暂停
+        self.gif_animator = FrameAnimator(gif_label, self.gif_frames)
+        self.gif_animator.start()
 
         self.main_panel = ctk.CTkFrame(
             self.root,
@@ -242,7 +389,6 @@ class VideoParser:
         )
         self.main_panel.pack(side="right", fill="both", expand=True, padx=2, pady=2)
         self.create_main_frame()
-        self.create_about_frame()
         self.show_main_frame()
 
     def create_main_frame(self):
@@ -264,11 +410,11 @@ class VideoParser:
         platform_names = list(self.platform_urls.keys())
         self.platform_var = ctk.StringVar(value=platform_names[0])
         custom_icon = ctk.CTkImage(
-            light_image=Image.open(resource_path("icon.png")),  # 浅色模式图标
-            dark_image=Image.open(resource_path("icon.png")),  # 深色模式图标（可以用同一个）
+            light_image=resources.image("icon.png"),  # 浅色模式图标
+            dark_image=resources.image("icon.png"),  # 深色模式图标（同一个，只解码一次）
             size=(15, 15)
         )
-        platform_dropdown = ctk.CTkOptionMenu(
+        self.platform_dropdown = ctk.CTkOptionMenu(
             platform_frame,
             values=platform_names,
             variable=self.platform_var,
@@ -283,7 +429,7 @@ class VideoParser:
             text_color="#000000",
             font=("微软雅黑", 13),
         )
-        platform_dropdown.pack(side="left",padx=5)
+        self.platform_dropdown.pack(side="left",padx=5)
         visit_btn = ctk.CTkButton(
             platform_frame,
             text="访问平台",
@@ -296,6 +442,19 @@ class VideoParser:
             corner_radius=8,
         )
         visit_btn.pack(side="left",padx=10)
+        # 用所有解析接口同时打开输入框中的链接
+        all_apis_btn = ctk.CTkButton(
+            platform_frame,
+            text="全部接口打开",
+            width=110,
+            height=35,
+            command=self.parse_all_apis,
+            fg_color="#e0e0e0",
+            hover_color="#c0c0c0",
+            text_color="#000000",
+            corner_radius=8,
+        )
+        all_apis_btn.pack(side="left", padx=5)
 
         api_frame = ctk.CTkFrame(self.main_frame,fg_color="transparent")
         api_frame.pack(fill="x",padx=30,pady=(20,0))
@@ -308,10 +467,11 @@ class VideoParser:
         api_label.pack(side="left",padx=(0,10))
         api_names = list(self.parse_apis.keys())
         self.api_var = ctk.StringVar(value=api_names[0])
-        api_dropdown = ctk.CTkOptionMenu(
+        self.api_dropdown = ctk.CTkOptionMenu(
             api_frame,
             values=api_names,
             variable=self.api_var,
+            command=self.on_api_selected,
             width=200,
             height=35,fg_color="#e0e0e0",
             button_color="#e0e0e0",
@@ -322,15 +482,39 @@ class VideoParser:
             text_color="#000000",
             font=("微软雅黑", 13),
         )
-        api_dropdown.pack(side="left",padx=5)
+        self.api_dropdown.pack(side="left",padx=5)
+        # 勾选后同时尝试多个接口，打开最先响应的那个
+        self.race_var = ctk.BooleanVar(value=False)
+        race_check = ctk.CTkCheckBox(
+            api_frame,
+            text="竞速解析",
+            variable=self.race_var,
+            font=("微软雅黑", 13),
+            text_color="#000000",
+        )
+        race_check.pack(side="left", padx=15)
+        # 勾选后复制的视频链接会自动填入输入框，不必再点“获取链接”
+        self.watch_var = ctk.BooleanVar(value=False)
+        watch_check = ctk.CTkCheckBox(
+            api_frame,
+            text="监听剪贴板",
+            variable=self.watch_var,
+            command=self.toggle_clipboard_watch,
+            font=("微软雅黑", 13),
+            text_color="#000000",
+        )
+        watch_check.pack(side="left", padx=5)
 
         # URL输入框框架
         url_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         url_frame.pack(fill="x", padx=30, pady=(20, 0))
 
         # 使用增强型输入框
+        self.url_validator = LiveValidator(self.registry.matcher)
         self.url_entry = EnhancedEntry(
             url_frame,
+            validator=self.url_validator,
+            on_validated=self.on_url_checked,
             placeholder_text="请输入视频链接...",
             height=35,
             font=("微软雅黑", 13),
@@ -341,10 +525,11 @@ class VideoParser:
             corner_radius=8,
         )
         self.url_entry.pack(side="left", fill="x", expand=True, padx=(0, 15))
+        self.recent_dropdown = RecentDropdown(self.url_entry, self.search_history, self.fill_url)
 
 
 
-        get_url_bun = ctk.CTkButton(
+        self.get_url_btn = ctk.CTkButton(
             url_frame,
             text="获取链接",
             width=100,
@@ -355,13 +540,13 @@ class VideoParser:
             text_color="#000000",
             corner_radius=8,
         )
-        get_url_bun.pack(side="right",padx=5)
+        self.get_url_btn.pack(side="right",padx=5)
         clear_btn = ctk.CTkButton(
             url_frame,
             text="清空",
             width=100,
             height=35,
-            command=lambda: self.url_entry.delete(0, 'end'),
+            command=lambda: self.fill_url(""),
             fg_color="#e0e0e0",
             hover_color="#c0c0c0",
             text_color="#000000",
@@ -382,6 +567,17 @@ class VideoParser:
             corner_radius=8,
         )
         parse_btn.pack(side="right")
+        # 输入框下方显示即时校验结果：链接是否有效、属于哪个平台
+        self.url_status = ctk.CTkLabel(
+            self.main_frame,
+            text="",
+            height=20,
+            font=("微软雅黑", 12),
+            text_color="#333333",
+            anchor="w",
+        )
+        self.url_status.pack(fill="x", padx=32, pady=(4, 0))
+        self.url_state = ("empty", None)
 
         # 分割线  # 添加分割线
         separator = ctk.CTkFrame(
@@ -476,164 +672,390 @@ class VideoParser:
     def show_about(self):
         if self.current_frame:
             self.current_frame.pack_forget()
+        if self.about_frame is None:
+            # 多数情况下不会打开关于页面，第一次显示时再创建
+            self.create_about_frame()
         self.about_frame.pack(fill="both", expand=True)
         self.current_frame = self.about_frame
 
+    @traced("解析")
     def parse_video(self):
         url = self.url_entry.get()
         if url:
-            selected_api = self.api_var.get()
-            parse_api = f"{self.parse_apis[selected_api]}{url}"
-            webbrowser.open(parse_api)
+            selected_api = self.selected_api()
+            # 去掉跟踪参数、统一域名和协议后再交给解析接口
+            canonical = canonicalize(url) or url.strip()
+            parse_api = build_parse_url(self.parse_apis[selected_api], canonical)
+            platform = self.registry.matcher.match(canonical)
+            self.note_retry(canonical, platform, selected_api)
+            if self.race_var.get():
+                self.race_parse(url, canonical, selected_api)
+                return
+            if self.history is not None:
+                self.history.record(canonical, url, platform, selected_api)
+            self.open_in_browser([parse_api])
+            self.measure_parse(platform, selected_api, parse_api)
         else:
             self.show_warning("请先获取视频链接！")
 
+    def race_candidates(self, selected_api, platform=None, count=RACE_CANDIDATES):
+        """竞速的候选接口：当前选中的排第一，其余按探测延迟排列，探测失败的放在最后；
+        该平台有历史统计时再按统计得分稳定排序"""
+        def latency(name):
+            result = self.probe_results.get(name)
+            if result is None:
+                return (1, 0)
+            return (0, result.ttfb_ms) if result.ok else (2, 0)
+        others = sorted((name for name in self.parse_apis if name != selected_api), key=latency)
+        if self.api_stats is not None and platform is not None:
+            others = self.api_stats.rank(platform, others)
+        return [selected_api] + others[:count - 1]
+
+    def race_parse(self, url, canonical, selected_api):
+        """在后台线程错开向前几个接口发请求，打开最先给出可用响应的接口"""
+        candidates = [
+            (name, build_parse_url(self.parse_apis[name], canonical))
+            for name in self.race_candidates(selected_api, self.registry.matcher.match(canonical))
+        ]
 
+        def work():
+            with tracer.span("竞速解析", "race", {"candidates": len(candidates)}):
+                result = api_race.race(candidates, hedge_delay=RACE_HEDGE_DELAY, timeout=5.0)
+            self.call_in_ui(self.finish_race, url, canonical, result)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def finish_race(self, url, canonical, result):
+        platform = self.registry.matcher.match(canonical)
+        for attempt in result.attempts:
+            # 被取消的请求说明不了接口好坏，不计入统计
+            if attempt.result is not None and not attempt.cancelled:
+                self.record_api_outcome(platform, attempt.name, attempt.result)
+        if not result.ok:
+            self.show_warning("所有解析接口都没有响应，请稍后再试！")
+            return
+        winner = result.winner
+        if self.history is not None:
+            self.history.record(canonical, url, platform, winner.name)
+        self.last_parse = (canonical, platform, winner.name, time.monotonic())
+        self.open_in_browser([winner.url])
+
+    def measure_parse(self, platform, api, parse_url):
+        """在后台请求一次解析页面，以首字节耗时近似起播耗时，记入该平台的接口统计"""
+        if platform is None:
+            return
+
+        def work():
+            result = api_prober.probe(api, parse_url, timeout=5.0)
+            self.call_in_ui(self.record_api_outcome, platform, api, result)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def note_retry(self, canonical, platform, api):
+        """同一视频短时间内换了接口重新解析，说明上一个接口没能播放，记一次失败"""
+        last = self.last_parse
+        self.last_parse = (canonical, platform, api, time.monotonic())
+        if (last is not None and self.api_stats is not None and last[0] == canonical
+                and last[2] != api and time.monotonic() - last[3] <= RETRY_WINDOW):
+            self.api_stats.record(last[1], last[2], ok=False)
+
+    def record_api_outcome(self, platform, api, result):
+        if self.api_stats is not None:
+            self.api_stats.record(platform, api, result.ok, result.ttfb_ms if result.ok else None)
+
+    def on_url_checked(self, check):
+        """输入框停止输入后的校验结果：显示是否有效和所属平台，同步平台下拉框；
+        平台变化时选中该平台上表现最好的接口（用户为当前平台手动选过接口时不改）"""
+        self.show_url_status(check)
+        platform = check.platform
+        if platform in self.platform_urls:
+            self.platform_var.set(platform)
+        if platform == self.detected_platform:
+            return
+        self.detected_platform = platform
+        if platform is not None and platform != self.api_chosen_for:
+            # 输入中途链接暂时无效时保留手动选择，换成其他平台的链接才作废
+            self.api_chosen_by_user = False
+        best = self.recommended_api()
+        if best and not self.api_chosen_by_user:
+            self.set_api(best)
+
+    def show_url_status(self, check):
+        state = check.state
+        if (state, check.platform) == self.url_state:
+            # 状态没变时不重绘
+            return
+        self.url_state = (state, check.platform)
+        if state == "valid":
+            text, color = f"✓ {check.platform}", "#2e7d32"
+        elif state == "invalid":
+            text, color = "✗ 不是支持的视频链接", "#c62828"
+        else:
+            text, color = "", "#333333"
+        self.url_status.configure(text=text, text_color=color)
+        self.url_entry.configure(border_color={"valid": "#2e7d32", "invalid": "#c62828"}.get(state, "#000000"))
+
+    def selected_api(self):
+        """返回当前选中的接口名（去掉下拉框中的延迟后缀）"""
+        label = self.api_var.get()
+        return self.api_labels.get(label, label)
+
+    def set_api(self, name):
+        """按接口名选中下拉框中对应的项"""
+        for label, api_name in self.api_labels.items():
+            if api_name == name:
+                self.api_var.set(label)
+                return
+
+    def on_api_selected(self, label):
+        self.api_chosen_by_user = True
+        self.api_chosen_for = self.detected_platform
+
+    def recommended_api(self):
+        """当前链接所属平台上历史表现最好的接口，没有记录时返回 None"""
+        if self.api_stats is None or self.detected_platform is None:
+            return None
+        return self.api_stats.best(self.detected_platform, list(self.parse_apis))
+
+    def call_in_ui(self, func, *args):
+        """供后台线程调用：把回调放入队列，再通过 root.after 交给 Tk 主线程执行"""
+        self.ui_queue.put((func, args))
+        try:
+            self.root.after(0, self.drain_ui_queue)
+        except (RuntimeError, tk.TclError):
+            # 窗口已关闭，主循环不再运行
+            pass
+
+    def drain_ui_queue(self):
+        while True:
+            try:
+                func, args = self.ui_queue.get_nowait()
+            except queue.Empty:
+                return
+            func(*args)
+
+    def start_api_probe(self, apis=None):
+        """在后台线程并发探测解析接口（默认全部），不阻塞界面"""
+        apis = dict(apis or self.parse_apis)
+
+        def work():
+            results = api_prober.probe_all(apis, timeout=3.0)
+            self.call_in_ui(self.merge_probe_results, results)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def merge_probe_results(self, results):
+        """探测结果并入之前的结果（只探测了部分接口时保留其他接口的结果）"""
+        merged = {name: result for name, result in self.probe_results.items() if name in self.parse_apis}
+        merged.update((name, result) for name, result in results.items() if name in self.parse_apis)
+        self.apply_probe_results(merged)
+
+    def apply_probe_results(self, results):
+        """在下拉框中显示各接口延迟，并在用户未手动选择时选中最快的可用接口"""
+        self.probe_results = results
+        selected = self.selected_api()
+        labels = {}
+        for name in self.parse_apis:
+            result = results.get(name)
+            if result is None:
+                label = name
+            elif result.ok:
+                label = f"{name}  {result.ttfb_ms:.0f}ms"
+            else:
+                label = f"{name}  ✕"
+            labels[label] = name
+        self.api_labels = labels
+        self.api_dropdown.configure(values=list(labels))
+
+        best = self.recommended_api() or api_prober.fastest_healthy(results)
+        if best and not self.api_chosen_by_user:
+            selected = best
+        if selected not in self.parse_apis:
+            # 选中的接口已从注册表中删除
+            selected = next(iter(self.parse_apis))
+        self.set_api(selected)
+
+    def apply_registry(self, registry):
+        """注册表文件修改后（在主线程中）：换用新的平台、接口和匹配器，刷新两个下拉框并重新校验输入框"""
+        old_apis = self.parse_apis
+        self.registry = registry
+        self.platform_urls = registry.platform_urls
+        self.parse_apis = registry.parse_apis
+
+        platform_names = list(self.platform_urls)
+        self.platform_dropdown.configure(values=platform_names)
+        if self.platform_var.get() not in self.platform_urls:
+            self.platform_var.set(platform_names[0])
+
+        # 前缀没变的接口沿用之前的探测结果，新增或改过的接口重新探测
+        changed = {name: prefix for name, prefix in self.parse_apis.items() if old_apis.get(name) != prefix}
+        self.apply_probe_results({name: result for name, result in self.probe_results.items()
+                                  if name in self.parse_apis and name not in changed})
+        if changed:
+            self.start_api_probe(changed)
+
+        self.url_validator.set_matcher(registry.matcher)
+        self.url_entry.validate_now()
 
     def get_current_url(self):
+        """在后台线程模拟按键从浏览器地址栏复制链接，期间界面保持响应"""
+        if self.capture_thread is not None and self.capture_thread.is_alive():
+            # 上一次获取还没结束，忽略重复点击
+            return
+        self.get_url_btn.configure(text="获取中...", state="disabled")
+        self.capture_thread = threading.Thread(target=self._capture_worker, daemon=True)
+        self.capture_thread.start()
+
+    def _capture_worker(self):
         try:
-            pyperclip.copy('')
-            time.sleep(0.2)
-            keyboard.press_and_release('alt+tab')
-            time.sleep(0.2)
-            keyboard.press_and_release('alt+d')
-            time.sleep(0.2)
-            keyboard.press_and_release("ctrl+c")
-            time.sleep(0.2)
-            keyboard.press_and_release('alt+tab')
-            time.sleep(0.2)
-            url = pyperclip.paste().strip()
-            self.url_entry.delete(0, 'end')
-            self.url_entry.insert(0, url)
-
-            if not url or not self.is_valid_video_url(url):
-                pyperclip.copy('')
-                time.sleep(0.2)
-                keyboard.press_and_release('alt+tab+tab')
-                time.sleep(0.2)
-                keyboard.press_and_release('f6')
-                time.sleep(0.2)
-                keyboard.press_and_release('ctrl+c')
-                time.sleep(0.2)
-                keyboard.press_and_release('f6')
-                time.sleep(0.2)
-                keyboard.press_and_release('ctrl+c')
-                time.sleep(0.2)
-                keyboard.press_and_release('f6')
-                time.sleep(0.2)
-                keyboard.press_and_release('ctrl+c')
-                time.sleep(0.2)
-                url = pyperclip.paste().strip()
-                self.url_entry.delete(0, 'end')
-                self.url_entry.insert(0, url)
-                time.sleep(0.2)
-
-            if not url or not self.is_valid_video_url(url):
-                self.show_warning(
-                    "获取链接失败！\n\n"
-                    "请确保：\n"
-                    "1. 浏览器窗口已打开视频页面\n"
-                    "2. 点击获取前先切换到浏览器窗口\n"
-                    "3. 如果还是无法获取，请手动复制视频链接"
-                )
-        except Exception as e:
+            url = self.capture_url_from_browser()
+        except Exception:
+            self.call_in_ui(self.finish_capture, None)
+        else:
+            self.call_in_ui(self.finish_capture, url)
+
+    @traced("获取链接", "capture")
+    def capture_url_from_browser(self):
+        """切换到浏览器复制地址栏内容并返回（在后台线程运行，不能访问 Tk 控件）"""
+        return self.url_capture.capture()
+
+    def fill_url(self, url):
+        self.url_entry.delete(0, 'end')
+        self.url_entry.insert(0, url)
+        self.url_entry.validate_now()
+
+    def finish_capture(self, url):
+        """回到 Tk 主线程：填入链接、恢复按钮，失败时提示。url 为 None 表示获取过程出错"""
+        self.get_url_btn.configure(text="获取链接", state="normal")
+        if url is None:
             self.show_warning(
                 "获取链接失败！\n\n"
                 "请手动复制视频链接，或按F6选中地址栏后按Ctrl+C复制"
             )
+            return
 
-
-
-
-
+        self.fill_url(url)
+        if not url or not self.is_valid_video_url(url):
+            self.show_warning(
+                "获取链接失败！\n\n"
+                "请确保：\n"
+                "1. 浏览器窗口已打开视频页面\n"
+                "2. 点击获取前先切换到浏览器窗口\n"
+                "3. 如果还是无法获取，请手动复制视频链接"
+            )
 
     def is_valid_video_url(self, url):
-        if not url:
-            return False
-        try:
-            parsed = urlparse(url)
-            supported_patterns = [
-                ('youku.com', r'v\.youku\.com/v_show/id_[^?]+'),
-                ('iqiyi.com', r'www\.iqiyi\.com/[vw]_[^?]+'),
-                ('v.qq.com', r'v\.qq\.com/x/cover/|v\.qq\.com/x/page/[^?]+'),
-                ('bilibili.com', r'www\.bilibili\.com/video/[^?]+'),
-                ('mgtv.com', r'www\.mgtv\.com/b/[^?]+'),
-                ('le.com', r'www\.le\.com/ptv/vplay/[^?]+'),
-                ('sohu.com', r'tv\.sohu\.com/v/[^?]+'),
-                ('1905.com', r'www\.1905\.com/vod/play/[^?]+'),
-                ('pptv.com', r'v\.pptv\.com/show/[^?]+'),
-                ('fun.tv', r'www\.fun\.tv/vplay/[^?]+'),
-                ('acfun.cn', r'www\.acfun\.cn/v/[^?]+')
-            ]
-            return any(
-                domain in parsed.netloc and re.search(pattern, url)
-                for domain, pattern in supported_patterns
-            )
-        except Exception as e:
-            return False
+        # 原链接不匹配时，移动端域名、省略协议等写法规范化后再校验
+        return match_video_url(self.registry.matcher, url) is not None
 
 
 
+    @traced("提示窗口")
     def show_warning(self, message):
-        warning_window = ctk.CTkToplevel()
-        warning_window.title("提示")
-        warning_window.geometry("400*250")
-        warning_window.attributes('-topmost',True)
-        warning_window.transient(self.root)
-        warning_window.configure(fg_color="#ffffff")
-        warning_window.iconbitmap(resource_path("icon.png"))
-        text_frame = ctk.CTkFrame(
-            warning_window,
-            fg_color="#ffffff"
-        )
-        text_frame.pack(expand=True,fill="both",padx=20,pady=(20,10))
-        label = ctk.CTkLabel(
-            text_frame,
-            text=message,
-            font=("微软雅黑", 14),
-            text_color="#000000",
-            wraplength=360,
-            justify="center",
-        )
-        label.pack(expand=True)
-        button_frame = ctk.CTkFrame(
-            warning_window,
-            fg_color="#ffffff"
-        )
-        button_frame.pack(fill="x",padx=20,pady=(0,20))
-        btn = ctk.CTkButton(
-            button_frame,
-            text="确定",
-            command=warning_window.destroy,
-            width=100,
-            height=40,
-            fg_color="#e0e0e0",
-            hover_color="#c0c0c0",
-            text_color="#000000",
-            corner_radius=8,
-        )
-        btn.pack(pady=10)
-        warning_window.update()
-        warning_window.minsize(warning_window.winfo_width(), warning_window.winfo_height())
-        window_width = warning_window.winfo_width()
-        window_height = warning_window.winfo_height()
-        screen_width = warning_window.winfo_screenwidth()
-        screen_height = warning_window.winfo_screenheight()
-        x = (screen_width - window_width) // 2
-        y = (screen_height - window_height) // 2
-        warning_window.geometry(f"+{x}+{y}")
+        # 复用同一个提示框：相同提示只累加次数，连续的不同提示限速显示
+        self.notifier.show(message)
+
+
+    def search_history(self, text, limit):
+        if self.history is None:
+            return []
+        return self.history.search(text, limit)
 
+    def toggle_clipboard_watch(self):
+        if self.watch_var.get():
+            if self.clipboard_watcher is None:
+                self.clipboard_watcher = ClipboardWatcher(
+                    lambda url: self.call_in_ui(self.on_clipboard_url, url), self.is_valid_video_url
+                )
+                # 切回本窗口时立即检查一次，不用等到下一次轮询
+                self.root.bind("<FocusIn>", lambda event: self.clipboard_watcher.poke(), add="+")
+            self.clipboard_watcher.start()
+        elif self.clipboard_watcher is not None:
+            self.clipboard_watcher.stop()
+
+    def on_clipboard_url(self, url):
+        if self.watch_var.get() and url != self.url_entry.get().strip():
+            self.fill_url(url)
+
+    def on_instance_message(self, message):
+        """填入另一次启动传来的链接（可选立即解析），并把窗口提到最前"""
+        self.root.deiconify()
+        self.root.lift()
+        self.root.attributes("-topmost", True)
+        self.root.after(200, lambda: self.root.attributes("-topmost", False))
+        self.root.focus_force()
+        url = message.get("url")
+        if url:
+            self.fill_url(url)
+            if message.get("parse"):
+                self.parse_video()
+
+    def on_close(self):
+        if self.instance_server is not None:
+            self.instance_server.close()
+        if self.registry_watcher is not None:
+            self.registry_watcher.stop()
+        if self.clipboard_watcher is not None:
+            self.clipboard_watcher.stop()
+        if self.browser is not None:
+            # 打开还在等待合并的链接
+            self.browser.close()
+        if self.history is not None:
+            # 等待后台线程把尚未提交的历史记录写完
+            self.history.close()
+        if self.api_stats is not None:
+            self.api_stats.save()
+        self.root.destroy()
 
     def run(self):  # 启动主循环的方法
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        monitor = None
+        if os.environ.get("VIP_STALL_MONITOR"):
+            monitor = StallMonitor(self.root)
+            monitor.start()
         self.root.mainloop()  # 启动Tkinter主循环
+        if monitor:
+            print(monitor.summary(), file=sys.stderr)
+        tracer.finish()
 
     def visit_selected_platform(self):
         selected_platform = self.platform_var.get()
         url = self.platform_urls[selected_platform]
-        webbrowser.open(url)
+        self.open_in_browser([url])
+
+    def open_in_browser(self, urls):
+        """交给后台线程打开，不阻塞界面；短时间内的多个链接合并为一次浏览器启动"""
+        if self.browser is None:
+            self.browser = browser_launcher.BrowserLauncher(
+                on_error=lambda urls, error: self.call_in_ui(
+                    self.show_warning, "无法打开浏览器！\n\n请检查默认浏览器设置"
+                )
+            )
+        self.browser.open_many(urls)
+
+    def parse_all_apis(self):
+        """用所有解析接口同时打开当前链接，每个接口一个标签页"""
+        url = self.url_entry.get()
+        if not url:
+            self.show_warning("请先获取视频链接！")
+            return
+        canonical = canonicalize(url) or url.strip()
+        if self.history is not None:
+            self.history.record(canonical, url, self.registry.matcher.match(canonical), "全部接口")
+        self.open_in_browser([build_parse_url(prefix, canonical) for prefix in self.parse_apis.values()])
 
 
 if __name__ == "__main__":  # 程序入口
-    app = VideoParser()  # 创建VideoParser应用实例
+    profiler.enabled = "--profile-startup" in sys.argv[1:]
+    if sys.stderr is not None:  # pythonw 启动时没有标准错误
+        import logging
+        # 各模块的 logger 都在 vip 之下；竞速解析每次尝试的耗时是 INFO 级别，其余只输出警告
+        logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+        logging.getLogger("vip.race").setLevel(logging.INFO)
+    app = VideoParser(instance_server)  # 创建VideoParser应用实例
+    launch = single_instance.parse_launch_args(sys.argv[1:])
+    if launch["url"]:
+        # 本进程就是第一个实例时，命令行中的链接直接填入
+        app.on_instance_message(launch)
     app.run()  # 启动应用主循环
 
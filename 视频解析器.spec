@@ -1,11 +1,18 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
 
+# 图标、图片打成一个资源包，onefile 启动时只解压这一个文件
+sys.path.insert(0, SPECPATH)
+import asset_bundle
+
+asset_bundle.build(os.path.join(SPECPATH, asset_bundle.BUNDLE_NAME))
 
 a = Analysis(
     ['vip.py'],
     pathex=[],
     binaries=[],
-    datas=[('icon.ico', '.'), ('dp.jpg', '.'), ('hezhao.jpg', '.'), ('icon.png', '.'), ('qinqin.gif', '.')],
+    datas=[(asset_bundle.BUNDLE_NAME, '.'), ('registry.json', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},